@@ -1,15 +1,17 @@
-import json
 import os
 import sys
 import getpass
-import jinja2
 import logging
+import threading
 from datetime import datetime
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
+from typing import Callable
 from services.config_service import ConfigService
+from services.config_index_service import ConfigIndexService
+from services.config_watcher_service import ConfigWatcherService
 from services.crypto_text_service import CryptoTextService
-from settings import NAME_APP, AUTHOR_APP, DESCRIPTION_APP, LICENSE_APP, COPYRIGHT_APP, get_version_info
+from settings import NAME_APP, AUTHOR_APP, DESCRIPTION_APP, LICENSE_APP, COPYRIGHT_APP, PG_CONNECT_TIMEOUT, SQL_STATEMENT_TIMEOUT, QUERY_CACHE_TTL, QUERY_CACHE_MAX_ENTRIES, QUERY_CACHE_MAX_TOTAL_ROWS, TOOLBOX_PREFETCH_PAGES, HISTORY_MAX_STEPS, PERSISTENCE_DELAY, CONFIG_WATCH_INTERVAL, SERIALIZER_BACKEND, SERIALIZER_INDENT, get_version_info
 from PyQt5 import QtGui, QtWidgets
 from PyQt5.QtCore import pyqtSignal, QObject, QThread, Qt, QTimer
 from PyQt5.QtWidgets import QApplication, QFileDialog, QMessageBox
@@ -19,12 +21,15 @@ from ui.forms.ContentForm import ContentForm
 from ui.forms.MainForm import UiMainWindow
 from ui.forms.SettingsForm import SettingsForm
 from ui.widgets.CheckBoxWidget import CheckBoxWidget
-from ui.widgets.ItemTableWidgets import ActionItemTableWidget, BooleanItemTableWidget, HeaderItem, NumberItemTableWidget, SelectItemTableWidget, TextItemTableWidget
+from ui.widgets.ConfigCatalogWidget import ConfigCatalogWidget
+from ui.widgets.FieldsTableModel import FieldsFilterProxyModel, FieldsTableLoader, FieldsTableModel
+from ui.widgets.ItemTableWidgets import HeaderItem, create_item_table_delegate
 from ui.widgets.LoadingWidget import LoadingWidget
 from ui.widgets.NumberWidget import NumberWidget
 from ui.widgets.SQLClickHouseWidget import ClickHouseWidget
 from ui.widgets.SQLPostgreWidget import PostgreWidget
 from ui.widgets.PageWidget import PageWidget
+from ui.widgets.SQLPlanWidget import SQLPlanWidget
 from ui.widgets.SQLViewerScript import SQLViewerScript
 from ui.widgets.SelectWidget import SelectWidget
 from ui.widgets.TagInputWidget import TagInputWidget
@@ -33,8 +38,16 @@ from ui.widgets.ViewJSONWidget import ViewJSONWidget
 from ui.widgets.ViewTextWidget import ViewTextWidget
 from ui.widgets.SplashScreen import SplashScreen
 from services.postgres_service import PostgresService
+from services.query_cache_service import QueryCacheService
+from services.template_service import TemplateService
 from services.logger_service import LoggerService
 from services.file_structure_service import FileStructureService
+from services.history_service import HistoryService, HistorySnapshot
+from services.persistence_service import PersistenceService
+from services.serializer_service import SerializerService
+from services.style_service import StyleService
+from services.type_mapping_service import TypeMappingService
+from services.validator_service import ValidatorService
 
 
 # Определение пути приложения в исполняемом файле Python, сгенерированном PyInstaller
@@ -152,17 +165,44 @@ class Application(QApplication):
             logger_service=self.logger_service
             )
 
+        # Сериализация JSON: orjson, если установлен, иначе стандартный модуль json
+        self.serializer_service = SerializerService(
+            backend=SERIALIZER_BACKEND,
+            indent=SERIALIZER_INDENT,
+            logger_service=self.logger_service
+            )
+
         self.file_service = FileStructureService(
             working_dir=self.working_dir,
+            logger_service=self.logger_service,
+            serializer_service=self.serializer_service
+            )
+
+        # Стили всех окон и виджетов читаются один раз и применяются на уровне приложения
+        self.style_service = StyleService(
+            file_service=self.file_service,
             logger_service=self.logger_service
             )
+        self.style_service.apply(self)
+
+        # Файлы конфигурации записываются в фоновом потоке, результат приходит через сигналы
+        self.persistence_service = PersistenceService(
+            logger_service=self.logger_service,
+            serializer_service=self.serializer_service,
+            delay=PERSISTENCE_DELAY,
+            on_saved=lambda path: self.signals.file_saved.emit(str(path)),
+            on_error=lambda path, error: self.signals.file_error.emit(f"Не удалось сохранить файл {path}: {error}")
+            )
+        self.aboutToQuit.connect(self.persistence_service.close)
 
         # Инициализация конфигурации
         self.config_service = ConfigService(
             working_dir=self.working_dir,
             logger_service=self.logger_service,
             file_service=self.file_service,
-            crypto_service=self.crypto_service
+            crypto_service=self.crypto_service,
+            persistence_service=self.persistence_service,
+            serializer_service=self.serializer_service
             )
 
         # Загружаем конфигурацию
@@ -173,23 +213,74 @@ class Application(QApplication):
         self.sql_scripts = self.config_service.get_sql_scripts()
         self.columns_table = self.config_service.load_columns_table()
 
+        # Изменения файлов схемы полей и страниц применяются без перезапуска приложения
+        self.config_watcher = ConfigWatcherService(
+            files={
+                'fields': self.file_service.get_config_fields_file(),
+                'pages': self.file_service.get_config_pages_file()
+                },
+            logger_service=self.logger_service,
+            interval=CONFIG_WATCH_INTERVAL,
+            parent=self
+            )
+
+        # Каталог сохраненных конфигураций (обновляется при открытии поиска и после сохранения)
+        self.config_index_service = ConfigIndexService(
+            index_file=self.file_service.get_config_index_file(),
+            save_dir=self.file_service.get_save_config_path(),
+            serializer_service=self.serializer_service,
+            logger_service=self.logger_service
+            )
+        self.config_index_worker = None
+        self.aboutToQuit.connect(self._close_config_index)
+
+        # Проверка конфигурации по описанию полей
+        self.validator_service = ValidatorService(
+            config_fields=self.config_fields,
+            logger_service=self.logger_service
+            )
+
+        # Инициализация сопоставления типов источника типам ClickHouse
+        self.type_mapping_service = TypeMappingService(
+            columns=self.columns_table,
+            logger_service=self.logger_service
+            )
+
+        # Инициализация сервиса SQL шаблонов
+        self.template_service = TemplateService(
+            logger_service=self.logger_service
+            )
+
+        # Инициализация кэша результатов SQL скриптов
+        self.query_cache_service = QueryCacheService(
+            cache_file=self.file_service.get_query_cache_file(),
+            logger_service=self.logger_service,
+            persistence_service=self.persistence_service,
+            ttl=QUERY_CACHE_TTL,
+            max_entries=QUERY_CACHE_MAX_ENTRIES,
+            max_total_rows=QUERY_CACHE_MAX_TOTAL_ROWS
+            )
+
         # Инициализация PostgreSQL сервиса
         self.postgres_service = PostgresService(
             config=self.sql_connect['pg'],
-            logger=self.logger
+            logger=self.logger,
+            statement_timeout=SQL_STATEMENT_TIMEOUT,
+            template_service=self.template_service,
+            query_cache=self.query_cache_service,
+            connect_timeout=PG_CONNECT_TIMEOUT
         )
-        self.postgres_service.connect()
 
         # Устанавливаем статус соединения
         # self.postgres_service.fake_connect_pg()
+        self.status_connect_sql_pg = False
+        self.status_connect_sql_pg_text = "Подключение к PostgreSQL..."
 
+        # Подключаемся к PostgreSQL в фоновом потоке, статус придет через сигналы
+        self.connect_worker = None
+        self.aboutToQuit.connect(self._wait_connect_pg)
+        self.connect_pg_async()
 
-        self.status_connect_sql_pg = self.postgres_service.status[0]
-        self.status_connect_sql_pg_text = self.postgres_service.status[1]
-
-
-        # Инициализируем сигналы
-        self.signals.postgres_connected.emit()
         self.load_file_data = None
         self.logger_service.info("Загружена конфигурация приложения")
 
@@ -201,9 +292,8 @@ class Application(QApplication):
 
 
     def save_data(self, path: Path):
-        """Сохраняет данные в JSON файл."""
-        with open(path, mode="w", encoding="utf-8") as f:
-            json.dump(self.config_output, f, indent=4, ensure_ascii=False)
+        """Сохраняет данные в JSON файл. Файл записывается в фоновом потоке, результат - сигналы file_saved и file_error."""
+        self.persistence_service.schedule(path, self.config_output, pretty=True)
 
 
     # =============== Подключение к базам данных ===============
@@ -213,6 +303,85 @@ class Application(QApplication):
             self.status_connect_sql_pg, self.status_connect_sql_pg_text = \
                 self.postgres_service.connect()
 
+    def connect_pg_async(self) -> bool:
+        """
+        Запускает подключение к PostgreSQL в фоновом потоке.
+        Результат передается сигналами postgres_connected/postgres_disconnected
+        и signal_postgres_connection_changed.
+
+        Returns:
+            bool: Подключение запущено (False, если предыдущее еще выполняется)
+        """
+        if not self.postgres_service:
+            return False
+        if self.connect_worker is not None and self.connect_worker.isRunning():
+            return False
+
+        self.connect_worker = ConnectWorker(self.postgres_service)
+        self.connect_worker.result.connect(self._on_connect_pg_result)
+        self.connect_worker.start()
+        return True
+
+    @property
+    def is_connecting_pg(self) -> bool:
+        """Признак выполняющегося подключения к PostgreSQL."""
+        return self.connect_worker is not None and self.connect_worker.isRunning()
+
+    def _wait_connect_pg(self):
+        """Дожидается завершения фонового подключения перед выходом из приложения."""
+        if self.is_connecting_pg:
+            self.connect_worker.wait()
+
+    # =============== Каталог конфигураций ===============
+    def rescan_config_index(self,
+                            progress: Callable[[int, int], None] = None,
+                            result: Callable[[int, int], None] = None,
+                            error: Callable[[str], None] = None) -> "ConfigIndexWorker":
+        """
+        Запускает обновление каталога конфигураций в фоновом потоке.
+        Выполняющееся обновление прерывается (обработанные файлы уже сохранены в каталоге),
+        обработчики подключаются до запуска потока, поэтому результат не теряется.
+
+        Args:
+            progress: Обработчик прогресса (обработано файлов, всего файлов)
+            result: Обработчик результата (изменено, удалено записей)
+            error: Обработчик ошибки
+
+        Returns:
+            ConfigIndexWorker: Запущенный поток обновления
+        """
+        self._stop_config_index_rescan()
+        worker = ConfigIndexWorker(self.config_index_service)
+        worker.error.connect(self.logger.error)
+        for signal, slot in ((worker.progress, progress), (worker.result, result), (worker.error, error)):
+            if slot is not None:
+                signal.connect(slot)
+        self.config_index_worker = worker
+        worker.start()
+        return worker
+
+    def _stop_config_index_rescan(self):
+        """Прерывает обновление каталога конфигураций и дожидается завершения потока."""
+        if self.config_index_worker is not None and self.config_index_worker.isRunning():
+            self.config_index_worker.requestInterruption()
+            self.config_index_worker.wait()
+
+    def _close_config_index(self):
+        """Останавливает обновление каталога и закрывает базу каталога перед выходом из приложения."""
+        self._stop_config_index_rescan()
+        self.config_index_service.close()
+
+    def _on_connect_pg_result(self, status: bool, message: str):
+        """Обработчик результата фонового подключения к PostgreSQL."""
+        self.status_connect_sql_pg = status
+        self.status_connect_sql_pg_text = message
+
+        if status:
+            self.signals.postgres_connected.emit()
+        else:
+            self.signals.postgres_disconnected.emit()
+        self.signal_postgres_connection_changed.emit(status, message)
+
     # =============== Для тестирования ===============
     def _testing_connect_pg(self):
         """Тест подключения к PostgreSQL."""
@@ -229,28 +398,192 @@ class Application(QApplication):
             self.logger_service.info("Приложение завершило работу")
 
 
+class ConnectWorker(QThread):
+    """Рабочий поток для подключения к PostgreSQL"""
+    result = pyqtSignal(bool, str)  # Сигнал с результатом подключения (статус, сообщение)
+
+    def __init__(self, sql_service: PostgresService):
+        super().__init__()
+        self.sql_service = sql_service
+
+    def run(self):
+        try:
+            status, message = self.sql_service.connect()
+        except Exception as e:
+            status, message = False, f"Ошибка подключения к PostgreSQL: {e}"
+        self.result.emit(status, message)
+
+
+class ConfigIndexWorker(QThread):
+    """Рабочий поток для обновления каталога сохраненных конфигураций"""
+    progress = pyqtSignal(int, int)  # Сигнал с прогрессом (обработано файлов, всего файлов)
+    result = pyqtSignal(int, int)    # Сигнал с результатом (изменено, удалено записей)
+    error = pyqtSignal(str)          # Сигнал с ошибкой
+
+    def __init__(self, index_service: ConfigIndexService):
+        super().__init__()
+        self.index_service = index_service
+
+    def run(self):
+        try:
+            updated, removed = self.index_service.rescan(progress=self.progress.emit,
+                                                         interrupted=self.isInterruptionRequested)
+        except Exception as e:
+            self.error.emit(f"Ошибка обновления каталога конфигураций: {e}")
+            return
+        finally:
+            self.index_service.close_connection()
+        if not self.isInterruptionRequested():
+            self.result.emit(updated, removed)
+
+
 class SQLWorker(QThread):
     """Рабочий поток для выполнения SQL-запроса"""
     finished = pyqtSignal(list)  # Сигнал с результатами
     error = pyqtSignal(str)      # Сигнал с ошибкой
     progress = pyqtSignal(int)   # Сигнал с прогрессом
-
-    def __init__(self, app, script):
+    batch = pyqtSignal(list)     # Сигнал с очередной пачкой строк (потоковый режим)
+    rows_fetched = pyqtSignal(int)      # Сигнал с количеством полученных строк
+    stream_finished = pyqtSignal(int)   # Сигнал окончания потоковой выборки (всего строк)
+    cancelled = pyqtSignal()     # Сигнал отмены выполнения
+    statements_report = pyqtSignal(dict)  # Сигнал с отчетом о выполнении скрипта по выражениям
+    explain_plan = pyqtSignal(dict)  # Сигнал с планом выполнения скрипта (EXPLAIN)
+
+    def __init__(self,
+                 app,
+                 script,
+                 params: dict = None,
+                 stream: bool = False,
+                 batch_size: int = 1000,
+                 max_pending_batches: int = 4,
+                 statement_timeout: int = None,
+                 use_cache: bool = False,
+                 statement_key: str = None,
+                 report: bool = False,
+                 explain: bool = False):
         super().__init__()
         self.app = app
         self.script = script
+        self.params = params
+        self.stream = stream
+        self.batch_size = batch_size
+        self.statement_timeout = statement_timeout
+        self.use_cache = use_cache
+        self.statement_key = statement_key
+        self.report = report
+        self.explain = explain
         self.sql_service = app.postgres_service
+        self.cancel_token = self.sql_service.create_cancel_token()
+        self._rows_fetched = 0
+        # Ограничиваем число пачек, ожидающих обработки в UI потоке
+        self._batch_slots = threading.Semaphore(max_pending_batches)
 
     def run(self):
         try:
+            if self.explain:
+                self._run_explain()
+                return
+
+            if self.report:
+                self._run_report()
+                return
+
+            if self.stream:
+                self._run_stream()
+                return
+
             # Выполняем SQL-запрос
-            status, results, error_message = self.sql_service.execute_script(script=self.script)
-            if status:
+            status, results, error_message = self.sql_service.execute_script(
+                script=self.script,
+                params=self.params,
+                cancel_token=self.cancel_token,
+                statement_timeout=self.statement_timeout,
+                statement_key=self.statement_key
+            )
+            if self.is_cancelled:
+                self.cancelled.emit()
+            elif status:
                 self.finished.emit(results)
             else:
                 self.error.emit(error_message)
         except Exception as e:
-            self.error.emit(str(e))
+            if self.is_cancelled:
+                self.cancelled.emit()
+            else:
+                self.error.emit(str(e))
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Признак отмены выполнения"""
+        return self.cancel_token.cancelled
+
+    def cancel(self):
+        """Отмена выполнения запроса на стороне сервера"""
+        self.requestInterruption()
+        self.sql_service.cancel(self.cancel_token)
+
+    def _run_stream(self):
+        """Выполнение SQL-запроса с выдачей результата пачками"""
+        self._rows_fetched = 0
+        status, total_rows, error_message = self.sql_service.execute_script_stream(
+            script=self.script,
+            on_batch=self._emit_batch,
+            params=self.params,
+            batch_size=self.batch_size,
+            cancel_token=self.cancel_token,
+            statement_timeout=self.statement_timeout,
+            use_cache=self.use_cache,
+            statement_key=self.statement_key
+        )
+        if self.is_cancelled:
+            self.cancelled.emit()
+        elif status:
+            self.stream_finished.emit(total_rows)
+        else:
+            self.error.emit(error_message)
+
+    def _run_report(self):
+        """Выполнение SQL скрипта по выражениям с замером времени каждого"""
+        status, report, error_message = self.sql_service.execute_statements(
+            script=self.script,
+            params=self.params,
+            cancel_token=self.cancel_token,
+            statement_timeout=self.statement_timeout
+        )
+        if self.is_cancelled:
+            self.cancelled.emit()
+        else:
+            # Отчет передается и при ошибке: в нем отмечено выражение, на котором она возникла
+            self.statements_report.emit(report)
+
+    def _run_explain(self):
+        """Построение плана выполнения SQL скрипта через EXPLAIN ANALYZE"""
+        status, plan, error_message = self.sql_service.explain_script(
+            script=self.script,
+            params=self.params,
+            cancel_token=self.cancel_token,
+            statement_timeout=self.statement_timeout
+        )
+        if self.is_cancelled:
+            self.cancelled.emit()
+        elif status:
+            self.explain_plan.emit(plan)
+        else:
+            self.error.emit(error_message)
+
+    def _emit_batch(self, rows):
+        """Передача пачки строк в UI поток"""
+        while not self._batch_slots.acquire(timeout=0.1):
+            if self.isInterruptionRequested():
+                raise InterruptedError("Выборка прервана")
+
+        self._rows_fetched += len(rows)
+        self.batch.emit(list(rows))
+        self.rows_fetched.emit(self._rows_fetched)
+
+    def batch_consumed(self):
+        """Сообщает потоку, что UI обработал очередную пачку строк"""
+        self._batch_slots.release()
 
     def _update_progress(self, value):
         """Обновление прогресса"""
@@ -268,8 +601,36 @@ class MainWindow(UiMainWindow):
         self.app = app
         self.logger = app.logger
         self.save_path = app.file_service.get_save_config_path()
-        self.values_fields = []
         self.list_widget_fields = {}
+        self.sql_workers_cancelled = []
+
+        # Страницы полей создаются при открытии, соседние - заранее в простое
+        self._fields_config = {}
+        self._page_field_index = {}
+        self._page_prefetch_queue = []
+        self._page_prefetch_timer = QTimer(self)
+        self._page_prefetch_timer.setInterval(0)
+        self._page_prefetch_timer.timeout.connect(self._prefetch_next_page)
+        self.toolBox_fields.currentChanged.connect(self._on_toolbox_page_changed)
+        self._notify_connect_pg_result = False
+        # Файлы, сохраняемые пользователем, о записи которых нужно уведомить
+        self._saving_files = set()
+
+        # История изменений конфигурации (отмена и повтор)
+        self.history_service = HistoryService(max_steps=HISTORY_MAX_STEPS)
+        self._history_group = None
+        self._history_group_number = 0
+        self._history_restoring = False
+        self._building_page = False
+        # Значения колонок, удаленных из конфигурации полей: ключ -> {идентификатор строки: значение}.
+        # Возвращаются в таблицу, если колонка снова появится
+        self._detached_columns = {}
+        self._detached_epoch = 0
+
+        # Ошибки проверки значений полей. Ошибка показывается у поля после его изменения пользователем
+        # или после полной проверки конфигурации (при сохранении)
+        self._field_errors = {}
+        self._validated_fields = set()
 
         # Устанавливаем заголовок окна
         self.setWindowTitle(app.name)
@@ -289,6 +650,10 @@ class MainWindow(UiMainWindow):
         #  Подключаем сигналы
         self.app.signals.postgres_connected.connect(self._on_signal_postgres_connected)
         self.app.signals.postgres_disconnected.connect(self._on_signal_postgres_disconnected)
+        self.app.signal_postgres_connection_changed.connect(self._on_signal_postgres_connection_changed)
+        self.app.signals.file_saved.connect(self._on_signal_file_saved)
+        self.app.signals.file_error.connect(self._on_signal_file_error)
+        self.app.config_watcher.file_changed.connect(self._on_config_file_changed)
 
         # Инициализируем сигналы
         self.app.init_signal()
@@ -329,174 +694,564 @@ class MainWindow(UiMainWindow):
 
 
     def load_page_fields(self, config: dict):
-        """Загружает поля на страницы в соответствии с конфигурацией."""
+        """Загружает поля на страницы в соответствии с конфигурацией.
+
+        Виджеты полей создаются при первом открытии страницы, соседние страницы
+        создаются заранее, когда приложение простаивает.
+        """
         if not self.pages:
             self.logger.error("Не удалось загрузить страницы!")
             self.notification.show_notification("Не удалось загрузить страницы!", "error", "Ошибка загрузки страниц")
             return
 
-        for page in self.pages:
-            page_widget = page["page"]
-            if page_widget.layout():
-                old_layout = page_widget.layout()
-                while old_layout.count():
-                    item = old_layout.takeAt(0)
-                    if item.widget():
-                        item.widget().deleteLater()
-                QtWidgets.QWidget().setLayout(old_layout)
-
-            page_layout = QtWidgets.QVBoxLayout(page_widget)
-            page_layout.setContentsMargins(10, 10, 10, 10)
-            page_layout.setSpacing(10)
-            page_layout.setObjectName(f"page_layout_{page['name']}")
-
-            fields = page["fields"]
-            for field in fields:
-                if config.get(field):
-                    field_config = config[field]
-                    field_type = field_config.get('type', 'text')
-
-                    if field_type == 'text':
-                        widget = TextWidget(
-                            parent=page_widget,
-                            app=self.app,
-                            config=field_config,
-                            key=field,
-                            event_on_changed=self.app.config_service.set_config_output,
-                            event_open_sql_script=self._event_btn_clicked_open_sql_script,
-                            event_run_sql_script=self._event_btn_clicked_run_sql_script
-                            )
-                    elif field_type == 'select':
-                        widget = SelectWidget(
-                            parent=page_widget,
-                            app=self.app,
-                            config=field_config,
-                            key=field,
-                            event_on_changed=self.app.config_service.set_config_output,
-                            )
-                    elif field_type == 'boolean':
-                        widget = CheckBoxWidget(
-                            parent=page_widget,
-                            app=self.app,
-                            config=field_config,
-                            key=field,
-                            event_on_changed=self.app.config_service.set_config_output,
-                            )
-                    elif field_type == 'number':
-                        widget = NumberWidget(
-                            parent=page_widget,
-                            app=self.app,
-                            config=field_config,
-                            key=field,
-                            event_on_changed=self.app.config_service.set_config_output,
-                            )
-                    elif field_type == 'array':
-                        widget = TagInputWidget(
-                            parent=page_widget,
-                            app=self.app,
-                            config=field_config,
-                            key=field,
-                            event_on_changed=self.app.config_service.set_config_output,
-                            )
-                    else:
-                        continue
-
-                    self.list_widget_fields[field] = widget
-
-                    page_layout.addWidget(widget)
-                    line = QtWidgets.QFrame(page_widget)
-                    line.setFrameShape(QtWidgets.QFrame.HLine)
-                    line.setFrameShadow(QtWidgets.QFrame.Sunken)
-                    line.setObjectName("line")
-                    page_layout.addWidget(line)
-            page_layout.addItem(QtWidgets.QSpacerItem(20, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding))
+        self._fields_config = config
+        self._page_field_index = {}
+        self.list_widget_fields = {}
+        for index, page in enumerate(self.pages):
+            self._clear_page(page)
+            for field in page["fields"]:
+                self._page_field_index[field] = index
+
+        self._on_toolbox_page_changed(self.toolBox_fields.currentIndex())
+
+    def _clear_page(self, page: dict):
+        """Удаляет виджеты полей страницы. Значения полей остаются в конфигурации."""
+        page_widget = page["page"]
+        if page_widget.layout():
+            old_layout = page_widget.layout()
+            while old_layout.count():
+                item = old_layout.takeAt(0)
+                if item.widget():
+                    item.widget().deleteLater()
+            QtWidgets.QWidget().setLayout(old_layout)
+        self.list_widget_fields = {
+            key: widget for key, widget in self.list_widget_fields.items()
+            if widget.parentWidget() is not page_widget
+        }
+        page["built"] = False
+
+    def rebuild_page(self, index: int):
+        """Пересоздает виджеты страницы после изменения конфигурации полей.
+        Страница, которая еще не создавалась, будет создана при открытии.
+
+        Args:
+            index: Номер страницы в toolbox
+        """
+        page = self.pages[index]
+        built = page.get("built")
+        self._clear_page(page)
+        if built or index == self.toolBox_fields.currentIndex():
+            self.build_page(index)
+
+    def build_page(self, index: int):
+        """Создает виджеты полей страницы, если они еще не созданы.
+
+        Args:
+            index: Номер страницы в toolbox
+        """
+        # Поля еще не загружены (страницы добавляются в toolbox раньше полей)
+        if not self._fields_config:
+            return
+        if index < 0 or index >= len(self.pages) or self.pages[index].get("built"):
+            return
+        page = self.pages[index]
+        page["built"] = True
+        page_widget = page["page"]
+
+        page_layout = QtWidgets.QVBoxLayout(page_widget)
+        page_layout.setContentsMargins(10, 10, 10, 10)
+        page_layout.setSpacing(10)
+        page_layout.setObjectName(f"page_layout_{page['name']}")
+
+        # Значения по умолчанию, которые виджеты записывают при создании, не являются шагами истории
+        self._building_page = True
+        try:
+            self._build_page_fields(page, page_layout)
+        finally:
+            self._building_page = False
+        for field in page["fields"]:
+            self._show_field_error(field)
+
+    def _build_page_fields(self, page: dict, page_layout: QtWidgets.QVBoxLayout):
+        """Создает виджеты полей страницы."""
+        config = self._fields_config
+        page_widget = page["page"]
+        output = self.app.config_service.get_config_output()
+
+        fields = page["fields"]
+        # Значения, уже введенные в поля (страница пересоздается после изменения конфигурации),
+        # восстанавливаются вместо значений по умолчанию
+        values = {field: output[field] for field in fields if field in output}
+        for field in fields:
+            if config.get(field):
+                field_config = config[field]
+                field_type = field_config.get('type', 'text')
+
+                if field_type == 'text':
+                    widget = TextWidget(
+                        parent=page_widget,
+                        app=self.app,
+                        config=field_config,
+                        key=field,
+                        event_on_changed=self._event_field_value_changed,
+                        event_open_sql_script=self._event_btn_clicked_open_sql_script,
+                        event_run_sql_script=self._event_btn_clicked_run_sql_script
+                        )
+                elif field_type == 'select':
+                    widget = SelectWidget(
+                        parent=page_widget,
+                        app=self.app,
+                        config=field_config,
+                        key=field,
+                        event_on_changed=self._event_field_value_changed,
+                        )
+                elif field_type == 'boolean':
+                    widget = CheckBoxWidget(
+                        parent=page_widget,
+                        app=self.app,
+                        config=field_config,
+                        key=field,
+                        event_on_changed=self._event_field_value_changed,
+                        )
+                elif field_type == 'number':
+                    widget = NumberWidget(
+                        parent=page_widget,
+                        app=self.app,
+                        config=field_config,
+                        key=field,
+                        event_on_changed=self._event_field_value_changed,
+                        )
+                elif field_type == 'array':
+                    widget = TagInputWidget(
+                        parent=page_widget,
+                        app=self.app,
+                        config=field_config,
+                        key=field,
+                        event_on_changed=self._event_field_value_changed,
+                        )
+                else:
+                    continue
+
+                self.list_widget_fields[field] = widget
+                if field in values and output.get(field) != values[field]:
+                    try:
+                        widget.set_value(values[field])
+                    except (TypeError, ValueError) as e:
+                        self.logger.error(f"Не удалось восстановить значение поля {field}: {e}")
+
+                page_layout.addWidget(widget)
+                line = QtWidgets.QFrame(page_widget)
+                line.setFrameShape(QtWidgets.QFrame.HLine)
+                line.setFrameShadow(QtWidgets.QFrame.Sunken)
+                line.setObjectName("line")
+                page_layout.addWidget(line)
+        page_layout.addItem(QtWidgets.QSpacerItem(20, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding))
+
+    def get_field_widget(self, key: str):
+        """Возвращает виджет поля, при необходимости создав его страницу.
+
+        Args:
+            key: Ключ поля
+
+        Returns:
+            Виджет поля или None, если поле не размещено на страницах
+        """
+        if key not in self.list_widget_fields and key in self._page_field_index:
+            self.build_page(self._page_field_index[key])
+        return self.list_widget_fields.get(key)
+
+    def build_pages(self):
+        """Создает виджеты всех страниц (значения всех полей нужны для сохранения и просмотра конфигурации)."""
+        self._page_prefetch_timer.stop()
+        self._page_prefetch_queue = []
+        for index in range(len(self.pages)):
+            self.build_page(index)
+
+    def _on_toolbox_page_changed(self, index: int):
+        """Создает открытую страницу и ставит в очередь создание соседних."""
+        self.build_page(index)
+        self._page_prefetch_queue = [
+            neighbour
+            for offset in range(1, TOOLBOX_PREFETCH_PAGES + 1)
+            for neighbour in (index + offset, index - offset)
+            if 0 <= neighbour < len(self.pages) and not self.pages[neighbour].get("built")
+        ]
+        if self._page_prefetch_queue:
+            self._page_prefetch_timer.start()
+
+    def _prefetch_next_page(self):
+        """Создает следующую страницу из очереди (по одной странице за проход цикла событий)."""
+        if self._page_prefetch_queue:
+            self.build_page(self._page_prefetch_queue.pop(0))
+        if not self._page_prefetch_queue:
+            self._page_prefetch_timer.stop()
 
     def load_columns(self, columns):
         """Загружает колонки в таблицу."""
+        self.fields_model = FieldsTableModel(columns=columns or (), parent=self)
+        self.fields_model.values_changed.connect(self._event_fields_table_changed)
+        self._fields_output_stale = False
+        self.fields_proxy = FieldsFilterProxyModel(parent=self)
+        self.fields_proxy.setSourceModel(self.fields_model)
+        self.table_fields.setModel(self.fields_proxy)
+        self.fields_filter.set_columns(self.fields_model.columns)
+        self.fields_filter.filter_changed.connect(self.fields_proxy.set_filter)
+        self.fields_loader = FieldsTableLoader(model=self.fields_model, view=self.table_fields, parent=self)
+        self.fields_loader.progress.connect(self._on_fields_loader_progress)
+        self.fields_loader.finished.connect(self._on_fields_loader_finished)
+        self.history_service.reset(values=self._get_history_values(), store=self.fields_model.store,
+                                   keys=self.fields_model.get_value_keys())
+        self._update_history_actions()
+
         if not columns:
             self.logger.error("Не удалось загрузить колонки!")
             self.notification.show_notification("Не удалось загрузить колонки!", "error", "Ошибка загрузки колонки")
             return
 
-        self.table_fields.setColumnCount(0)
-        self.table_fields.setColumnCount(len(columns))
         self.table_fields.horizontalHeader().setStretchLastSection(False)
 
-        list_mode_resize = []
+        header = self.table_fields.horizontalHeader()
         for col, column in enumerate(columns):
+            delegate = create_item_table_delegate(
+                self.table_fields,
+                column=column,
+                event_on_clicked=self._event_btn_clicked_delete_row
+            )
+            if delegate is not None:
+                self.table_fields.setItemDelegateForColumn(col, delegate)
+
             header_item = HeaderItem(column["name"], column["type"])
-            self.table_fields.setHorizontalHeaderItem(col, header_item)
             width = header_item.get_column_width()
             if width > 0:
                 self.table_fields.setColumnWidth(col, width)
-            list_mode_resize.append(header_item.get_resize_mode())
+            header.setSectionResizeMode(col, header_item.get_resize_mode())
+
+    @property
+    def values_fields(self) -> list:
+        """Значения строк таблицы полей."""
+        return self.fields_model.rows
+
+    def sync_fields_output(self):
+        """Переносит строки таблицы полей в конфигурацию, если они изменились.
+        Строки хранятся по колонкам, поэтому словари строк собираются только перед сохранением и просмотром."""
+        self.fields_model.flush()
+        if self._fields_output_stale:
+            self.app.config_service.set_config_output(key='fields', value=self.values_fields)
+            self._fields_output_stale = False
+
+    # =============== Изменение файлов конфигурации ===============
+    def _on_config_file_changed(self, name: str):
+        """Обработчик изменения файла конфигурации полей или страниц."""
+        if name == 'fields':
+            self.reload_config_fields()
+        elif name == 'pages':
+            self.reload_config_pages()
+
+    def reload_config_fields(self):
+        """Применяет измененную конфигурацию полей: пересоздаются только страницы с измененными полями,
+        а при изменении колонок - таблица полей."""
+        if not self.app.config_service.reload_config_fields():
+            self.notification.show_notification("Не удалось перечитать конфигурацию полей", "error", "Ошибка загрузки конфигурации")
+            return
+        old_config = self._fields_config or {}
+        config = self.app.config_service.get_config_fields()
+        changed = {key for key in set(old_config) | set(config) if old_config.get(key) != config.get(key)}
+        if not changed:
+            return
 
-        header = self.table_fields.horizontalHeader()
-        for col, mode in enumerate(list_mode_resize):
-            header.setSectionResizeMode(col, mode)
+        self.app.config_fields = config
+        self._fields_config = config
+        self.app.validator_service.set_schema(config)
+        if any((old_config.get(key) or {}).get('type') == 'table' or (config.get(key) or {}).get('type') == 'table'
+               for key in changed):
+            self.reload_columns()
+        for index in sorted({self._page_field_index[key] for key in changed if key in self._page_field_index}):
+            self.rebuild_page(index)
+        for key, value in list(self.app.config_service.get_config_output().items()):
+            if key != 'fields':
+                self._validate_field(key, value)
+        self._validate_fields_table()
+
+        self.logger.info(f"Конфигурация полей обновлена: {', '.join(sorted(changed))}")
+        self.notification.show_notification("Конфигурация полей обновлена", "info")
+
+    def reload_columns(self):
+        """Пересоздает таблицу полей по измененным колонкам. Строки таблицы сохраняются,
+        значения удаленных колонок запоминаются и возвращаются, если колонка снова появится.
+        История изменений начинается заново: строки в ее снимках хранятся в порядке прежних колонок."""
+        self.fields_loader.cancel()
+        self._end_history_group()
+        self.fields_model.flush()
+        store = self.fields_model.store
+        rows = self.fields_model.rows
+        # Запомненные значения относятся только к строкам, которые не добавлялись после их запоминания
+        # (идентификатор удаленной строки может достаться новой)
+        added = set(store.added_since(self._detached_epoch).tolist())
+        for key, values in self._detached_columns.items():
+            for row_id, row in zip(store.ids(), rows):
+                if row_id in values and row_id not in added:
+                    row[key] = values[row_id]
+
+        self.app.columns_table = self.app.config_service.load_columns_table()
+        self.app.type_mapping_service.set_columns(self.app.columns_table)
+
+        old_objects = [self.fields_model, self.fields_proxy, self.fields_loader]
+        self.fields_filter.filter_changed.disconnect(self.fields_proxy.set_filter)
+        for col in range(self.fields_model.columnCount()):
+            delegate = self.table_fields.itemDelegateForColumn(col)
+            if delegate is not None:
+                self.table_fields.setItemDelegateForColumn(col, None)
+                old_objects.append(delegate)
+
+        self.load_columns(columns=self.app.columns_table)
+        self._history_restoring = True
+        try:
+            self.fields_model.set_rows(rows)
+            self.fields_model.flush()
+        finally:
+            self._history_restoring = False
+
+        store = self.fields_model.store
+        keys = set(self.fields_model.get_value_keys())
+        self._detached_columns = {}
+        for key in {key for row in rows for key in row} - keys:
+            values = {row_id: row[key] for row_id, row in zip(store.ids(), rows) if row.get(key) not in (None, "")}
+            if values:
+                self._detached_columns[key] = values
+        self._detached_epoch = store.epoch
+        if self._detached_columns:
+            self.logger.info(f"Значения удаленных колонок сохранены до их возвращения: {', '.join(sorted(self._detached_columns))}")
+        self.history_service.reset(values=self._get_history_values(), store=self.fields_model.store)
+        self._update_history_actions()
+        self.fields_proxy.set_filter(*self.fields_filter.get_filter())
+
+        for obj in old_objects:
+            obj.deleteLater()
+
+    def reload_config_pages(self):
+        """Применяет измененную конфигурацию страниц: виджеты страниц переиспользуются по имени,
+        пересоздаются только страницы, состав полей которых изменился."""
+        if not self.app.config_service.reload_config_pages():
+            self.notification.show_notification("Не удалось перечитать конфигурацию страниц", "error", "Ошибка загрузки конфигурации")
+            return
+        config = self.app.config_service.get_config_pages()
+        if config == self.app.config_pages:
+            return
+        self.app.config_pages = config
+
+        current_index = self.toolBox_fields.currentIndex()
+        current_name = self.pages[current_index]["name"] if 0 <= current_index < len(self.pages) else None
+        old_pages = {page["name"]: page for page in self.pages}
+        pages = []
+        rebuild = []
+        for page_config in config.get('pages', []):
+            fields = list(page_config['fields'])
+            page = old_pages.pop(page_config['name'], None)
+            if page is None:
+                page = {"page": PageWidget(name=page_config['name']), "built": False}
+            elif page["fields"] != fields:
+                if page.get("built"):
+                    rebuild.append(page)
+                self._clear_page(page)
+            page.update({"title": page_config['title'], "fields": fields, "name": page_config['name']})
+            pages.append(page)
+
+        self.toolBox_fields.blockSignals(True)
+        try:
+            for page in old_pages.values():
+                self._clear_page(page)
+                self.toolBox_fields.removeItem(self.toolBox_fields.indexOf(page["page"]))
+                page["page"].deleteLater()
+            for index, page in enumerate(pages):
+                position = self.toolBox_fields.indexOf(page["page"])
+                if position != index:
+                    if position >= 0:
+                        self.toolBox_fields.removeItem(position)
+                    self.toolBox_fields.insertItem(index, page["page"], page["title"])
+                self.toolBox_fields.setItemText(index, f"{page['title']} ({len(page['fields'])})")
+
+            self.pages = pages
+            self._page_field_index = {field: index for index, page in enumerate(pages) for field in page["fields"]}
+            names = [page["name"] for page in pages]
+            if current_name in names:
+                self.toolBox_fields.setCurrentIndex(names.index(current_name))
+        finally:
+            self.toolBox_fields.blockSignals(False)
+
+        for index, page in enumerate(pages):
+            if any(page is rebuilt for rebuilt in rebuild):
+                self.build_page(index)
+        self._on_toolbox_page_changed(self.toolBox_fields.currentIndex())
+
+        self.logger.info("Конфигурация страниц обновлена")
+        self.notification.show_notification("Конфигурация страниц обновлена", "info")
 
     # =============== Обработчик событий таблицы ===============
-    def _editing_values_fields(self, row, key, value):
-        """Обновляет значения полей в таблице."""
-        self.values_fields[row][key] = value
-
-    def _event_text_changed(self, row, key, value):
-        """Обработчик изменения текстового поля."""
-        self._editing_values_fields(row=row, key=key, value=value)
-        self.app.config_service.set_config_output(key='fields', value=self.values_fields)
-
-    def _event_select_сhanged(self, row, key, value):
-        """Обработчик изменения поля выбора."""
-        self._editing_values_fields(row=row, key=key, value=value)
-        self.app.config_service.set_config_output(key='fields', value=self.values_fields)
-
-    def _event_boolean_changed(self, row, key, value):
-        """Обработчик изменения булевого поля."""
-        self._editing_values_fields(row=row, key=key, value=value)
-        self.app.config_service.set_config_output(key='fields', value=self.values_fields)
-
-    def _event_number_changed(self, row, key, value):
-        """Обработчик изменения числового поля."""
-        self._editing_values_fields(row=row, key=key, value=value)
-        self.app.config_service.set_config_output(key='fields', value=self.values_fields)
+    def _event_fields_table_changed(self, changes: dict):
+        """Обработчик изменения данных таблицы полей (одно уведомление на пачку изменений)."""
+        self._fields_output_stale = True
+        self._validate_fields_table(None if changes.get("structure") else changes.get("keys"))
+        if not self._history_restoring:
+            self.history_service.record_rows(self.fields_model.store, changes, group=self._history_group)
+            self._update_history_actions()
+
+    # =============== Обработчик событий полей ===============
+    def _event_field_value_changed(self, key: str, value):
+        """Обработчик изменения значения поля: значение переносится в конфигурацию и записывается в историю."""
+        self.app.config_service.set_config_output(key=key, value=value)
+        self._validate_field(key, value, show=not self._building_page)
+        if self._history_restoring:
+            return
+        # Ввод в одно поле подряд объединяется в один шаг истории
+        self.history_service.record_value(key, value, group=self._history_group or f"field:{key}", amend=self._building_page)
+        self._update_history_actions()
+
+    # =============== Проверка конфигурации ===============
+    def _validate_field(self, key: str, value, show: bool = False):
+        """Проверяет значение поля.
+
+        Args:
+            key: Ключ поля
+            value: Значение
+            show: Показывать ошибки поля (значение изменено пользователем)
+        """
+        message = self.app.validator_service.validate_value(key, value)
+        if message is None:
+            self._field_errors.pop(key, None)
+        else:
+            self._field_errors[key] = message
+        if show:
+            self._validated_fields.add(key)
+        self._show_field_error(key)
+
+    def _show_field_error(self, key: str):
+        """Выделяет название поля с ошибкой, текст ошибки - в подсказке."""
+        widget = self.list_widget_fields.get(key)
+        if widget is None:
+            return
+        message = self._field_errors.get(key) if key in self._validated_fields else None
+        # У флажка название поля - текст самого флажка
+        label = getattr(widget, "label", None) or getattr(widget, "checkBox", None)
+        if label is None:
+            return
+        if bool(label.property("validationError")) == bool(message) and label.toolTip() == (message or ""):
+            return
+        label.setProperty("validationError", bool(message))
+        label.setToolTip(message or "")
+        StyleService.polish(label)
+
+    def _validate_fields_table(self, keys: list = None):
+        """Проверяет колонки таблицы полей и выделяет ячейки с ошибками.
+
+        Args:
+            keys: Измененные колонки (по умолчанию все)
+        """
+        validator = self.app.validator_service
+        store = self.fields_model.store
+        for table_key in validator.table_keys:
+            for column, positions in validator.validate_store(table_key, store, keys).items():
+                message = validator.get_column_validator(table_key, column).message
+                self.fields_model.set_errors(column, store.order[positions].tolist(), message)
+
+    def validate_config(self) -> list:
+        """Проверяет всю конфигурацию и показывает ошибки у всех полей.
+
+        Returns:
+            list: Ошибки конфигурации (ValidationError)
+        """
+        validator = self.app.validator_service
+        self.fields_model.flush()
+        errors = validator.validate(self.app.config_output or {},
+                                    stores={key: self.fields_model.store for key in validator.table_keys})
+        self._field_errors = {error.key: error.message for error in errors if error.column is None}
+        self._validated_fields = set(self._fields_config or {})
+        for key in self.list_widget_fields:
+            self._show_field_error(key)
+        self._validate_fields_table()
+        return errors
+
+    def _notify_validation_errors(self, errors: list):
+        """Показывает уведомление с ошибками конфигурации."""
+        if not errors:
+            return
+        lines = [str(error) for error in errors[:5]]
+        if len(errors) > 5:
+            lines.append(f"... и еще {len(errors) - 5}")
+        self.notification.show_notification("\n".join(lines), "warning", f"Ошибки в конфигурации: {len(errors)}")
+
+    # =============== История изменений ===============
+    def _get_history_values(self) -> dict:
+        """Значения полей конфигурации без таблицы полей (таблица хранится в снимках отдельно)."""
+        return {key: value for key, value in (self.app.config_output or {}).items() if key != 'fields'}
+
+    def _begin_history_group(self, name: str):
+        """Начинает группу изменений: все изменения до _end_history_group станут одним шагом истории."""
+        self._end_history_group()
+        self._history_group_number += 1
+        self._history_group = f"{name}:{self._history_group_number}"
+
+    def _end_history_group(self):
+        """Завершает группу изменений, записав в нее изменения таблицы, ожидающие уведомления."""
+        if self._history_group is not None:
+            self.fields_model.flush()
+            self._history_group = None
+
+    def _update_history_actions(self):
+        """Обновляет доступность действий отмены и повтора."""
+        self.action_undo.setEnabled(self.history_service.can_undo)
+        self.action_redo.setEnabled(self.history_service.can_redo)
+
+    def _event_btn_clicked_undo(self):
+        """Обработчик отмены последнего изменения."""
+        self._end_history_group()
+        self.fields_model.flush()
+        previous = self.history_service.current
+        snapshot = self.history_service.undo()
+        if snapshot is not None:
+            self._restore_history_snapshot(snapshot, previous)
+
+    def _event_btn_clicked_redo(self):
+        """Обработчик повтора отмененного изменения."""
+        self._end_history_group()
+        self.fields_model.flush()
+        previous = self.history_service.current
+        snapshot = self.history_service.redo()
+        if snapshot is not None:
+            self._restore_history_snapshot(snapshot, previous)
+
+    def _restore_history_snapshot(self, snapshot: HistorySnapshot, previous: HistorySnapshot):
+        """Восстанавливает значения полей и строки таблицы из снимка истории.
+
+        Args:
+            snapshot: Восстанавливаемый снимок
+            previous: Снимок, действовавший до отмены или повтора
+        """
+        self._history_restoring = True
+        try:
+            output = self.app.config_output or {}
+            for key, value in snapshot.values.items():
+                if key in output and output[key] == value:
+                    continue
+                widget = self.get_field_widget(key)
+                if widget is not None:
+                    widget.set_value(value)
+                else:
+                    self.app.config_service.set_config_output(key=key, value=value)
+
+            # Таблица заменяется, только если шаг ее изменял (снимки без изменений таблицы делят строки)
+            if snapshot.rows is not previous.rows:
+                self.fields_loader.cancel()
+                self.fields_model.set_rows(self.history_service.get_rows(snapshot))
+                self.fields_model.flush()
+                self.history_service.track(self.fields_model.store)
+        finally:
+            self._history_restoring = False
+        self._update_history_actions()
 
     # =============== Обработчик событий кнопок таблицы ===============
     def _event_btn_clicked_add_field_table(self, data_value: dict = None):
         """Обработчик добавления поля."""
-        row = self.table_fields.rowCount()
-        self.table_fields.insertRow(row)
-        dict_fields = {}
-        dict_fields_widget = {}
-        for col, column in enumerate(self.app.columns_table):
-            if column['key'] == 'action':
-                widget = ActionItemTableWidget(column=column, row=row, event_on_changed=self._event_btn_clicked_delete_row)
-            elif column['type'] == 'text':
-                widget = TextItemTableWidget(column=column, row=row, event_on_changed=self._event_text_changed)
-                dict_fields[column['key']] = ""
-                dict_fields_widget[column['key']] = widget
-            elif column['type'] == 'select':
-                widget = SelectItemTableWidget(column=column, row=row, event_on_changed=self._event_select_сhanged)
-                dict_fields[column['key']] = ""
-                dict_fields_widget[column['key']] = widget
-            elif column['type'] == 'number':
-                widget = NumberItemTableWidget(column=column, row=row, event_on_changed=self._event_number_changed)
-                dict_fields[column['key']] = ""
-                dict_fields_widget[column['key']] = widget
-            elif column['type'] == 'boolean':
-                widget = BooleanItemTableWidget(column=column, row=row, event_on_changed=self._event_boolean_changed)
-                dict_fields[column['key']] = ""
-                dict_fields_widget[column['key']] = widget
-            else:
-                continue
-
-            self.table_fields.setCellWidget(row, col, widget)
-
-        self.values_fields.append(dict_fields)
-
-        if data_value:
-            for key, value in data_value.items():
-                if key in dict_fields_widget:
-                    dict_fields_widget[key].set_value(value)
+        self.fields_model.append_row(data_value=data_value or None)
 
     def _event_btn_clicked_clear_fields_table(self):
         """Очистить таблицу"""
@@ -515,21 +1270,46 @@ class MainWindow(UiMainWindow):
 
 
     def _event_btn_clicked_clear_fields_table_confirm(self, form: ContentForm):
-        self.table_fields.setRowCount(0)
-        self.values_fields = []
-        self.app.config_service.set_config_output(key='fields', value=self.values_fields)
+        self.fields_loader.cancel()
+        self._end_history_group()
+        self.fields_model.clear()
         form.close()
         self.notification.show_notification("Таблица очищена!", "info", "Очистка таблицы")
 
+    def _event_btn_clicked_map_types_fields_table(self):
+        """Обработчик заполнения типов ClickHouse по типам источника для всех строк таблицы."""
+        mapping = self.app.type_mapping_service
+        store = self.fields_model.store
+        if not len(store) or mapping.source_key not in store.columns:
+            return
+        self.fields_model.flush()
+        # Колонка типа хранится кодами категорий: правила применяются к категориям, а не к строкам
+        nullable = None
+        if mapping.nullable_key in store.columns:
+            nullable = mapping.to_nullable(store.get_column(mapping.nullable_key).tolist())
+        source, target, nullable = mapping.map_codes(
+            store.get_categories(mapping.source_key), store.get_codes(mapping.source_key), nullable)
+
+        values = {mapping.source_key: source}
+        if mapping.target_key in store.columns:
+            # Тип ClickHouse, уже указанный допустимым значением, сохраняется, как и при загрузке полей из БД
+            target, nullable = mapping.keep_explicit(store.get_column(mapping.target_key).tolist(), target, nullable)
+            values[mapping.target_key] = target
+        if mapping.nullable_key in store.columns:
+            values[mapping.nullable_key] = nullable
+        self.fields_model.set_columns_values({key: column.tolist() for key, column in values.items()})
+        self.notification.show_notification(f"Типы заполнены для {len(store)} строк", "info", "Типы полей")
+
     def _event_btn_clicked_delete_row(self, row):
-        """Обработчик удаления строки."""
-        self.table_fields.removeRow(row)
-        self.values_fields.pop(row)
-        self.app.config_service.set_config_output(key='fields', value=self.values_fields)
+        """Обработчик удаления строки (номер строки представления с учетом фильтра)."""
+        self.fields_model.remove_row(self.fields_proxy.get_source_row(row))
 
     # =============== Обработчик событий кнопок формы ===============
     def _event_btn_clicked_save_fields_table(self):
         """Обработчик сохранения полей."""
+        self.build_pages()
+        self.sync_fields_output()
+        self._notify_validation_errors(self.validate_config())
         default_dir = self.app.file_service.get_save_config_path() / self.app.file_service.get_file_name_config_save()
         file_path, _ = QFileDialog.getSaveFileName(
             self,
@@ -538,11 +1318,9 @@ class MainWindow(UiMainWindow):
             "JSON Files (*.json)"
         )
         if file_path:
-            try:
-                self.app.save_data(path=Path(file_path))
-                self.notification.show_notification(f"Файл: {file_path} сохранен!", "info", "Сохранение файла")
-            except Exception as e:
-                self.notification.show_notification(f"Не удалось сохранить файл: {e}", "error", "Ошибка сохранения файла")
+            # Файл записывается в фоновом потоке, уведомление показывается по сигналу file_saved
+            self._saving_files.add(str(Path(file_path)))
+            self.app.save_data(path=Path(file_path))
 
     def _event_btn_clicked_load_fields_table(self):
         """Обработчик загрузки полей."""
@@ -552,22 +1330,74 @@ class MainWindow(UiMainWindow):
             "JSON Files (*.json)"
         )
         if file_path:
-            with open(file_path, mode="r", encoding="utf-8") as f:
-                self.app.load_file_data= json.load(f)
+            self.open_config_file(Path(file_path))
+
+    def open_config_file(self, path: Path) -> bool:
+        """Загружает сохраненную конфигурацию из файла.
+
+        Args:
+            path: Путь к файлу
+
+        Returns:
+            bool: Конфигурация загружена
+        """
+        try:
+            data = self.app.serializer_service.read(path)
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Ошибка при загрузке файла {path}: {e}")
+            self.notification.show_notification(f"Не удалось загрузить файл {path}", "error", "Ошибка загрузки")
+            return False
+        if not isinstance(data, dict):
+            self.notification.show_notification(f"Файл {path} не является конфигурацией", "error", "Ошибка загрузки")
+            return False
+        self.app.load_file_data = data
+        self.load_field_data()
+        return True
+
+    def _event_btn_clicked_open_config_catalog(self):
+        """Обработчик открытия каталога сохраненных конфигураций.
+        Каталог сразу показывает записи базы, обновление по файлам идет в фоновом потоке."""
+        catalog = ConfigCatalogWidget(index_service=self.app.config_index_service)
+        catalog.set_progress(0, 0)
+        self.app.rescan_config_index(
+            progress=catalog.set_progress,
+            result=catalog.on_rescan_finished,
+            error=catalog.on_rescan_error
+        )
+        content_form = ContentForm(
+            title="Каталог конфигураций",
+            content=catalog,
+            ok_callback=lambda: self._open_catalog_config(catalog.get_selected_path(), content_form),
+            app=self.app,
+            height=550,
+            width=900
+        )
+        catalog.config_selected.connect(lambda path: self._open_catalog_config(path, content_form))
+        content_form.exec_()
 
-            self.load_field_data()
+    def _open_catalog_config(self, path: str, form: ContentForm):
+        """Загружает конфигурацию, выбранную в каталоге, и закрывает каталог."""
+        if not path:
+            return
+        if self.open_config_file(Path(path)):
+            form.close()
+        else:
+            # Файл удален или поврежден после обновления каталога
+            self.app.config_index_service.update_file(Path(path))
 
     def _event_btn_clicked_view_fields_table(self):
         """Обработчик просмотра полей."""
+        self.build_pages()
+        self.sync_fields_output()
         if not self.app.config_output:
             self.notification.show_notification("Не удалось загрузить поля!", "error", "Ошибка загрузки полей")
             return
 
-        content_layout = ViewJSONWidget(text=json.dumps(self.app.config_output, indent=4, ensure_ascii=False), working_dir=self.working_dir, app=self.app)
+        content_layout = ViewJSONWidget(text=self.app.serializer_service.dumps(self.app.config_output, pretty=True), working_dir=self.working_dir, app=self.app)
 
         # Создаем кнопку для копирования в буфер обмена
         copy_button = QtWidgets.QPushButton("Копировать")
-        copy_button.clicked.connect(lambda: QApplication.clipboard().setText(json.dumps(self.app.config_output, indent=4, ensure_ascii=False)))
+        copy_button.clicked.connect(lambda: QApplication.clipboard().setText(self.app.serializer_service.dumps(self.app.config_output, pretty=True)))
 
         # Добавляем кнопку в контент
         save_button = QtWidgets.QPushButton("Сохранить")
@@ -585,6 +1415,11 @@ class MainWindow(UiMainWindow):
         )
         view_message_box.exec_()
 
+    def _event_btn_clicked_clear_query_cache(self):
+        """Обработчик очистки кэша результатов SQL скриптов."""
+        self.app.query_cache_service.invalidate()
+        self.notification.show_notification("Кэш результатов SQL скриптов очищен!", "info", "Очистка кэша")
+
     def _event_btn_clicked_open_git_form(self):
         """Обработчик git операций."""
         pass
@@ -632,19 +1467,18 @@ class MainWindow(UiMainWindow):
     def _event_btn_clicked_test_connect(self):
         """Тест подключения к PostgreSQL."""
         try:
+            if self.app.is_connecting_pg:
+                self.notification.show_notification("Подключение к PostgreSQL уже выполняется", "warning")
+                return
+
             self.app.signals.postgres_disconnected.emit()
             self.app.postgres_service.close()
 
             self.app.postgres_service.set_config(self.app.config_service.get_sql_connect(key='pg'))
 
-            self.app.postgres_service.connect()
-
-            if self.app.postgres_service.is_connected:
-                self.notification.show_notification("Подключение к PostgreSQL установлено!", "info")
-                self.app.signals.postgres_connected.emit()
-            else:
-                self.notification.show_notification(f"Не удалось установить подключение к PostgreSQL!", "error", "Ошибка подключения к PostgreSQL")
-                self.app.signals.postgres_disconnected.emit()
+            # Результат подключения будет показан в _on_signal_postgres_connection_changed
+            self._notify_connect_pg_result = True
+            self.app.connect_pg_async()
         except Exception as e:
             self.logger.error(f"Ошибка при тестировании подключения к PostgreSQL: {e}")
             self.notification.show_notification(f"Ошибка при тестировании подключения к PostgreSQL: {e}", "error", "Ошибка тестирования подключения к PostgreSQL")
@@ -655,7 +1489,9 @@ class MainWindow(UiMainWindow):
             parent=self,
             app=self.app,
             event_render_sql_script=self._event_btn_clicked_render_sql_script,
-            event_run_sql_script=self._event_btn_clicked_run_sql_script
+            event_run_sql_script=self._event_btn_clicked_run_sql_script,
+            event_report_sql_script=self._event_btn_clicked_report_sql_script,
+            event_explain_sql_script=self._event_btn_clicked_explain_sql_script
             )
         content_layout.set_text(text=self.app.sql_scripts[key], key=key, value=value)
 
@@ -677,7 +1513,7 @@ class MainWindow(UiMainWindow):
             sql_script = self.app.sql_scripts[key]
 
         try:
-            sql_script = jinja2.Template(sql_script).render(value=value)
+            sql_script = self.app.template_service.render(sql_script, value=value)
         except Exception as e:
             return f"Не удалось рендерить скрипт SQL: {e}"
 
@@ -704,17 +1540,30 @@ class MainWindow(UiMainWindow):
 
         try:
             # Получаем SQL-скрипт
+            params = None
             if sql_script is None:
                 script = self.app.sql_scripts.get(key, "")
                 if not script:
                     raise ValueError(f"SQL скрипт с ключом {key} не найден")
+                # Шаблон рендерится в рабочем потоке с параметрами поля
+                params = {"value": value}
             else:
                 script = sql_script
 
             # Создаем и настраиваем рабочий поток
-            self.sql_worker = SQLWorker(app=self.app, script=script)
+            # Замена строк таблицы результатом скрипта отменяется одним шагом
+            self._begin_history_group("sql")
+            self._sql_rows_loaded = 0
+            self._sql_rows_keys = None
+            # Результаты скриптов из sql_scripts.json берутся из кэша, если они там есть
+            # Значения {{ value|bind }} передаются параметрами подготовленного запроса ключа скрипта
+            self.sql_worker = SQLWorker(app=self.app, script=script, params=params, stream=True, use_cache=sql_script is None, statement_key=key)
+            self.sql_worker.batch.connect(self._on_sql_batch)
+            self.sql_worker.rows_fetched.connect(self._on_sql_rows_fetched)
+            self.sql_worker.stream_finished.connect(self._on_sql_stream_finished)
             self.sql_worker.finished.connect(self._on_sql_finished)
             self.sql_worker.error.connect(self._on_sql_error)
+            self.sql_worker.cancelled.connect(self._on_sql_cancelled)
             self.sql_worker.progress.connect(self._on_sql_progress)
             self.sql_worker.start()
 
@@ -724,47 +1573,181 @@ class MainWindow(UiMainWindow):
             self.notification.show_notification(error_msg, "error")
             self.loading_widget.hide_loading()
 
+    def _event_btn_clicked_report_sql_script(self, sql_script: str):
+        """Обработчик выполнения скрипта SQL с отчетом по выражениям."""
+        if not self.app.postgres_service or not self.app.postgres_service.is_connected:
+            self.logger.error("Попытка выполнить SQL скрипт без подключения к PostgreSQL")
+            self.notification.show_notification("Не удалось установить подключение к PostgreSQL!", "error", "Ошибка подключения к PostgreSQL")
+            return
+
+        self.loading_widget = LoadingWidget(self)
+        self.loading_widget.show_loading("Выполнение SQL скрипта по выражениям...")
+        self.loading_widget.cancelled.connect(self._cancel_sql_execution)
+
+        self.sql_worker = SQLWorker(app=self.app, script=sql_script, report=True)
+        self.sql_worker.statements_report.connect(self._on_sql_statements_report)
+        self.sql_worker.cancelled.connect(self._on_sql_cancelled)
+        self.sql_worker.error.connect(self._on_sql_error)
+        self.sql_worker.start()
+
+    def _on_sql_statements_report(self, report: dict):
+        """Отображение отчета о выполнении скрипта по выражениям"""
+        self.loading_widget.hide_loading()
+
+        text_edit = QtWidgets.QTextEdit()
+        text_edit.setReadOnly(True)
+        text_edit.setLineWrapMode(QtWidgets.QTextEdit.NoWrap)
+        text_edit.setFont(QtGui.QFont("Consolas", 10))
+        text_edit.setPlainText(PostgresService.format_statements_report(report))
+
+        copy_button = QtWidgets.QPushButton("Копировать")
+        copy_button.clicked.connect(lambda: QApplication.clipboard().setText(text_edit.toPlainText()))
+
+        form = ContentForm(
+            title="Отчет по выражениям SQL",
+            content=text_edit,
+            ok_callback=None,
+            custom_buttons=[copy_button],
+            app=self.app,
+            width=700
+        )
+        form.exec_()
+
+    def _event_btn_clicked_explain_sql_script(self, sql_script: str):
+        """Обработчик профилирования скрипта SQL через EXPLAIN ANALYZE."""
+        if not self.app.postgres_service or not self.app.postgres_service.is_connected:
+            self.logger.error("Попытка выполнить SQL скрипт без подключения к PostgreSQL")
+            self.notification.show_notification("Не удалось установить подключение к PostgreSQL!", "error", "Ошибка подключения к PostgreSQL")
+            return
+
+        self.loading_widget = LoadingWidget(self)
+        self.loading_widget.show_loading("Построение плана выполнения SQL скрипта...")
+        self.loading_widget.cancelled.connect(self._cancel_sql_execution)
+
+        self.sql_worker = SQLWorker(app=self.app, script=sql_script, explain=True)
+        self.sql_worker.explain_plan.connect(self._on_sql_explain_plan)
+        self.sql_worker.cancelled.connect(self._on_sql_cancelled)
+        self.sql_worker.error.connect(self._on_sql_error)
+        self.sql_worker.start()
+
+    def _on_sql_explain_plan(self, plan: dict):
+        """Отображение плана выполнения SQL скрипта"""
+        self.loading_widget.hide_loading()
+
+        plan_widget = SQLPlanWidget(app=self.app)
+        plan_widget.set_plan(plan)
+
+        copy_button = QtWidgets.QPushButton("Копировать JSON")
+        copy_button.clicked.connect(lambda: QApplication.clipboard().setText(self.app.serializer_service.dumps(plan, pretty=True)))
+
+        form = ContentForm(
+            title="План выполнения SQL",
+            content=plan_widget,
+            ok_callback=None,
+            custom_buttons=[copy_button],
+            app=self.app,
+            width=900
+        )
+        form.exec_()
+
     def _on_sql_finished(self, results):
         """Обработка успешного завершения выполнения SQL-запроса"""
         try:
             self.logger.info("SQL скрипт выполнен успешно")
             self.loading_widget.update_status("Обработка результатов...")
-            total_rows = len(results)
-
-            # Очищаем таблицу перед загрузкой новых данных
-            self.table_fields.setRowCount(0)
-            self.values_fields = []
 
-            # Загружаем данные с отображением прогресса
-            for i, values in enumerate(results):
-                progress = int((i + 1) / total_rows * 100)
-                keys = self.app.config_service.get_config_tables_keys()
-                fields = dict(zip(keys, values))
-                self._event_btn_clicked_add_field_table(data_value=fields)
-                self.loading_widget.update_status(f"Обработка результатов... {progress}%", progress)
+            # Строки добавляются частями, ключи колонок определяются один раз
+            keys = self.app.config_service.get_config_tables_keys()
+            # Типы ClickHouse заполняются одним проходом по всему результату до вставки строк
+            results = self.app.type_mapping_service.apply_rows(results, keys)
+            self.fields_loader.start(rows=results, keys=keys)
 
-            # Завершаем загрузку
+        except Exception as e:
+            error_msg = f"Ошибка при обработке результатов: {e}"
+            self.logger.error(error_msg)
+            self.notification.show_notification(error_msg, "error")
             self.loading_widget.hide_loading()
-            self.notification.show_notification(
-                f"Загрузка данных завершена! Данных в таблице: {total_rows} строк",
-                "info"
-            )
+
+    def _on_fields_loader_progress(self, loaded, total):
+        """Обработка прогресса загрузки строк в таблицу"""
+        progress = int(loaded / total * 100) if total else 100
+        self.loading_widget.update_status(f"Обработка результатов... {progress}%", progress)
+
+    def _on_fields_loader_finished(self, total_rows):
+        """Обработка окончания загрузки строк в таблицу"""
+        self._end_history_group()
+        self.loading_widget.hide_loading()
+        # Индекс поиска строится сразу, чтобы первый поиск не ждал его построения
+        self.fields_proxy.index_service.sync()
+        self.notification.show_notification(
+            f"Загрузка данных завершена! Данных в таблице: {total_rows} строк",
+            "info"
+        )
+
+    def _on_sql_batch(self, rows):
+        """Обработка очередной пачки строк потоковой выборки"""
+        worker = self.sender()
+        try:
+            if isinstance(worker, SQLWorker) and worker.is_cancelled:
+                return
+
+            # Очищаем таблицу только при получении первой пачки
+            if self._sql_rows_loaded == 0:
+                self.fields_loader.cancel()
+                self.fields_model.clear()
+
+            if self._sql_rows_keys is None:
+                self._sql_rows_keys = self.app.config_service.get_config_tables_keys()
+            rows = self.app.type_mapping_service.apply_rows(rows, self._sql_rows_keys)
+            self.table_fields.setUpdatesEnabled(False)
+            try:
+                self.fields_model.append_prepared_rows(
+                    [self.fields_model.create_row_from_values(self._sql_rows_keys, values) for values in rows]
+                )
+            finally:
+                self.table_fields.setUpdatesEnabled(True)
+
+            self._sql_rows_loaded += len(rows)
 
         except Exception as e:
             error_msg = f"Ошибка при обработке результатов: {e}"
             self.logger.error(error_msg)
             self.notification.show_notification(error_msg, "error")
-            self.loading_widget.hide_loading()
+        finally:
+            if isinstance(worker, SQLWorker):
+                worker.batch_consumed()
+
+    def _on_sql_rows_fetched(self, value):
+        """Обработка количества строк, полученных от сервера"""
+        self.loading_widget.update_status(f"Выполнение SQL скрипта... Получено строк: {value}")
+
+    def _on_sql_stream_finished(self, total_rows):
+        """Обработка завершения потоковой выборки"""
+        self.logger.info("SQL скрипт выполнен успешно")
+        if self._sql_rows_loaded == 0:
+            self.fields_model.clear()
+        self._end_history_group()
+
+        self.loading_widget.hide_loading()
+        self.notification.show_notification(
+            f"Загрузка данных завершена! Данных в таблице: {total_rows} строк",
+            "info"
+        )
 
     def _on_sql_error(self, error_message):
         """Обработка ошибки выполнения SQL-запроса"""
         self.logger.error(f"Ошибка выполнения SQL скрипта: {error_message}")
+        self._end_history_group()
         self.notification.show_notification(
             f"Ошибка выполнения SQL скрипта: {error_message}",
             "error"
         )
         self.loading_widget.hide_loading()
 
+    def _on_sql_cancelled(self):
+        """Обработка завершения отмененного SQL-запроса"""
+        self.logger.info("Выполнение SQL скрипта отменено, соединение возвращено в пул")
+
     def _on_sql_progress(self, value):
         """Обработка обновления прогресса"""
         self.loading_widget.update_status(f"Выполнение SQL скрипта... {value}%", value)
@@ -772,8 +1755,14 @@ class MainWindow(UiMainWindow):
     def _cancel_sql_execution(self):
         """Обработка отмены выполнения SQL-запроса"""
         if hasattr(self, 'sql_worker') and self.sql_worker.isRunning():
-            self.sql_worker.terminate()  # Останавливаем поток
-            self.sql_worker.wait()      # Ждем завершения потока
+            # Отменяем запрос на сервере, поток завершится сам и вернет соединение в пул
+            self.sql_worker.cancel()
+            # Храним ссылку на поток до его завершения
+            self.sql_workers_cancelled = [worker for worker in self.sql_workers_cancelled if worker.isRunning()]
+            self.sql_workers_cancelled.append(self.sql_worker)
+        # Загрузка уже полученных строк в таблицу тоже прерывается
+        self.fields_loader.cancel()
+        self._end_history_group()
         self.loading_widget.hide_loading()
         self.notification.show_notification(
             "Выполнение SQL скрипта отменено пользователем",
@@ -789,6 +1778,29 @@ class MainWindow(UiMainWindow):
         """Обработчик сигнала отключения от PostgreSQL."""
         self.action_connect_pg.set_status_connect_off()
 
+    def _on_signal_postgres_connection_changed(self, status: bool, message: str):
+        """Обработчик результата фонового подключения к PostgreSQL."""
+        if not self._notify_connect_pg_result:
+            return
+        self._notify_connect_pg_result = False
+
+        if status:
+            self.notification.show_notification("Подключение к PostgreSQL установлено!", "info")
+        else:
+            self.notification.show_notification(message, "error", "Ошибка подключения к PostgreSQL")
+
+    def _on_signal_file_saved(self, path: str):
+        """Обработчик сигнала записи файла."""
+        if path in self._saving_files:
+            self._saving_files.discard(path)
+            self.notification.show_notification(f"Файл: {path} сохранен!", "info", "Сохранение файла")
+        # Сохраненная конфигурация сразу попадает в каталог
+        self.app.config_index_service.update_file(Path(path))
+
+    def _on_signal_file_error(self, message: str):
+        """Обработчик сигнала ошибки записи файла."""
+        self.notification.show_notification(message, "error", "Ошибка сохранения файла")
+
     def _callback_btn_ok_save_settings_pg(self, data: dict, form: ContentForm):
         """Обработчик сохранения настроек подключения к PostgreSQL."""
         self.app.config_service.set_sql_connect(key='pg', value=data)
@@ -796,12 +1808,10 @@ class MainWindow(UiMainWindow):
 
         self.app.postgres_service.set_config(self.app.config_service.get_sql_connect(key='pg'))
 
-        self.app.postgres_service.connect()
-
-        if self.app.postgres_service and self.app.postgres_service.is_connected:
-            self.app.signals.postgres_connected.emit()
-        else:
+        if self.app.connect_pg_async():
             self.app.signals.postgres_disconnected.emit()
+        else:
+            self.notification.show_notification("Подключение к PostgreSQL уже выполняется, повторите проверку позже", "warning")
 
         form.close()
 
@@ -840,14 +1850,19 @@ class MainWindow(UiMainWindow):
     # =============== Вспомогательные методы ===============
     def load_field_data(self):
         """Загружает данные из файла JSON."""
+        # Загрузка файла отменяется одним шагом истории
+        self._begin_history_group("load_file")
         for key, value in self.app.load_file_data.items():
             if key == 'fields':
-                self.table_fields.setRowCount(0)
-                for field in value:
-                    self._event_btn_clicked_add_field_table(data_value=field)
-            else:
-                if key in self.list_widget_fields:
-                    self.list_widget_fields[key].set_value(value)
+                continue
+            widget = self.get_field_widget(key)
+            if widget is not None:
+                widget.set_value(value)
+        # Строки таблицы загружаются частями, группа завершится по окончании загрузки
+        if 'fields' in self.app.load_file_data:
+            self.fields_loader.start(rows=self.app.load_file_data['fields'])
+        else:
+            self._end_history_group()
 
 
 def main():
@@ -0,0 +1,284 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from services.logger_service import LoggerService
+from services.serializer_service import SerializerService
+
+
+class ConfigIndexService:
+    """Каталог сохраненных конфигураций в SQLite.
+
+    Для каждого файла в папке сохранения хранятся ключевые поля конфигурации
+    (объект, система-источник, endpoint, домен), время изменения, размер и хэш
+    содержимого. При обновлении каталога файлы с прежними временем изменения
+    и размером не читаются, а файлы с прежним хэшем не разбираются заново,
+    поэтому повторное обновление тысяч файлов сводится к их перечислению.
+    Поиск выполняется запросом к базе без чтения файлов.
+
+    Каждый поток работает со своим подключением к базе, поэтому обновление каталога
+    можно выполнять в фоновом потоке, пока интерфейс ищет по прежнему состоянию.
+    Для поиска без учета регистра (в том числе кириллицы) значения ключевых полей
+    дополнительно хранятся в нижнем регистре: SQLite приводит к нижнему регистру только латиницу.
+    """
+
+    # Поля конфигурации, по которым строится каталог
+    KEYS = ("object_name", "source_system", "endpoint", "domain")
+
+    # Версия схемы базы: при изменении таблица каталога создается заново
+    SCHEMA_VERSION = 2
+
+    # Количество файлов, записываемых при обновлении каталога одной транзакцией:
+    # между транзакциями база доступна для записи другим потокам
+    RESCAN_BATCH = 100
+
+    # Максимальное количество результатов поиска
+    SEARCH_LIMIT = 500
+
+    def __init__(self,
+                 index_file: Path,
+                 save_dir: Path,
+                 serializer_service: SerializerService = None,
+                 logger_service: LoggerService = None):
+        """
+        Инициализация каталога.
+
+        Args:
+            index_file: Файл базы SQLite
+            save_dir: Папка сохраненных конфигураций
+            serializer_service: Сервис сериализации JSON
+            logger_service: Сервис логирования
+        """
+        self.index_file = Path(index_file)
+        self.save_dir = Path(save_dir)
+        self.serializer_service = serializer_service or SerializerService(logger_service=logger_service)
+        self.logger_service = logger_service
+
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._init_schema()
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        """Подключение к базе текущего потока."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(str(self.index_file), timeout=10, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _init_schema(self) -> None:
+        # Журнал WAL: поиск читает базу, пока фоновый поток обновляет каталог
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        with self._connection:
+            version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != self.SCHEMA_VERSION:
+                self._connection.execute("DROP TABLE IF EXISTS configs")
+            columns = ", ".join(f"{key} TEXT NOT NULL DEFAULT '', {key}_lower TEXT NOT NULL DEFAULT ''"
+                                for key in self.KEYS)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS configs ("
+                "path TEXT PRIMARY KEY, name TEXT NOT NULL, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, "
+                f"hash TEXT NOT NULL, {columns}, search TEXT NOT NULL DEFAULT '')")
+            for key in self.KEYS:
+                self._connection.execute(f"CREATE INDEX IF NOT EXISTS configs_{key} ON configs ({key}_lower)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS configs_mtime ON configs (mtime_ns)")
+            self._connection.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        """Закрывает подключения к базе каталога."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    def close_connection(self) -> None:
+        """Закрывает подключение текущего потока (в конце работы фонового потока)."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            return
+        self._local.connection = None
+        with self._lock:
+            if connection in self._connections:
+                self._connections.remove(connection)
+        connection.close()
+
+    # =============== Обновление каталога ===============
+    def rescan(self,
+               progress: Callable[[int, int], None] = None,
+               interrupted: Callable[[], bool] = None) -> Tuple[int, int]:
+        """
+        Обновляет каталог по файлам папки сохранения. Можно вызывать из фонового потока.
+        Записи сохраняются транзакциями по RESCAN_BATCH файлов, поэтому прерванное
+        обновление сохраняет обработанные файлы, а следующее продолжает с остальных.
+
+        Args:
+            progress: Вызывается по ходу обновления (обработано файлов, всего файлов)
+            interrupted: Возвращает True, если обновление нужно прервать (например, при выходе из приложения)
+
+        Returns:
+            Tuple[int, int]: Количество добавленных или измененных и удаленных записей
+        """
+        known = {row["path"]: (row["mtime_ns"], row["size"], row["hash"])
+                 for row in self._connection.execute("SELECT path, mtime_ns, size, hash FROM configs")}
+        files = self._list_files()
+
+        updated = 0
+        removed = []
+        try:
+            for number, (key, stat) in enumerate(files.items(), start=1):
+                if interrupted is not None and interrupted():
+                    break
+                if self._index_file(key, Path(key), known.get(key), stat):
+                    updated += 1
+                if number % self.RESCAN_BATCH == 0:
+                    self._connection.commit()
+                    if progress is not None:
+                        progress(number, len(files))
+            else:
+                if progress is not None:
+                    progress(len(files), len(files))
+                removed = [(path,) for path in known if path not in files]
+                self._connection.executemany("DELETE FROM configs WHERE path = ?", removed)
+            self._connection.commit()
+        except Exception:
+            self._connection.rollback()
+            raise
+        if (updated or removed) and self.logger_service is not None:
+            self.logger_service.info(f"Каталог конфигураций обновлен: изменено {updated}, удалено {len(removed)}")
+        return updated, len(removed)
+
+    def _list_files(self) -> Dict[str, os.stat_result]:
+        """Возвращает файлы JSON папки сохранения (включая вложенные папки) с результатами stat."""
+        files = {}
+        directories = [str(self.save_dir.resolve())]
+        while directories:
+            try:
+                entries = list(os.scandir(directories.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                elif entry.name.lower().endswith(".json") and entry.is_file():
+                    try:
+                        files[entry.path] = entry.stat()
+                    except OSError:
+                        continue
+        return files
+
+    def update_file(self, path: Path) -> bool:
+        """
+        Обновляет запись одного файла (например, после сохранения конфигурации).
+
+        Args:
+            path: Путь к файлу
+
+        Returns:
+            bool: Запись добавлена или изменена
+        """
+        path = Path(path).resolve()
+        if self.save_dir.resolve() not in path.parents:
+            return False
+        key = str(path)
+        try:
+            with self._connection:
+                if not path.is_file():
+                    self._connection.execute("DELETE FROM configs WHERE path = ?", (key,))
+                    return False
+                row = self._connection.execute("SELECT mtime_ns, size, hash FROM configs WHERE path = ?", (key,)).fetchone()
+                return self._index_file(key, path, tuple(row) if row is not None else None)
+        except sqlite3.Error as e:
+            # База занята обновлением каталога дольше ожидания - файл попадет в каталог при следующем обновлении
+            if self.logger_service is not None:
+                self.logger_service.error(f"Не удалось обновить запись каталога для файла {path}: {e}")
+            return False
+
+    def _index_file(self, key: str, path: Path, known: Optional[tuple], stat: os.stat_result = None) -> bool:
+        """Записывает файл в каталог, если он изменился. Вызывается внутри транзакции."""
+        try:
+            stat = stat or path.stat()
+            if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+                return False
+            content = path.read_bytes()
+        except OSError as e:
+            if self.logger_service is not None:
+                self.logger_service.error(f"Ошибка чтения файла {path}: {e}")
+            return False
+
+        digest = hashlib.sha1(content).hexdigest()
+        if known is not None and known[2] == digest:
+            # Изменилось только время изменения файла
+            self._connection.execute("UPDATE configs SET mtime_ns = ?, size = ? WHERE path = ?",
+                                     (stat.st_mtime_ns, stat.st_size, key))
+            return False
+
+        values = self._read_keys(path, content)
+        search = " ".join([path.name, *values]).lower()
+        columns = ", ".join(f"{key}, {key}_lower" for key in self.KEYS)
+        self._connection.execute(
+            f"INSERT OR REPLACE INTO configs (path, name, mtime_ns, size, hash, {columns}, search) "
+            f"VALUES (?, ?, ?, ?, ?, {', '.join('?, ?' for _ in self.KEYS)}, ?)",
+            (key, path.name, stat.st_mtime_ns, stat.st_size, digest,
+             *(item for value in values for item in (value, value.lower())), search))
+        return True
+
+    def _read_keys(self, path: Path, content: bytes) -> List[str]:
+        """Возвращает значения ключевых полей конфигурации (пустые, если файл не удается разобрать)."""
+        try:
+            data = self.serializer_service.loads(content)
+        except ValueError as e:
+            if self.logger_service is not None:
+                self.logger_service.warning(f"Файл {path} не является конфигурацией JSON: {e}")
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        return ["" if data.get(key) is None else str(data.get(key)) for key in self.KEYS]
+
+    # =============== Поиск ===============
+    def search(self, text: str = "", limit: int = SEARCH_LIMIT) -> List[Dict[str, Any]]:
+        """
+        Ищет конфигурации.
+
+        Слова запроса ищутся в ключевых полях и имени файла (должны встретиться все),
+        слово вида ключ:значение - точное совпадение поля без учета регистра (например, domain:oillg).
+
+        Args:
+            text: Текст запроса (пустой - все конфигурации)
+            limit: Максимальное количество результатов
+
+        Returns:
+            List[Dict[str, Any]]: Записи каталога, сначала недавно измененные
+        """
+        where, params = self._get_where(text)
+        rows = self._connection.execute(
+            f"SELECT path, name, mtime_ns, {', '.join(self.KEYS)} FROM configs {where} ORDER BY mtime_ns DESC LIMIT ?",
+            (*params, limit))
+        return [dict(row) for row in rows]
+
+    def count(self, text: str = "") -> int:
+        """Возвращает количество конфигураций, найденных по тексту запроса (пустой - всех в каталоге)."""
+        where, params = self._get_where(text)
+        return self._connection.execute(f"SELECT COUNT(*) FROM configs {where}", params).fetchone()[0]
+
+    def _get_where(self, text: str) -> Tuple[str, List[str]]:
+        """Возвращает условие WHERE и его параметры для текста запроса (см. search)."""
+        conditions, params = [], []
+        for word in text.split():
+            key, separator, value = word.partition(":")
+            if separator and key in self.KEYS:
+                conditions.append(f"{key}_lower = ?")
+                params.append(value.lower())
+            else:
+                conditions.append("instr(search, ?) > 0")
+                params.append(word.lower())
+        return (f"WHERE {' AND '.join(conditions)}" if conditions else ""), params
@@ -1,4 +1,4 @@
-import json
+import copy
 import os
 from pathlib import Path
 from abc import ABC, abstractmethod
@@ -6,6 +6,8 @@ from typing import Dict, Any, Optional, Tuple
 from services.crypto_text_service import CryptoTextService
 from services.file_structure_service import FileStructureService
 from services.logger_service import LoggerService
+from services.persistence_service import PersistenceService
+from services.serializer_service import SerializerService
 
 
 class ConfigService:
@@ -15,13 +17,17 @@ class ConfigService:
                  working_dir: Path,
                  logger_service: LoggerService,
                  file_service: FileStructureService = None,
-                 crypto_service: CryptoTextService = None):
+                 crypto_service: CryptoTextService = None,
+                 persistence_service: PersistenceService = None,
+                 serializer_service: SerializerService = None):
         """
         Инициализация сервиса конфигурации.
 
         Args:
             working_dir: Рабочая директория приложения
             logger_service: Сервис логирования
+            persistence_service: Сервис отложенной записи файлов (без него файлы записываются сразу)
+            serializer_service: Сервис сериализации JSON
         """
         self.config_fields_data = {}
         self.config_pages_data = {}
@@ -32,6 +38,8 @@ class ConfigService:
         self.logger_service = logger_service
         self.file_service = file_service
         self.crypto_service = crypto_service
+        self.persistence_service = persistence_service
+        self.serializer_service = serializer_service or SerializerService(logger_service=logger_service)
 
         self.working_dir = working_dir
         self.config_path = file_service.get_config_path()
@@ -45,6 +53,13 @@ class ConfigService:
 
         self.init_config()
 
+    def _save_json(self, file_path: Path, data: Dict[str, Any], pretty: bool = True) -> None:
+        """Сохраняет файл конфигурации: в фоновом потоке, если задан сервис записи, иначе сразу (атомарно).
+        Файлы конфигурации читает и правит пользователь, поэтому по умолчанию они сохраняются в читаемом виде."""
+        if self.persistence_service is not None:
+            self.persistence_service.schedule(file_path, data, pretty=pretty)
+        else:
+            PersistenceService.write_text(file_path, self.serializer_service.dumps(data, pretty=pretty))
 
      # =============== Инициализация ===============
     def init_config(self) -> None:
@@ -70,16 +85,38 @@ class ConfigService:
         elif os.path.getsize(self.config_fields_file) == 0:
             self.set_config_fields(data={})
         else:
-            with open(file=self.config_fields_file, mode='r', encoding='utf-8') as file:
-                self.set_config_fields(data=json.load(file))
+            self.set_config_fields(data=self.serializer_service.read(self.config_fields_file))
+
+    def reload_config_fields(self) -> bool:
+        """
+        Перечитывает конфигурацию полей после изменения файла.
+        Если файл не удается разобрать, он пустой (например, сохраняется во время правки)
+        или в нем нет колонок таблицы, остается прежняя конфигурация.
+
+        Returns:
+            bool: Конфигурация перечитана
+        """
+        try:
+            data = self.serializer_service.read(self.config_fields_file)
+        except (OSError, ValueError) as e:
+            self.logger_service.error(f"Ошибка при загрузке конфигурации полей: {e}")
+            return False
+        if not isinstance(data, dict) or not data or not all(isinstance(field, dict) for field in data.values()):
+            self.logger_service.error(f"Файл конфигурации полей пуст или имеет неверный формат: {self.config_fields_file}")
+            return False
+        if not any(isinstance(field, dict) and field.get('type') == 'table' and field.get('values')
+                   for field in data.values()):
+            self.logger_service.error(f"В конфигурации полей нет колонок таблицы: {self.config_fields_file}")
+            return False
+        self.set_config_fields(data=data)
+        return True
 
     def save_config_fields(self) -> None:
         """
         Сохраняет конфигурацию в файл.
         """
         try:
-            with open(self.config_fields_file, 'w', encoding='utf-8') as file:
-                json.dump(self.config_fields_data, file, ensure_ascii=False, indent=4)
+            self._save_json(self.config_fields_file, self.config_fields_data)
         except Exception as e:
             self.logger_service.error(f"Ошибка при сохранении конфигурации: {e}")
 
@@ -126,16 +163,33 @@ class ConfigService:
         elif os.path.getsize(self.config_pages_file) == 0:
             self.set_config_pages(data={})
         else:
-            with open(self.config_pages_file, 'r', encoding='utf-8') as file:
-                self.set_config_pages(data=json.load(file))
+            self.set_config_pages(data=self.serializer_service.read(self.config_pages_file))
+
+    def reload_config_pages(self) -> bool:
+        """
+        Перечитывает конфигурацию страниц после изменения файла.
+        Если файл не удается разобрать или он пустой, остается прежняя конфигурация.
+
+        Returns:
+            bool: Конфигурация перечитана
+        """
+        try:
+            data = self.serializer_service.read(self.config_pages_file)
+        except (OSError, ValueError) as e:
+            self.logger_service.error(f"Ошибка при загрузке конфигурации страниц: {e}")
+            return False
+        if not data:
+            self.logger_service.error(f"Файл конфигурации страниц пуст: {self.config_pages_file}")
+            return False
+        self.set_config_pages(data=data)
+        return True
 
     def save_config_pages(self) -> None:
         """
         Сохраняет конфигурацию в файл.
         """
         try:
-            with open(self.config_pages_file, 'w', encoding='utf-8') as file:
-                json.dump(self.config_pages_data, file, ensure_ascii=False, indent=4)
+            self._save_json(self.config_pages_file, self.config_pages_data)
         except Exception as e:
             self.logger_service.error(f"Ошибка при сохранении конфигурации: {e}")
 
@@ -170,30 +224,28 @@ class ConfigService:
             self.logger_service.error(f"Файл конфигурации не найден: {sql_connect_file}")
             self.set_sql_connect(data={})
         else:
-            with open(sql_connect_file, 'r', encoding='utf-8') as file:
-                data_file = json.load(file)
-                if self.crypto_service is not None:
-                    for key, value in data_file.items():
-                        if value.get('password'):
-                            value['password'] = self.crypto_service.get_crypto_pass(value['password'])
-                        self.set_sql_connect(key=key, value=value)
-                else:
-                    self.set_sql_connect(data=data_file)
+            data_file = self.serializer_service.read(sql_connect_file)
+            if self.crypto_service is not None:
+                for key, value in data_file.items():
+                    if value.get('password'):
+                        value['password'] = self.crypto_service.get_crypto_pass(value['password'])
+                    self.set_sql_connect(key=key, value=value)
+            else:
+                self.set_sql_connect(data=data_file)
 
     def save_sql_connect(self) -> None:
         """
         Сохраняет конфигурацию в файл.
         """
         try:
-            data_file = self.sql_connect_data.copy()
+            # Пароли шифруются в копии, данные в памяти остаются расшифрованными
+            data_file = copy.deepcopy(self.sql_connect_data)
             if self.crypto_service is not None:
                 for key, value in data_file.items():
                     if value.get('password'):
                         data_file[key]['password'] = self.crypto_service.set_crypto_pass(value['password'])
 
-            with open(self.sql_connect_file, 'w', encoding='utf-8') as file:
-                json.dump(data_file, file, ensure_ascii=False, indent=4)
-            self.load_sql_connect()
+            self._save_json(self.sql_connect_file, data_file)
 
         except Exception as e:
             self.logger_service.error(f"Ошибка при сохранении конфигурации: {e}")
@@ -225,16 +277,14 @@ class ConfigService:
             self.logger_service.error(f"Файл конфигурации не найден: {self.sql_scripts_file}")
             self.set_sql_scripts(data={})
         else:
-            with open(self.sql_scripts_file, 'r', encoding='utf-8') as file:
-                self.set_sql_scripts(data=json.load(file))
+            self.set_sql_scripts(data=self.serializer_service.read(self.sql_scripts_file))
 
     def save_sql_scripts(self) -> None:
         """
         Сохраняет конфигурацию в файл.
         """
         try:
-            with open(self.sql_scripts_file, 'w', encoding='utf-8') as file:
-                json.dump(self.sql_scripts_data, file, ensure_ascii=False, indent=4)
+            self._save_json(self.sql_scripts_file, self.sql_scripts_data)
         except Exception as e:
             self.logger_service.error(f"Ошибка при сохранении конфигурации: {e}")
 
@@ -265,16 +315,14 @@ class ConfigService:
             self.logger_service.error(f"Файл конфигурации не найден: {self.config_output_file}")
             self.set_config_output(data={})
         else:
-            with open(self.config_output_file, 'r', encoding='utf-8') as file:
-                self.set_config_output(data=json.load(file))
+            self.set_config_output(data=self.serializer_service.read(self.config_output_file))
 
     def save_config_output(self) -> None:
         """
         Сохраняет конфигурацию в файл.
         """
         try:
-            with open(self.config_output_file, 'w', encoding='utf-8') as file:
-                json.dump(self.config_output_data, file, ensure_ascii=False, indent=4)
+            self._save_json(self.config_output_file, self.config_output_data)
         except Exception as e:
             self.logger_service.error(f"Ошибка при сохранении конфигурации: {e}")
 
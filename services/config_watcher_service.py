@@ -0,0 +1,105 @@
+import hashlib
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from PyQt5 import QtCore
+
+from services.logger_service import LoggerService
+
+
+class ConfigWatcherService(QtCore.QObject):
+    """Отслеживание изменений файлов конфигурации.
+
+    Файлы и их папки отслеживаются через QFileSystemWatcher (редакторы и PersistenceService
+    заменяют файл новым, поэтому путь к файлу после замены добавляется заново).
+    Уведомления за короткий промежуток объединяются, затем у файла сравниваются
+    время изменения и размер, а при их отличии - хэш содержимого: сигнал отправляется,
+    только если содержимое действительно изменилось.
+    """
+
+    # Сигнал изменения файла (имя файла в списке отслеживаемых)
+    file_changed = QtCore.pyqtSignal(str)
+
+    def __init__(self,
+                 files: Dict[str, Path],
+                 logger_service: LoggerService = None,
+                 interval: int = 150,
+                 parent: QtCore.QObject = None):
+        """
+        Инициализация отслеживания файлов.
+
+        Args:
+            files: Отслеживаемые файлы по именам
+            logger_service: Сервис логирования
+            interval: Интервал объединения уведомлений (мс)
+            parent: Родительский объект
+        """
+        super().__init__(parent)
+        self.files = {name: Path(path) for name, path in files.items()}
+        self.logger_service = logger_service
+
+        # Состояние файлов: имя -> ((время изменения, размер), хэш содержимого)
+        self._states: Dict[str, Tuple[Optional[tuple], Optional[str]]] = {
+            name: self._read_state(path) for name, path in self.files.items()
+        }
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.check)
+
+        self._watcher = QtCore.QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_path_changed)
+        self._watcher.directoryChanged.connect(self._on_path_changed)
+        self._watch()
+
+    def _watch(self) -> None:
+        """Добавляет в отслеживание файлы и папки, которых в нем нет (например, после замены файла)."""
+        watched = set(self._watcher.files()) | set(self._watcher.directories())
+        paths = set()
+        for path in self.files.values():
+            if path.exists():
+                paths.add(str(path))
+            if path.parent.exists():
+                paths.add(str(path.parent))
+        missing = sorted(paths - watched)
+        if missing:
+            self._watcher.addPaths(missing)
+
+    def _on_path_changed(self, path: str) -> None:
+        self._timer.start()
+
+    # =============== Проверка файлов ===============
+    @staticmethod
+    def _get_stat(path: Path) -> Optional[tuple]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @classmethod
+    def _read_state(cls, path: Path) -> Tuple[Optional[tuple], Optional[str]]:
+        stat = cls._get_stat(path)
+        if stat is None:
+            return None, None
+        try:
+            return stat, hashlib.sha1(path.read_bytes()).hexdigest()
+        except OSError:
+            return None, None
+
+    def check(self) -> None:
+        """Проверяет файлы и отправляет сигнал для каждого файла с измененным содержимым."""
+        self._watch()
+        for name, path in self.files.items():
+            stat, digest = self._states[name]
+            if self._get_stat(path) == stat:
+                continue
+            state = self._read_state(path)
+            self._states[name] = state
+            if state[1] == digest or state[1] is None:
+                # Изменилось только время изменения, или файл удален на время замены
+                continue
+            if self.logger_service is not None:
+                self.logger_service.info(f"Файл конфигурации изменен: {path}")
+            self.file_changed.emit(name)
@@ -0,0 +1,189 @@
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from services.fields_store_service import FieldsStoreService
+
+
+class FieldsIndexService:
+    """Поисковый индекс по текстовым колонкам таблицы полей.
+
+    Для каждой колонки хранит значения в нижнем регистре по идентификаторам строк
+    и отсортированный список (значение, идентификатор) для поиска по префиксу.
+    Поиск подстроки - перебор значений (O(n), около 4 мс на 20 тыс. строк):
+    индекс n-грамм строится на порядок дольше, чем выполняется перебор. Если новый
+    запрос содержит предыдущий (ввод следующих символов), перебираются только строки,
+    найденные предыдущим запросом, если их немного.
+    Правки ячеек применяются к индексу точечно, добавление и удаление строк
+    досинхронизируется перед следующим поиском.
+    """
+
+    def __init__(self, store: FieldsStoreService, keys: Sequence[str] = None):
+        """
+        Инициализация индекса.
+
+        Args:
+            store: Хранилище строк таблицы полей
+            keys: Ключи индексируемых колонок (по умолчанию все текстовые колонки)
+        """
+        self.store = store
+        if keys is None:
+            keys = [key for key, column in store.columns.items() if column['type'] == 'text']
+        self.keys = tuple(keys)
+
+        # Индекс строится при первом поиске, до этого структуры пустые
+        self._values: Dict[str, Dict[int, str]] = {key: {} for key in self.keys}
+        self._sorted: Dict[str, List[Tuple[str, int]]] = {key: [] for key in self.keys}
+        self._built = False
+        self._stale = True
+        # Предыдущий поиск подстроки: (текст, найденные строки), сбрасывается при изменении индекса
+        self._last_search: Optional[Tuple[str, Set[int]]] = None
+        # Номер добавления строк хранилища, по которому индекс синхронизирован
+        self._epoch = 0
+
+    # =============== Обновление ===============
+    def rebuild(self) -> None:
+        """Строит индекс заново по всем строкам хранилища."""
+        ids = self.store.ids()
+        for key in self.keys:
+            values = dict(zip(ids, (str(value).lower() for value in self.store.get_column(key).tolist())))
+            self._values[key] = values
+            self._sorted[key] = sorted(zip(values.values(), values.keys()))
+        self._epoch = self.store.epoch
+        self._built = True
+        self._stale = False
+        self._last_search = None
+
+    def invalidate(self) -> None:
+        """Помечает индекс устаревшим после добавления или удаления строк."""
+        self._stale = True
+
+    def update(self, row_ids: Iterable[int], keys: Iterable[str] = None) -> None:
+        """
+        Обновляет индекс для измененных ячеек.
+
+        Args:
+            row_ids: Идентификаторы измененных строк
+            keys: Ключи измененных колонок (по умолчанию все индексируемые)
+        """
+        # Пока индекс не построен, значения будут прочитаны при построении
+        if not self._built:
+            return
+        keys = [key for key in (keys or self.keys) if key in self._values]
+        for row_id in row_ids:
+            # Строки, которых еще нет в индексе, будут добавлены при синхронизации
+            if row_id not in self.store or row_id not in self._values[self.keys[0]]:
+                continue
+            for key in keys:
+                self._set(key, row_id, str(self.store.get_value(row_id, key)).lower())
+
+    def _set(self, key: str, row_id: int, value: Optional[str]) -> None:
+        """Заменяет значение строки в индексе колонки (None - удаляет строку из индекса)."""
+        values = self._values[key]
+        ordered = self._sorted[key]
+        old = values.get(row_id)
+        if old == value:
+            return
+        self._last_search = None
+        if old is not None:
+            del ordered[bisect_left(ordered, (old, row_id))]
+            del values[row_id]
+        if value is not None:
+            values[row_id] = value
+            insort(ordered, (value, row_id))
+
+    def sync(self) -> None:
+        """Досинхронизирует индекс с составом строк хранилища."""
+        if not self._stale:
+            return
+        if not self.keys:
+            self._stale = False
+            return
+
+        indexed = self._values[self.keys[0]].keys()
+        ids = set(self.store.ids())
+        # Добавленные строки определяются по номеру добавления: идентификатор
+        # удаленной строки может быть уже занят новой строкой
+        added = set(self.store.added_since(self._epoch).tolist())
+        removed = indexed - ids
+        # Точечные вставки в отсортированный список выгодны только для небольших изменений
+        if not self._built or len(added) + len(removed) > len(ids) // 8:
+            self.rebuild()
+            return
+        for key in self.keys:
+            for row_id in removed:
+                self._set(key, row_id, None)
+            for row_id in added:
+                self._set(key, row_id, str(self.store.get_value(row_id, key)).lower())
+        self._epoch = self.store.epoch
+        self._stale = False
+
+    # =============== Поиск ===============
+    def find(self, text: str, prefix: bool = False) -> List[int]:
+        """
+        Возвращает идентификаторы строк, у которых значение хотя бы одной колонки содержит текст.
+
+        Args:
+            text: Искомый текст (без учета регистра)
+            prefix: Искать только в начале значения
+
+        Returns:
+            List[int]: Идентификаторы найденных строк
+        """
+        self.sync()
+        text = text.lower()
+        if not prefix:
+            return list(self._find_substring(text))
+        found = set()
+        for key in self.keys:
+            ordered = self._sorted[key]
+            # Все значения с префиксом text лежат в списке подряд
+            start = bisect_left(ordered, (text, -1))
+            end = bisect_left(ordered, (text + "\uffff", -1))
+            found.update(row_id for _, row_id in ordered[start:end])
+        return list(found)
+
+    def _find_substring(self, text: str) -> Set[int]:
+        """Ищет подстроку перебором значений (или строк, найденных предыдущим запросом)."""
+        if not self.keys:
+            return set()
+        last = self._last_search
+        # Проверка найденной строки дороже сравнения в переборе, поэтому
+        # предыдущий результат используется, только если он намного меньше таблицы
+        if last is not None and last[0] in text and len(last[1]) <= len(self._values[self.keys[0]]) // 8:
+            # Строка с новым текстом содержит и предыдущий, поэтому она уже найдена
+            found = {row_id for row_id in last[1]
+                     if any(text in self._values[key][row_id] for key in self.keys)}
+        else:
+            found = set()
+            for key in self.keys:
+                found.update(row_id for row_id, value in self._values[key].items() if text in value)
+        self._last_search = (text, found)
+        return found
+
+    def filter(self, text: str = "", prefix: bool = False, selects: Dict[str, str] = None) -> Optional[np.ndarray]:
+        """
+        Возвращает номера строк в порядке отображения, подходящих под фильтр.
+
+        Args:
+            text: Текст для поиска по текстовым колонкам
+            prefix: Искать текст только в начале значения
+            selects: Значения колонок выбора по ключам (например, {"type": "Int64"})
+
+        Returns:
+            Optional[np.ndarray]: Номера подходящих строк или None, если фильтр пустой
+        """
+        selects = {key: value for key, value in (selects or {}).items() if value is not None}
+        if not text and not selects:
+            return None
+
+        mask = np.ones(len(self.store), dtype=bool)
+        for key, value in selects.items():
+            categories = self.store.get_categories(key)
+            if value not in categories:
+                return np.empty(0, dtype=np.int64)
+            mask &= self.store.get_codes(key) == categories.index(value)
+        if text:
+            mask &= np.isin(self.store.order, np.asarray(self.find(text, prefix=prefix), dtype=np.int64))
+        return np.flatnonzero(mask)
@@ -0,0 +1,476 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+
+class FieldsStoreService:
+    """Колоночное хранилище строк таблицы полей по стабильным идентификаторам.
+
+    Значения каждой колонки лежат в отдельном массиве numpy, идентификатор строки -
+    номер ее ячейки в массивах. Колонки выбора (select) хранятся категориальными
+    кодами, поэтому проверки, поиск дублей и пересчет типов выполняются
+    векторно над целыми колонками. Идентификатор строки не меняется при удалении
+    и перемещении других строк, порядок строк хранится отдельным массивом.
+
+    Поиск строки по идентификатору и позиции - O(1): кроме порядка строк хранится
+    карта идентификатор -> позиция, которая обновляется точечно. Удаление только
+    помечает позиции удаленных строк (O(k) для k строк); сдвиг оставшихся строк
+    выполняется одним проходом от первой удаленной позиции при следующем обращении
+    по позиции, поэтому несколько удалений подряд сдвигают строки один раз.
+    Позиции в таблице непрерывны, так что удаление строки в начале таблицы
+    все равно перенумеровывает все следующие строки. Перемещение сдвигает только
+    строки между старой и новой позицией. Идентификаторы удаленных строк
+    используются повторно, поэтому массивы не растут при циклах удаления и добавления;
+    номер добавления (epoch) позволяет отличить новую строку от удаленной с тем же
+    идентификатором.
+    """
+
+    # Пустое значение ячейки (как у новой строки таблицы)
+    EMPTY = ""
+    # Значение пустой булевой ячейки
+    BOOLEAN_EMPTY = -1
+    # Отметка удаленной строки в массиве порядка
+    REMOVED = -1
+
+    def __init__(self, columns: Sequence[dict] = (), capacity: int = 1024):
+        """
+        Инициализация хранилища.
+
+        Args:
+            columns: Настройки колонок (key, type, value), значения которых хранятся в строках
+            capacity: Начальное количество ячеек в массивах
+        """
+        self.columns = {column['key']: column for column in columns}
+        self.keys = tuple(self.columns)
+
+        self._initial_capacity = max(capacity, 1)
+        # Номер последнего добавления строк (не сбрасывается при очистке)
+        self._epoch = 0
+        self._categories: Dict[str, List[str]] = {}
+        self._category_codes: Dict[str, Dict[str, int]] = {}
+        self.clear()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, row_id: int) -> bool:
+        return 0 <= row_id < self._next_id and bool(self._alive[row_id])
+
+    # =============== Служебные методы ===============
+    def _create_column(self, column: dict, capacity: int) -> np.ndarray:
+        """Создает массив значений колонки."""
+        if column['type'] == 'select':
+            return np.zeros(capacity, dtype=np.int32)
+        if column['type'] == 'boolean':
+            return np.full(capacity, self.BOOLEAN_EMPTY, dtype=np.int8)
+        if column['type'] == 'number':
+            return np.zeros(capacity, dtype=np.int64)
+        return np.full(capacity, self.EMPTY, dtype=object)
+
+    def _reset_categories(self) -> None:
+        """Заполняет категории колонок выбора значениями из настроек колонок."""
+        for key, column in self.columns.items():
+            if column['type'] != 'select':
+                continue
+            categories = [self.EMPTY]
+            for value in column.get('value') or []:
+                if str(value) not in categories:
+                    categories.append(str(value))
+            self._categories[key] = categories
+            self._category_codes[key] = {value: code for code, value in enumerate(categories)}
+
+    def _grow(self, required: int) -> None:
+        """Увеличивает массивы так, чтобы в них поместилось required ячеек."""
+        capacity = len(self._alive)
+        if required <= capacity:
+            return
+        new_capacity = max(required, capacity * 2)
+        for key, column in self.columns.items():
+            array = self._create_column(column, new_capacity)
+            array[:capacity] = self._data[key]
+            self._data[key] = array
+            if key in self._number_set:
+                mask = np.zeros(new_capacity, dtype=bool)
+                mask[:capacity] = self._number_set[key]
+                self._number_set[key] = mask
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:capacity] = self._alive
+        self._alive = alive
+        positions = np.full(new_capacity, self.REMOVED, dtype=np.int64)
+        positions[:capacity] = self._positions
+        self._positions = positions
+        epochs = np.zeros(new_capacity, dtype=np.int64)
+        epochs[:capacity] = self._epochs
+        self._epochs = epochs
+
+    def _grow_order(self, required: int) -> None:
+        """Увеличивает массив порядка строк."""
+        if required <= len(self._order_buffer):
+            return
+        order = np.empty(max(required, len(self._order_buffer) * 2), dtype=np.int64)
+        order[:self._length] = self._order_buffer[:self._length]
+        self._order_buffer = order
+
+    def _compact(self) -> None:
+        """Убирает отметки удаленных строк из порядка и обновляет позиции сдвинутых строк."""
+        if self._first_removed is None:
+            return
+        first = self._first_removed
+        tail = self._order_buffer[first:self._length]
+        remaining = tail[tail != self.REMOVED]
+        end = first + len(remaining)
+        self._order_buffer[first:end] = remaining
+        self._positions[remaining] = np.arange(first, end)
+        self._length = end
+        self._first_removed = None
+
+    def _allocate_ids(self, count: int) -> np.ndarray:
+        """Возвращает идентификаторы для новых строк: сначала освобожденные, затем новые."""
+        reused = self._free[len(self._free) - min(count, len(self._free)):]
+        del self._free[len(self._free) - len(reused):]
+        new_count = count - len(reused)
+        self._grow(self._next_id + new_count)
+        ids = np.concatenate([np.asarray(reused, dtype=np.int64),
+                              np.arange(self._next_id, self._next_id + new_count, dtype=np.int64)])
+        self._next_id += new_count
+        return ids
+
+    def _encode(self, key: str, value: Any) -> Any:
+        """Преобразует значение ячейки в представление колонки."""
+        column_type = self.columns[key]['type']
+        if column_type == 'select':
+            value = self.EMPTY if value is None else str(value)
+            codes = self._category_codes[key]
+            code = codes.get(value)
+            if code is None:
+                code = len(self._categories[key])
+                self._categories[key].append(value)
+                codes[value] = code
+            return code
+        if column_type == 'boolean':
+            return self.BOOLEAN_EMPTY if value == self.EMPTY or value is None else int(bool(value))
+        if column_type == 'number':
+            return None if value == self.EMPTY or value is None else int(value)
+        return value
+
+    def _decode(self, key: str, row_id: int) -> Any:
+        """Возвращает значение ячейки в исходном виде."""
+        column_type = self.columns[key]['type']
+        value = self._data[key][row_id]
+        if column_type == 'select':
+            return self._categories[key][value]
+        if column_type == 'boolean':
+            return self.EMPTY if value == self.BOOLEAN_EMPTY else bool(value)
+        if column_type == 'number':
+            return int(value) if self._number_set[key][row_id] else self.EMPTY
+        return value
+
+    def _get_order(self) -> np.ndarray:
+        """Возвращает изменяемое представление порядка строк (без отметок удаленных строк)."""
+        self._compact()
+        return self._order_buffer[:self._count]
+
+    # =============== Чтение ===============
+    @property
+    def order(self) -> np.ndarray:
+        """Идентификаторы строк в порядке отображения (представление массива, только для чтения)."""
+        view = self._get_order()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def epoch(self) -> int:
+        """Номер последнего добавления строк."""
+        return self._epoch
+
+    def ids(self) -> List[int]:
+        """Возвращает идентификаторы строк в порядке отображения."""
+        return self._get_order().tolist()
+
+    def added_since(self, epoch: int) -> np.ndarray:
+        """
+        Возвращает идентификаторы строк, добавленных после указанного добавления
+        (в том числе строк, получивших идентификатор удаленной строки).
+
+        Args:
+            epoch: Номер добавления (значение epoch на момент предыдущей проверки)
+
+        Returns:
+            np.ndarray: Идентификаторы строк в порядке отображения
+        """
+        order = self._get_order()
+        return order[self._epochs[order] > epoch]
+
+    def id_at(self, position: int) -> int:
+        """
+        Возвращает идентификатор строки по ее позиции.
+
+        Args:
+            position: Позиция строки в таблице
+
+        Returns:
+            int: Идентификатор строки
+        """
+        if not 0 <= position < self._count:
+            raise IndexError(position)
+        self._compact()
+        return int(self._order_buffer[position])
+
+    def position(self, row_id: int) -> int:
+        """
+        Возвращает позицию строки по идентификатору.
+
+        Args:
+            row_id: Идентификатор строки
+
+        Returns:
+            int: Позиция строки в таблице
+
+        Raises:
+            KeyError: Если строки нет в хранилище
+        """
+        if row_id not in self:
+            raise KeyError(row_id)
+        self._compact()
+        return int(self._positions[row_id])
+
+    def get(self, row_id: int) -> Dict[str, Any]:
+        """
+        Возвращает значения строки.
+
+        Args:
+            row_id: Идентификатор строки
+
+        Returns:
+            Dict[str, Any]: Значения строки по ключам колонок
+        """
+        if row_id not in self:
+            raise KeyError(row_id)
+        return {key: self._decode(key, row_id) for key in self.keys}
+
+    def get_value(self, row_id: int, key: str) -> Any:
+        """Возвращает значение ячейки."""
+        return self._decode(key, row_id)
+
+    def get_codes(self, key: str) -> np.ndarray:
+        """
+        Возвращает категориальные коды колонки выбора в порядке строк.
+
+        Args:
+            key: Ключ колонки выбора
+
+        Returns:
+            np.ndarray: Коды значений, расшифровываются через get_categories
+        """
+        return self._data[key][self._get_order()]
+
+    def get_categories(self, key: str) -> List[str]:
+        """Возвращает значения колонки выбора по кодам (код 0 - пустое значение)."""
+        return list(self._categories[key])
+
+    def get_column(self, key: str) -> np.ndarray:
+        """
+        Возвращает значения колонки в порядке строк.
+        Пустые булевы и числовые ячейки возвращаются как "" (массив типа object).
+
+        Args:
+            key: Ключ колонки
+
+        Returns:
+            np.ndarray: Значения колонки
+        """
+        order = self._get_order()
+        column_type = self.columns[key]['type']
+        if column_type == 'select':
+            return np.asarray(self._categories[key], dtype=object)[self._data[key][order]]
+        if column_type == 'boolean':
+            raw = self._data[key][order]
+            values = raw.astype(bool).astype(object)
+            values[raw == self.BOOLEAN_EMPTY] = self.EMPTY
+            return values
+        if column_type == 'number':
+            values = self._data[key][order].astype(object)
+            values[~self._number_set[key][order]] = self.EMPTY
+            return values
+        return self._data[key][order]
+
+    def records(self) -> List[Dict[str, Any]]:
+        """
+        Возвращает строки в порядке отображения.
+        Словари создаются при каждом вызове: хранилище их не держит.
+
+        Returns:
+            List[Dict[str, Any]]: Значения строк по ключам колонок
+        """
+        columns = [self.get_column(key).tolist() for key in self.keys]
+        return [dict(zip(self.keys, values)) for values in zip(*columns)] if columns else [{} for _ in range(self._count)]
+
+    def memory_usage(self) -> int:
+        """Возвращает размер массивов хранилища в байтах (без самих строковых объектов)."""
+        size = self._alive.nbytes + self._order_buffer.nbytes + self._positions.nbytes + self._epochs.nbytes
+        size += sum(array.nbytes for array in self._data.values())
+        size += sum(mask.nbytes for mask in self._number_set.values())
+        return size
+
+    # =============== Изменение ===============
+    def set_value(self, row_id: int, key: str, value: Any) -> None:
+        """Устанавливает значение ячейки."""
+        encoded = self._encode(key, value)
+        if self.columns[key]['type'] == 'number':
+            self._number_set[key][row_id] = encoded is not None
+            encoded = 0 if encoded is None else encoded
+        self._data[key][row_id] = encoded
+
+    def set_column(self, key: str, values: Sequence[Any], row_ids: Sequence[int] = None) -> None:
+        """
+        Устанавливает значения колонки для нескольких строк одной операцией.
+
+        Args:
+            key: Ключ колонки
+            values: Значения в порядке row_ids
+            row_ids: Идентификаторы строк (по умолчанию все строки в порядке отображения)
+        """
+        if row_ids is None:
+            row_ids = self._get_order()
+        row_ids = np.asarray(row_ids, dtype=np.int64)
+        column_type = self.columns[key]['type']
+        if column_type == 'select':
+            codes = self._category_codes[key]
+            encoded = [codes.get(value) for value in values]
+            if None in encoded:
+                # Новые значения добавляются в категории колонки
+                encoded = [self._encode(key, value) for value in values]
+            self._data[key][row_ids] = np.asarray(encoded, dtype=np.int32)
+        elif column_type == 'boolean':
+            self._data[key][row_ids] = np.fromiter(
+                (self.BOOLEAN_EMPTY if value == self.EMPTY or value is None else bool(value) for value in values),
+                dtype=np.int8, count=len(row_ids))
+        elif column_type == 'number':
+            encoded = [self._encode(key, value) for value in values]
+            self._number_set[key][row_ids] = [value is not None for value in encoded]
+            self._data[key][row_ids] = [0 if value is None else value for value in encoded]
+        else:
+            array = np.empty(len(row_ids), dtype=object)
+            array[:] = list(values)
+            self._data[key][row_ids] = array
+
+    def append(self, rows: Iterable[Dict[str, Any]]) -> List[int]:
+        """
+        Добавляет строки в конец таблицы.
+
+        Args:
+            rows: Значения строк по ключам колонок
+
+        Returns:
+            List[int]: Идентификаторы добавленных строк
+        """
+        rows = list(rows)
+        if not rows:
+            return []
+
+        ids = self._allocate_ids(len(rows))
+        self._alive[ids] = True
+        self._epoch += 1
+        self._epochs[ids] = self._epoch
+
+        for key in self.keys:
+            self.set_column(key, [row.get(key, self.EMPTY) for row in rows], ids)
+
+        # Строки добавляются после отметок удаленных строк, сдвиг не нужен,
+        # пока отметок не больше, чем строк
+        if self._length - self._count > self._count:
+            self._compact()
+        self._grow_order(self._length + len(rows))
+        self._order_buffer[self._length:self._length + len(rows)] = ids
+        self._positions[ids] = np.arange(self._length, self._length + len(rows))
+        self._length += len(rows)
+        self._count += len(rows)
+        return ids.tolist()
+
+    def remove(self, row_ids: Iterable[int]) -> None:
+        """
+        Удаляет строки. Позиции удаленных строк только помечаются, оставшиеся строки
+        сдвигаются при следующем обращении по позиции.
+
+        Args:
+            row_ids: Идентификаторы удаляемых строк
+        """
+        row_ids = np.unique(np.asarray([row_id for row_id in row_ids if row_id in self], dtype=np.int64))
+        if not len(row_ids):
+            return
+
+        self._alive[row_ids] = False
+        for key, column in self.columns.items():
+            if column['type'] == 'text':
+                # Освобождаем строки удаленных ячеек
+                self._data[key][row_ids] = self.EMPTY
+
+        slots = self._positions[row_ids]
+        self._order_buffer[slots] = self.REMOVED
+        self._positions[row_ids] = self.REMOVED
+        first = int(slots.min())
+        self._first_removed = first if self._first_removed is None else min(self._first_removed, first)
+        self._count -= len(row_ids)
+        self._free.extend(row_ids.tolist())
+
+    def move(self, row_id: int, position: int) -> None:
+        """
+        Перемещает строку на указанную позицию. Сдвигаются только строки между старой и новой позицией.
+
+        Args:
+            row_id: Идентификатор строки
+            position: Новая позиция строки
+        """
+        source = self.position(row_id)
+        if not 0 <= position < self._count:
+            raise IndexError(position)
+        order = self._order_buffer
+        if source < position:
+            order[source:position] = order[source + 1:position + 1]
+            first, last = source, position
+        elif source > position:
+            order[position + 1:source + 1] = order[position:source].copy()
+            first, last = position, source
+        else:
+            return
+        order[position] = row_id
+        self._positions[order[first:last + 1]] = np.arange(first, last + 1)
+
+    def set_order(self, row_ids: Sequence[int]) -> None:
+        """
+        Устанавливает новый порядок строк.
+
+        Args:
+            row_ids: Идентификаторы всех строк в новом порядке
+        """
+        row_ids = np.asarray(row_ids, dtype=np.int64)
+        order = self._get_order()
+        if len(row_ids) != self._count or not np.array_equal(np.sort(row_ids), np.sort(order)):
+            raise ValueError("Новый порядок должен содержать все строки таблицы")
+        order[:] = row_ids
+        self._positions[row_ids] = np.arange(self._count)
+
+    def clear(self) -> None:
+        """Удаляет все строки."""
+        capacity = self._initial_capacity
+        self._data: Dict[str, np.ndarray] = {
+            key: self._create_column(column, capacity) for key, column in self.columns.items()
+        }
+        # Признак заполненной числовой ячейки (пустая ячейка хранится как "")
+        self._number_set: Dict[str, np.ndarray] = {
+            key: np.zeros(capacity, dtype=bool) for key, column in self.columns.items() if column['type'] == 'number'
+        }
+        self._alive = np.zeros(capacity, dtype=bool)
+        # Позиция строки в массиве порядка по идентификатору (REMOVED - строки нет)
+        self._positions = np.full(capacity, self.REMOVED, dtype=np.int64)
+        # Номер добавления строки по идентификатору
+        self._epochs = np.zeros(capacity, dtype=np.int64)
+        self._order_buffer = np.empty(capacity, dtype=np.int64)
+        # Занятая часть массива порядка (включая отметки удаленных строк) и количество строк
+        self._length = 0
+        self._count = 0
+        # Первая отмеченная удаленной позиция (None - отметок нет)
+        self._first_removed: Optional[int] = None
+        self._free: List[int] = []
+        self._next_id = 0
+        self._reset_categories()
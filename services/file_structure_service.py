@@ -1,28 +1,31 @@
-import json
 from pathlib import Path
 from typing import Dict, Any, Optional
 import shutil
 from services.logger_service import LoggerService
+from services.serializer_service import SerializerService
 
 class FileStructureService:
     """Сервис для управления файловой структурой приложения."""
 
-    def __init__(self, working_dir: Path, logger_service: LoggerService):
+    def __init__(self, working_dir: Path, logger_service: LoggerService, serializer_service: SerializerService = None):
         """
         Инициализация сервиса файловой структуры.
 
         Args:
             working_dir: Рабочая директория приложения
             logger_service: Сервис логирования
+            serializer_service: Сервис сериализации JSON
         """
         self.working_dir = working_dir
         self.logger_service = logger_service
+        self.serializer_service = serializer_service or SerializerService(logger_service=logger_service)
 
         # Определение структуры директорий
         self.config_dir = working_dir / "config"
         self.template_dir = working_dir / "template"
         self.save_config_dir = working_dir / "save_config"
         self.logs_dir = working_dir / "logs"
+        self.cache_dir = working_dir / "cache"
 
         self.file_name_config_save = "config_save.json"
 
@@ -34,6 +37,8 @@ class FileStructureService:
         self.sql_scripts_path = self.config_dir / "sql_scripts.json"
 
         self.template_fields_path = self.template_dir / "config_fields.json"
+        self.query_cache_path = self.cache_dir / "query_cache.json"
+        self.config_index_path = self.cache_dir / "config_index.sqlite3"
 
         self.init_config()
 
@@ -58,7 +63,8 @@ class FileStructureService:
             (self.config_dir, "конфигурации"),
             (self.template_dir, "шаблонов"),
             (self.save_config_dir, "сохранения конфигурации"),
-            (self.logs_dir, "логов")
+            (self.logs_dir, "логов"),
+            (self.cache_dir, "кэша")
         ]
 
         for directory, description in directories:
@@ -127,26 +133,26 @@ class FileStructureService:
             if not file_path.exists():
                 return {}
 
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return self.serializer_service.read(file_path)
         except Exception as e:
             self.logger_service.error(f"Ошибка при загрузке файла {file_path}: {e}")
             return {}
 
-    def save_json(self, file_path: Path, data: Dict[str, Any]) -> bool:
+    def save_json(self, file_path: Path, data: Dict[str, Any], pretty: bool = True) -> bool:
         """
         Сохраняет данные в JSON файл.
 
         Args:
             file_path: Путь к файлу
             data: Данные для сохранения
+            pretty: Сохранить в читаемом виде с отступами (по умолчанию), иначе компактно
 
         Returns:
             bool: Успешность операции
         """
         try:
             with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+                f.write(self.serializer_service.dumps(data, pretty=pretty))
             return True
         except Exception as e:
             self.logger_service.error(f"Ошибка при сохранении файла {file_path}: {e}")
@@ -223,6 +229,12 @@ class FileStructureService:
         """
         return self.save_config_dir
 
+    def get_cache_path(self) -> Path:
+        """
+        Возвращает путь к директории кэша.
+        """
+        return self.cache_dir
+
     # =============== Получение путей файлов ===============
     def get_config_fields_file(self) -> Path:
         """
@@ -254,6 +266,18 @@ class FileStructureService:
         """
         return self.sql_scripts_path
 
+    def get_query_cache_file(self) -> Path:
+        """
+        Возвращает путь к файлу кэша результатов SQL запросов.
+        """
+        return self.query_cache_path
+
+    def get_config_index_file(self) -> Path:
+        """
+        Возвращает путь к базе каталога сохраненных конфигураций.
+        """
+        return self.config_index_path
+
     # =============== Получение имени файла конфигурации ===============
     def get_file_name_config_save(self) -> str:
         """
@@ -0,0 +1,279 @@
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.fields_store_service import FieldsStoreService
+
+
+class PersistentVector:
+    """Неизменяемый список на основе дерева с 32 потомками в узле.
+
+    Изменение элемента или добавление в конец копирует только путь от корня
+    до листа (log32(n) узлов), остальные узлы новая версия делит с предыдущей.
+    """
+
+    BITS = 5
+    WIDTH = 1 << BITS
+    MASK = WIDTH - 1
+
+    __slots__ = ("_count", "_shift", "_root")
+
+    def __init__(self, count: int = 0, shift: int = 0, root: tuple = ()):
+        self._count = count
+        self._shift = shift
+        self._root = root
+
+    @classmethod
+    def from_iterable(cls, values: Iterable[Any]) -> "PersistentVector":
+        """Строит список из последовательности значений (узлы заполняются целиком)."""
+        nodes = tuple(values)
+        count = len(nodes)
+        if count <= cls.WIDTH:
+            return cls(count, 0, nodes)
+        shift = 0
+        nodes = tuple(nodes[i:i + cls.WIDTH] for i in range(0, count, cls.WIDTH))
+        while len(nodes) > cls.WIDTH:
+            nodes = tuple(nodes[i:i + cls.WIDTH] for i in range(0, len(nodes), cls.WIDTH))
+            shift += cls.BITS
+        return cls(count, shift + cls.BITS, nodes)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Any]:
+        return self._iter_node(self._root, self._shift)
+
+    def _iter_node(self, node: tuple, level: int) -> Iterator[Any]:
+        if level == 0:
+            yield from node
+            return
+        for child in node:
+            yield from self._iter_node(child, level - self.BITS)
+
+    def __getitem__(self, index: int) -> Any:
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        node = self._root
+        for level in range(self._shift, 0, -self.BITS):
+            node = node[(index >> level) & self.MASK]
+        return node[index & self.MASK]
+
+    def set(self, index: int, value: Any) -> "PersistentVector":
+        """Возвращает новую версию списка с замененным элементом."""
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return PersistentVector(self._count, self._shift, self._assoc(self._root, self._shift, index, value))
+
+    def _assoc(self, node: tuple, level: int, index: int, value: Any) -> tuple:
+        position = (index >> level) & self.MASK
+        child = value if level == 0 else self._assoc(node[position], level - self.BITS, index, value)
+        return node[:position] + (child,) + node[position + 1:]
+
+    def append(self, value: Any) -> "PersistentVector":
+        """Возвращает новую версию списка с элементом, добавленным в конец."""
+        if self._count == 1 << (self._shift + self.BITS):
+            # Дерево заполнено - над корнем добавляется новый уровень
+            root = (self._root, self._new_path(self._shift, value))
+            return PersistentVector(self._count + 1, self._shift + self.BITS, root)
+        return PersistentVector(self._count + 1, self._shift, self._push(self._root, self._shift, value))
+
+    def _push(self, node: tuple, level: int, value: Any) -> tuple:
+        if level == 0:
+            return node + (value,)
+        position = (self._count >> level) & self.MASK
+        if position < len(node):
+            return node[:position] + (self._push(node[position], level - self.BITS, value),)
+        return node + (self._new_path(level - self.BITS, value),)
+
+    def _new_path(self, level: int, value: Any) -> tuple:
+        node = (value,)
+        for _ in range(0, level, self.BITS):
+            node = (node,)
+        return node
+
+    def extend(self, values: Iterable[Any]) -> "PersistentVector":
+        """Возвращает новую версию списка со значениями, добавленными в конец."""
+        values = list(values)
+        if len(values) > self._count:
+            # Добавляется больше, чем было: дешевле построить список заново
+            return PersistentVector.from_iterable(list(self) + values)
+        vector = self
+        for value in values:
+            vector = vector.append(value)
+        return vector
+
+
+class HistorySnapshot:
+    """Состояние конфигурации для истории изменений.
+
+    Attributes:
+        values: Значения полей конфигурации по ключам (без таблицы полей)
+        rows: Строки таблицы полей (кортежи значений в порядке ключей колонок)
+        group: Группа изменений, шаги одной группы объединяются в один
+    """
+
+    __slots__ = ("values", "rows", "group")
+
+    def __init__(self, values: Dict[str, Any], rows: PersistentVector, group: str = None):
+        self.values = values
+        self.rows = rows
+        self.group = group
+
+
+class HistoryService:
+    """История изменений конфигурации (отмена и повтор).
+
+    Каждый шаг хранит полный снимок конфигурации, но снимки делят неизменившиеся
+    части: словарь значений полей копируется поверхностно, а строки таблицы
+    хранятся в PersistentVector, поэтому правка ячейки добавляет в историю
+    только измененную строку и путь к ней в дереве.
+    """
+
+    def __init__(self, keys: Sequence[str] = (), max_steps: int = 200):
+        """
+        Инициализация истории.
+
+        Args:
+            keys: Ключи колонок таблицы полей (порядок значений в строках снимка)
+            max_steps: Максимальное количество шагов отмены
+        """
+        self.keys = tuple(keys)
+        self.max_steps = max_steps
+
+        self._undo: deque = deque(maxlen=max_steps + 1)
+        self._redo: list = []
+        # Идентификаторы строк хранилища в порядке строк текущего снимка
+        self._ids = np.empty(0, dtype=np.int64)
+        self.reset()
+
+    # =============== Состояние ===============
+    @property
+    def current(self) -> HistorySnapshot:
+        """Текущий снимок конфигурации."""
+        return self._undo[-1]
+
+    @property
+    def can_undo(self) -> bool:
+        return len(self._undo) > 1
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def reset(self, values: Dict[str, Any] = None, store: FieldsStoreService = None, keys: Sequence[str] = None) -> None:
+        """
+        Очищает историю и задает исходное состояние.
+
+        Args:
+            values: Значения полей конфигурации
+            store: Хранилище строк таблицы полей
+            keys: Ключи колонок таблицы полей (по умолчанию прежние)
+        """
+        if keys is not None:
+            self.keys = tuple(keys)
+        rows = PersistentVector()
+        if store is not None:
+            rows = PersistentVector.from_iterable(self._read_rows(store))
+        self._undo.clear()
+        self._redo.clear()
+        self._undo.append(HistorySnapshot(dict(values or {}), rows))
+        self.track(store)
+
+    def track(self, store: Optional[FieldsStoreService]) -> None:
+        """Запоминает порядок строк хранилища, соответствующий текущему снимку (после восстановления снимка)."""
+        self._ids = store.order.copy() if store is not None else np.empty(0, dtype=np.int64)
+
+    # =============== Запись изменений ===============
+    def record_value(self, key: str, value: Any, group: str = None, amend: bool = False) -> None:
+        """
+        Записывает изменение значения поля конфигурации.
+
+        Args:
+            key: Ключ поля
+            value: Новое значение
+            group: Группа изменений (например, ввод текста в одно поле)
+            amend: Изменить текущий снимок, не добавляя шаг (значения по умолчанию)
+        """
+        current = self.current
+        if key in current.values and current.values[key] == value:
+            return
+        values = dict(current.values)
+        values[key] = value
+        if amend:
+            self._undo[-1] = HistorySnapshot(values, current.rows, current.group)
+            return
+        self._push(HistorySnapshot(values, current.rows, group))
+
+    def record_rows(self, store: FieldsStoreService, changes: dict, group: str = None) -> None:
+        """
+        Записывает изменение таблицы полей.
+
+        Args:
+            store: Хранилище строк таблицы полей
+            changes: Уведомление модели таблицы ({"rows", "keys", "structure"})
+            group: Группа изменений (например, загрузка строк частями)
+        """
+        rows = self.current.rows
+        positions = changes.get("rows", ())
+        if not changes.get("structure") and len(positions) <= len(rows) // 8:
+            for position in positions:
+                rows = rows.set(position, self._read_row(store, store.id_at(position)))
+        else:
+            order = store.order
+            count = len(self._ids)
+            if len(order) == 0:
+                rows = PersistentVector()
+            elif changes.get("structure") and len(order) >= count and np.array_equal(order[:count], self._ids):
+                # Строки добавлены в конец: прежние строки остаются общими с предыдущим снимком
+                rows = rows.extend(self._read_row(store, row_id) for row_id in order[count:].tolist())
+            else:
+                # Удаление, перемещение или правка большей части строк: дерево строится заново
+                # по колонкам хранилища, совпадающие строки переиспользуются
+                previous = dict(zip(self._ids.tolist(), rows))
+                rebuilt = []
+                for row_id, row in zip(order.tolist(), self._read_rows(store)):
+                    old = previous.get(row_id)
+                    rebuilt.append(old if old == row else row)
+                rows = PersistentVector.from_iterable(rebuilt)
+            self._ids = order.copy()
+        self._push(HistorySnapshot(self.current.values, rows, group))
+
+    def _push(self, snapshot: HistorySnapshot) -> None:
+        """Добавляет шаг в историю. Шаг той же группы, что и последний, заменяет его."""
+        if snapshot.group is not None and self.can_undo and self.current.group == snapshot.group:
+            self._undo[-1] = snapshot
+        else:
+            self._undo.append(snapshot)
+        self._redo.clear()
+
+    def _read_row(self, store: FieldsStoreService, row_id: int) -> Tuple[Any, ...]:
+        return tuple(store.get_value(row_id, key) for key in self.keys)
+
+    def _read_rows(self, store: FieldsStoreService) -> Iterable[Tuple[Any, ...]]:
+        columns = [store.get_column(key).tolist() for key in self.keys]
+        return zip(*columns) if columns else (() for _ in range(len(store)))
+
+    # =============== Отмена и повтор ===============
+    def undo(self) -> Optional[HistorySnapshot]:
+        """Отменяет последний шаг. Возвращает снимок, который нужно восстановить."""
+        if not self.can_undo:
+            return None
+        self._redo.append(self._undo.pop())
+        return self._close(self.current)
+
+    def redo(self) -> Optional[HistorySnapshot]:
+        """Повторяет отмененный шаг. Возвращает снимок, который нужно восстановить."""
+        if not self._redo:
+            return None
+        self._undo.append(self._redo.pop())
+        return self._close(self.current)
+
+    def _close(self, snapshot: HistorySnapshot) -> HistorySnapshot:
+        """Закрывает группу восстановленного шага, чтобы следующее изменение стало новым шагом."""
+        snapshot.group = None
+        return snapshot
+
+    def get_rows(self, snapshot: HistorySnapshot) -> list:
+        """Возвращает строки снимка словарями по ключам колонок."""
+        return [dict(zip(self.keys, row)) for row in snapshot.rows]
@@ -0,0 +1,201 @@
+import os
+import stat
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from services.logger_service import LoggerService
+from services.serializer_service import SerializerService
+
+
+class PersistenceService:
+    """Отложенная запись JSON файлов в фоновом потоке.
+
+    Повторные сохранения одного файла за время задержки объединяются: записывается
+    только последнее состояние. Данные сериализуются в фоновом потоке и пишутся
+    во временный файл рядом с целевым, который после fsync атомарно заменяет целевой,
+    поэтому при сбое во время записи на диске остается прежняя версия файла.
+    """
+
+    def __init__(self,
+                 logger_service: LoggerService = None,
+                 serializer_service: SerializerService = None,
+                 delay: float = 0.3,
+                 on_saved: Callable[[Path], None] = None,
+                 on_error: Callable[[Path, str], None] = None):
+        """
+        Инициализация сервиса записи.
+
+        Args:
+            logger_service: Сервис логирования
+            serializer_service: Сервис сериализации JSON
+            delay: Задержка перед записью, за которую объединяются повторные сохранения (сек.)
+            on_saved: Вызывается из фонового потока после записи файла
+            on_error: Вызывается из фонового потока при ошибке записи (путь, текст ошибки)
+        """
+        self.logger_service = logger_service
+        self.serializer_service = serializer_service or SerializerService(logger_service=logger_service)
+        self.delay = delay
+        self.on_saved = on_saved
+        self.on_error = on_error
+
+        # Ожидающие записи: путь -> (данные, читаемый вид, время записи)
+        self._pending: Dict[Path, tuple] = {}
+        self._writing = 0
+        self._flush_requested = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="PersistenceService", daemon=True)
+        self._thread.start()
+
+    # =============== Запись ===============
+    def schedule(self, path: Path, data: Any, pretty: bool = False) -> None:
+        """
+        Ставит файл в очередь записи. Если файл уже ожидает записи, данные заменяются.
+
+        Данные копируются поверхностно: после вызова можно заменять значения верхнего уровня,
+        но не изменять вложенные объекты на месте.
+
+        Args:
+            path: Путь к файлу
+            data: Данные для сохранения в JSON
+            pretty: Записать JSON в читаемом виде с отступами (иначе компактно)
+        """
+        path = Path(path)
+        if isinstance(data, dict):
+            data = dict(data)
+        elif isinstance(data, list):
+            data = list(data)
+        with self._condition:
+            if self._closed:
+                # После остановки потока файл записывается сразу
+                self._write(path, data, pretty)
+                return
+            due = self._pending[path][2] if path in self._pending else time.monotonic() + self.delay
+            self._pending[path] = (data, pretty, due)
+            self._condition.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Записывает все ожидающие файлы, не дожидаясь задержки, и ждет окончания записи.
+
+        Args:
+            timeout: Максимальное время ожидания (сек.)
+
+        Returns:
+            bool: Все файлы записаны
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            while self._pending or self._writing:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            self._flush_requested = False
+        return True
+
+    def close(self) -> None:
+        """Записывает ожидающие файлы и останавливает фоновый поток (при завершении приложения)."""
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def is_pending(self, path: Path) -> bool:
+        """Признак файла, ожидающего записи."""
+        with self._condition:
+            return Path(path) in self._pending
+
+    # =============== Фоновый поток ===============
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if self._pending:
+                        wait = min(entry[2] for entry in self._pending.values()) - time.monotonic()
+                        if self._flush_requested or wait <= 0:
+                            break
+                        self._condition.wait(wait)
+                    else:
+                        self._condition.wait()
+                if self._closed and not self._pending:
+                    return
+                now = time.monotonic()
+                ready = {path: entry for path, entry in self._pending.items()
+                         if self._flush_requested or self._closed or entry[2] <= now}
+                for path in ready:
+                    del self._pending[path]
+                self._writing += len(ready)
+
+            for path, (data, pretty, _) in ready.items():
+                self._write(path, data, pretty)
+                with self._condition:
+                    self._writing -= 1
+                    self._condition.notify_all()
+
+    def _write(self, path: Path, data: Any, pretty: bool) -> None:
+        try:
+            self.write_json(path, data, pretty=pretty)
+        except Exception as e:
+            if self.logger_service is not None:
+                self.logger_service.error(f"Ошибка при сохранении файла {path}: {e}")
+            if self.on_error is not None:
+                self.on_error(path, str(e))
+            return
+        if self.on_saved is not None:
+            self.on_saved(path)
+
+    # =============== Атомарная запись ===============
+    def write_json(self, path: Path, data: Any, pretty: bool = False) -> None:
+        """
+        Сериализует данные и атомарно записывает файл.
+
+        Args:
+            path: Путь к файлу
+            data: Данные для сохранения в JSON
+            pretty: Записать JSON в читаемом виде с отступами (иначе компактно)
+        """
+        self.write_text(path, self.serializer_service.dumps(data, pretty=pretty))
+
+    @staticmethod
+    def write_text(path: Path, text: str) -> None:
+        """
+        Записывает текст во временный файл в той же папке и заменяет им целевой файл.
+
+        Args:
+            path: Путь к файлу
+            text: Содержимое файла
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                # mkstemp создает файл, доступный только владельцу: права берутся у заменяемого файла
+                os.chmod(temp_name, stat.S_IMODE(os.stat(path).st_mode) if path.exists() else 0o644)
+                file.write(text)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_name, path)
+        except BaseException:
+            try:
+                os.unlink(temp_name)
+            except OSError:
+                pass
+            raise
+        # Переименование сохраняется на диске после синхронизации папки (на Windows не поддерживается)
+        if hasattr(os, "O_DIRECTORY"):
+            try:
+                directory = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+                try:
+                    os.fsync(directory)
+                finally:
+                    os.close(directory)
+            except OSError:
+                pass
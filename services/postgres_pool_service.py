@@ -0,0 +1,288 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, List, Set
+
+import psycopg2
+import psycopg2.extensions
+from psycopg2.pool import PoolError
+
+
+class PooledConnection:
+    """Соединение пула вместе со служебной информацией."""
+
+    def __init__(self, connection: psycopg2.extensions.connection):
+        """
+        Инициализация соединения пула.
+
+        Args:
+            connection: Соединение psycopg2
+        """
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.owner: Optional[int] = None
+        self.depth = 0
+        # Имена подготовленных на сервере запросов (PREPARE) этого соединения
+        self.prepared: Set[str] = set()
+
+
+class PostgresPoolService:
+    """Потокобезопасный пул соединений с PostgreSQL."""
+
+    def __init__(self,
+                 config: Dict[str, Any],
+                 logger: logging.Logger,
+                 min_size: int = 1,
+                 max_size: int = 5,
+                 idle_timeout: float = 300.0,
+                 checkout_timeout: float = 30.0,
+                 health_check_interval: float = 30.0):
+        """
+        Инициализация пула соединений.
+
+        Args:
+            config: Конфигурация подключения к БД
+            logger: Логгер для записи событий
+            min_size: Минимальное количество соединений в пуле
+            max_size: Максимальное количество соединений в пуле
+            idle_timeout: Время простоя (сек.), после которого лишнее соединение закрывается
+            checkout_timeout: Время ожидания (сек.) свободного соединения
+            health_check_interval: Время простоя (сек.), после которого соединение проверяется перед выдачей
+        """
+        self.config = config
+        self.logger = logger
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size, 1)
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+
+        self._condition = threading.Condition(threading.Lock())
+        self._idle: List[PooledConnection] = []
+        self._in_use: Dict[int, PooledConnection] = {}
+        self._size = 0
+        self._closed = True
+
+    @property
+    def closed(self) -> bool:
+        """Возвращает признак закрытого пула."""
+        return self._closed
+
+    @property
+    def size(self) -> int:
+        """Возвращает текущее количество соединений пула."""
+        return self._size
+
+    # =============== Открытие и закрытие ===============
+    def open(self) -> None:
+        """
+        Открывает пул и создает минимальное количество соединений.
+
+        Raises:
+            psycopg2.Error: Если не удалось установить соединение
+        """
+        with self._condition:
+            self._closed = False
+
+        connections = []
+        try:
+            for _ in range(max(self.min_size, 1)):
+                connections.append(self._create_connection())
+        except Exception:
+            for pooled in connections:
+                self._close_connection(pooled)
+            with self._condition:
+                self._closed = True
+            raise
+
+        with self._condition:
+            self._size += len(connections)
+            self._idle.extend(connections)
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """
+        Закрывает пул. Свободные соединения закрываются сразу,
+        занятые - при возврате в пул.
+        """
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._condition.notify_all()
+
+        for pooled in idle:
+            self._close_connection(pooled)
+
+    # =============== Выдача соединений ===============
+    def acquire(self) -> PooledConnection:
+        """
+        Выдает соединение текущему потоку.
+        Повторный вызов из того же потока возвращает уже выданное соединение.
+
+        Returns:
+            PooledConnection: Соединение пула
+
+        Raises:
+            PoolError: Если пул закрыт или свободное соединение не появилось за checkout_timeout
+        """
+        ident = threading.get_ident()
+        deadline = time.monotonic() + self.checkout_timeout
+
+        while True:
+            create_new = False
+            pooled = None
+            evicted = []
+
+            with self._condition:
+                if self._closed:
+                    raise PoolError("Пул соединений закрыт")
+
+                held = self._in_use.get(ident)
+                if held is not None:
+                    held.depth += 1
+                    return held
+
+                evicted = self._take_expired_locked()
+
+                if self._idle:
+                    pooled = self._idle.pop()
+                elif self._size < self.max_size:
+                    self._size += 1
+                    create_new = True
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolError("Нет свободных соединений в пуле")
+                    self._condition.wait(remaining)
+                    continue
+
+            for expired in evicted:
+                self._close_connection(expired)
+
+            if create_new:
+                try:
+                    pooled = self._create_connection()
+                except Exception:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+            elif not self._is_healthy(pooled):
+                self._discard(pooled)
+                continue
+
+            with self._condition:
+                pooled.owner = ident
+                pooled.depth = 1
+                self._in_use[ident] = pooled
+            return pooled
+
+    def release(self, pooled: PooledConnection, discard: bool = False) -> None:
+        """
+        Возвращает соединение в пул.
+
+        Args:
+            pooled: Соединение пула
+            discard: Закрыть соединение вместо возврата в пул
+        """
+        with self._condition:
+            pooled.depth -= 1
+            if pooled.depth > 0 and not discard:
+                return
+            self._in_use.pop(pooled.owner, None)
+            pooled.owner = None
+            pooled.depth = 0
+
+        connection = pooled.connection
+        if not discard and not connection.closed:
+            try:
+                if connection.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+            except Exception as e:
+                self.logger.warning(f"Соединение пула повреждено и будет закрыто: {e}")
+                discard = True
+
+        with self._condition:
+            if not (discard or connection.closed or self._closed):
+                pooled.last_used = time.monotonic()
+                self._idle.append(pooled)
+                self._condition.notify()
+                return
+
+        self._discard(pooled)
+
+    def held(self) -> Optional[PooledConnection]:
+        """
+        Возвращает соединение, выданное текущему потоку.
+
+        Returns:
+            Optional[PooledConnection]: Соединение пула или None
+        """
+        with self._condition:
+            return self._in_use.get(threading.get_ident())
+
+    @contextmanager
+    def connection(self):
+        """
+        Контекстный менеджер для получения соединения из пула.
+
+        Yields:
+            psycopg2.extensions.connection: Соединение с БД
+        """
+        pooled = self.acquire()
+        try:
+            yield pooled.connection
+        finally:
+            self.release(pooled)
+
+    # =============== Служебные методы ===============
+    def _create_connection(self) -> PooledConnection:
+        """Создает новое соединение."""
+        connection = psycopg2.connect(**self.config)
+        self.logger.debug("Создано новое соединение пула PostgreSQL")
+        return PooledConnection(connection)
+
+    def _is_healthy(self, pooled: PooledConnection) -> bool:
+        """Проверяет работоспособность соединения перед выдачей."""
+        connection = pooled.connection
+        if connection.closed:
+            return False
+        if time.monotonic() - pooled.last_used < self.health_check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except Exception as e:
+            self.logger.warning(f"Соединение пула не прошло проверку: {e}")
+            return False
+
+    def _take_expired_locked(self) -> List[PooledConnection]:
+        """Извлекает из пула соединения, простаивающие дольше idle_timeout."""
+        now = time.monotonic()
+        keep = max(self.min_size - len(self._in_use), 0)
+        expired = []
+        # Свободные соединения лежат от самых старых к самым свежим
+        while len(self._idle) > keep and now - self._idle[0].last_used > self.idle_timeout:
+            expired.append(self._idle.pop(0))
+        self._size -= len(expired)
+        return expired
+
+    def _discard(self, pooled: PooledConnection) -> None:
+        """Закрывает соединение и освобождает место в пуле."""
+        self._close_connection(pooled)
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    def _close_connection(self, pooled: PooledConnection) -> None:
+        """Закрывает соединение без учета размера пула."""
+        try:
+            if not pooled.connection.closed:
+                pooled.connection.close()
+        except Exception as e:
+            self.logger.error(f"Ошибка при закрытии соединения пула: {e}")
@@ -1,30 +1,115 @@
+import hashlib
+import json
+import re
 import psycopg2
-from typing import Dict, Any, Optional, Tuple
+import psycopg2.extensions
+import sqlparse
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Tuple, Callable, Sequence, List
 import logging
-import jinja2
+from services.postgres_pool_service import PostgresPoolService
+from services.query_cache_service import QueryCacheService
+from services.template_service import TemplateService
+
+
+class QueryCancelToken:
+    """Токен отмены выполняемого SQL запроса."""
+
+    def __init__(self):
+        """Инициализация токена отмены."""
+        self._lock = threading.Lock()
+        self._connection: Optional[psycopg2.extensions.connection] = None
+        self._cancelled = False
+
+    @property
+    def cancelled(self) -> bool:
+        """Возвращает признак запрошенной отмены."""
+        return self._cancelled
+
+    def bind(self, connection: psycopg2.extensions.connection) -> None:
+        """
+        Привязывает токен к соединению, на котором выполняется запрос.
+
+        Raises:
+            psycopg2.extensions.QueryCanceledError: Если отмена уже запрошена
+        """
+        with self._lock:
+            if self._cancelled:
+                raise psycopg2.extensions.QueryCanceledError("Запрос отменен пользователем")
+            self._connection = connection
+
+    def unbind(self) -> None:
+        """Отвязывает токен от соединения."""
+        with self._lock:
+            self._connection = None
+
+    def cancel(self) -> None:
+        """Запрашивает отмену запроса на стороне сервера."""
+        with self._lock:
+            self._cancelled = True
+            if self._connection is not None and not self._connection.closed:
+                # Отправляет серверу запрос отмены, не дожидаясь окончания текущей операции
+                self._connection.cancel()
+
 
 class PostgresService:
     """Сервис для работы с PostgreSQL."""
 
-    def __init__(self, config: Dict[str, Any], logger: logging.Logger):
+    # Максимальное количество подготовленных запросов на одном соединении
+    MAX_PREPARED_STATEMENTS = 100
+
+    # Параметр $n, подставленный фильтром bind
+    BIND_PARAM_PATTERN = re.compile(r'\$(\d+)(?![\d$])')
+
+    # Скрипт метаданных колонок для пакетного режима: первая колонка - объект, к которому относится строка
+    BULK_COLUMNS_SCRIPT = (
+        "SELECT c.table_name, c.column_name, c.column_name, c.data_type, NULL, c.is_nullable = 'YES'\n"
+        "FROM information_schema.columns c\n"
+        "WHERE c.table_name = ANY({{ values|bind }})\n"
+        "ORDER BY c.table_name, c.ordinal_position"
+    )
+
+    def __init__(self,
+                 config: Dict[str, Any],
+                 logger: logging.Logger,
+                 pool_min_size: int = 1,
+                 pool_max_size: int = 5,
+                 statement_timeout: int = 0,
+                 template_service: TemplateService = None,
+                 query_cache: QueryCacheService = None,
+                 connect_timeout: int = None):
         """
         Инициализация сервиса PostgreSQL.
 
         Args:
             config: Конфигурация подключения к БД
             logger: Логгер для записи событий
+            pool_min_size: Минимальное количество соединений в пуле
+            pool_max_size: Максимальное количество соединений в пуле
+            statement_timeout: Ограничение времени выполнения скрипта по умолчанию (мс, 0 - без ограничения)
+            template_service: Сервис рендеринга SQL шаблонов
+            query_cache: Сервис кэширования результатов запросов
+            connect_timeout: Время ожидания подключения (сек.), если не задано в конфигурации
         """
         self.config = config
         self.logger = logger
-        self.connection: Optional[psycopg2.extensions.connection] = None
-        self.cursor = None
+        self.template_service = template_service or TemplateService()
+        self.query_cache = query_cache
+        self.pool_min_size = pool_min_size
+        self.pool_max_size = pool_max_size
+        self.statement_timeout = statement_timeout
+        self.connect_timeout = connect_timeout
+        self.pool: Optional[PostgresPoolService] = None
         self._status: Tuple[bool, str] = (False, "Не подключено")
         self._is_connected = False
 
     @property
     def is_connected(self) -> bool:
         """Возвращает статус подключения."""
-        return self._is_connected
+        return self._is_connected and self.pool is not None and not self.pool.closed
 
     @property
     def status(self) -> Tuple[bool, str]:
@@ -42,9 +127,21 @@ class PostgresService:
         Returns:
             Tuple[bool, str]: (успех подключения, текст статуса)
         """
+        self.close()
+
+        config = dict(self.config)
+        if self.connect_timeout and not config.get('connect_timeout'):
+            config['connect_timeout'] = self.connect_timeout
+
+        pool = PostgresPoolService(
+            config=config,
+            logger=self.logger,
+            min_size=self.pool_min_size,
+            max_size=self.pool_max_size
+        )
         try:
-            self.connection = psycopg2.connect(**self.config)
-            self.cursor = self.connection.cursor()
+            pool.open()
+            self.pool = pool
             self._status = (True, "Успешное подключение к PostgreSQL")
             self._is_connected = True
             self.logger.info("Установлено подключение к PostgreSQL")
@@ -56,76 +153,658 @@ class PostgresService:
             self.logger.error(error_msg)
             return self._status
 
-    def execute_query(self, query: str) -> Tuple[bool, Any, str]:
+    # =============== Отмена запросов ===============
+    def create_cancel_token(self) -> QueryCancelToken:
+        """Создает токен для отмены запроса."""
+        return QueryCancelToken()
+
+    def cancel(self, cancel_token: QueryCancelToken) -> None:
+        """
+        Отменяет запрос, выполняемый с указанным токеном.
+        Сервер прерывает выполнение, соединение остается в пуле.
+
+        Args:
+            cancel_token: Токен отмены запроса
+        """
+        try:
+            cancel_token.cancel()
+            self.logger.info("Отправлен запрос на отмену SQL скрипта")
+        except Exception as e:
+            self.logger.error(f"Ошибка при отмене запроса: {e}")
+
+    @contextmanager
+    def _transaction(self,
+                     pool: PostgresPoolService,
+                     cancel_token: QueryCancelToken = None,
+                     statement_timeout: int = None):
+        """
+        Выдает соединение из пула в рамках транзакции.
+        При ошибке транзакция откатывается, токен отмены привязывается на время работы.
+
+        Args:
+            pool: Пул соединений
+            cancel_token: Токен отмены запроса
+            statement_timeout: Ограничение времени выполнения (мс)
+        """
+        if statement_timeout is None:
+            statement_timeout = self.statement_timeout
+
+        with pool.connection() as connection:
+            try:
+                if cancel_token is not None:
+                    cancel_token.bind(connection)
+                if statement_timeout:
+                    with connection.cursor() as cursor:
+                        cursor.execute("SELECT set_config('statement_timeout', %s, true)", (str(int(statement_timeout)),))
+                yield connection
+            except Exception:
+                if not connection.closed:
+                    connection.rollback()
+                raise
+            finally:
+                if cancel_token is not None:
+                    cancel_token.unbind()
+
+    # =============== Подготовленные запросы ===============
+    @staticmethod
+    def get_statement_name(key: Optional[str], query: str) -> str:
+        """
+        Возвращает имя подготовленного запроса для ключа скрипта и текста запроса.
+
+        Args:
+            key: Ключ скрипта в sql_scripts.json
+            query: Текст запроса после рендеринга
+
+        Returns:
+            str: Имя подготовленного запроса
+        """
+        key = re.sub(r'[^a-z0-9_]', '_', (key or "script").lower())[:40]
+        query_hash = hashlib.sha1(query.encode('utf-8')).hexdigest()[:8]
+        return f"dgc_{key}_{query_hash}"
+
+    def _prepare(self,
+                 pool: PostgresPoolService,
+                 connection: psycopg2.extensions.connection,
+                 statement_name: str,
+                 query: str,
+                 params: Sequence[Any]) -> str:
+        """
+        Подготавливает запрос на соединении текущего потока, если он еще не подготовлен.
+
+        Args:
+            pool: Пул соединений
+            connection: Соединение с БД
+            statement_name: Имя подготовленного запроса
+            query: Текст запроса с параметрами $1, $2, ...
+            params: Значения параметров
+
+        Returns:
+            str: Запрос EXECUTE для выполнения подготовленного запроса
+        """
+        pooled = pool.held()
+        prepared = pooled.prepared if pooled is not None else set()
+
+        if statement_name not in prepared:
+            with connection.cursor() as cursor:
+                if len(prepared) >= self.MAX_PREPARED_STATEMENTS:
+                    cursor.execute("DEALLOCATE ALL")
+                    prepared.clear()
+                cursor.execute(f"PREPARE {statement_name} AS {query}")
+            prepared.add(statement_name)
+            self.logger.debug(f"Подготовлен запрос {statement_name}")
+
+        placeholders = ", ".join(["%s"] * len(params))
+        return f"EXECUTE {statement_name} ({placeholders})" if params else f"EXECUTE {statement_name}"
+
+    @classmethod
+    def _bind_statement(cls,
+                        statement: str,
+                        params: Sequence[Any],
+                        numbered: bool = False) -> Tuple[str, list]:
+        """
+        Переводит параметры $n одного выражения скрипта в параметры этого выражения.
+        Номера $n сквозные для всего скрипта, поэтому каждому выражению передаются только его значения.
+
+        Args:
+            statement: SQL выражение с параметрами $n скрипта
+            params: Значения параметров скрипта
+            numbered: True - перенумеровать в $1, $2, ... для PREPARE, False - заменить на %s для psycopg2
+
+        Returns:
+            Tuple[str, list]: (текст выражения, значения его параметров)
+        """
+        if not cls.BIND_PARAM_PATTERN.search(statement):
+            return statement, []
+
+        values = []
+        if numbered:
+            numbers = {}
+
+            def replace(match):
+                number = int(match.group(1))
+                if number not in numbers:
+                    numbers[number] = len(numbers) + 1
+                    values.append(params[number - 1])
+                return f"${numbers[number]}"
+
+            return cls.BIND_PARAM_PATTERN.sub(replace, statement), values
+
+        def replace(match):
+            values.append(params[int(match.group(1)) - 1])
+            return "%s"
+
+        return cls.BIND_PARAM_PATTERN.sub(replace, statement.replace("%", "%%")), values
+
+    def _execute_leading(self,
+                         connection: psycopg2.extensions.connection,
+                         statements: List[str],
+                         params: Sequence[Any]) -> None:
+        """
+        Выполняет выражения скрипта, предшествующие последнему, в текущей транзакции.
+
+        Args:
+            connection: Соединение с БД
+            statements: Выражения скрипта без последнего
+            params: Значения параметров скрипта
+        """
+        if not statements:
+            return
+        report = []
+        with connection.cursor() as cursor:
+            for index, statement in enumerate(statements, start=1):
+                statement, values = self._bind_statement(statement, params or [])
+                self._execute_timed(cursor, index, statement, report, values)
+
+    @staticmethod
+    def _get_cache_query(query: str, params: Sequence[Any] = None) -> str:
+        """Возвращает текст запроса вместе со значениями параметров для ключа кэша."""
+        if not params:
+            return query
+        return f"{query}\n-- params: {json.dumps(list(params), ensure_ascii=False, default=str)}"
+
+    # =============== Разбор скриптов ===============
+    @staticmethod
+    def split_statements(script: str) -> List[str]:
+        """
+        Разбивает скрипт на отдельные SQL выражения, пропуская пустые и состоящие из комментариев.
+
+        Args:
+            script: SQL скрипт
+
+        Returns:
+            List[str]: SQL выражения в порядке следования
+        """
+        statements = []
+        for statement in sqlparse.split(script):
+            if sqlparse.format(statement, strip_comments=True).strip().rstrip(';').strip():
+                statements.append(statement.strip())
+        return statements
+
+    def _execute_timed(self,
+                       cursor: psycopg2.extensions.cursor,
+                       index: int,
+                       statement: str,
+                       report: List[Dict[str, Any]],
+                       params: Sequence[Any] = None) -> None:
+        """
+        Выполняет SQL выражение и добавляет в отчет время выполнения и количество строк.
+        Запись добавляется до выполнения, чтобы при ошибке было видно, на каком выражении она возникла.
+
+        Args:
+            cursor: Курсор соединения
+            index: Порядковый номер выражения в скрипте
+            statement: SQL выражение
+            report: Отчет по выражениям
+            params: Значения параметров %s выражения
+        """
+        item = {"index": index, "statement": statement, "duration": 0.0, "rowcount": -1}
+        report.append(item)
+        started = time.perf_counter()
+        try:
+            cursor.execute(statement, params or None)
+        finally:
+            item["duration"] = time.perf_counter() - started
+        item["rowcount"] = cursor.rowcount
+        self.logger.debug(f"Выражение {index} выполнено за {item['duration']:.3f} сек., строк: {item['rowcount']}")
+
+    @staticmethod
+    def format_statements_report(report: Dict[str, Any]) -> str:
+        """
+        Формирует текстовый отчет о выполнении скрипта по выражениям.
+
+        Args:
+            report: Отчет, полученный от execute_statements
+
+        Returns:
+            str: Текст отчета
+        """
+        lines = []
+        for item in report.get("statements", []):
+            statement = " ".join(item["statement"].split())
+            if len(statement) > 100:
+                statement = statement[:97] + "..."
+            lines.append(f"#{item['index']}  {item['duration'] * 1000:.1f} мс  строк: {item['rowcount']}")
+            lines.append(f"    {statement}")
+            if item.get("error"):
+                lines.append(f"    ОШИБКА: {item['error'].strip()}")
+
+        lines.append("")
+        lines.append(f"Всего: {report.get('duration', 0.0) * 1000:.1f} мс, выражений: {len(report.get('statements', []))}")
+        if report.get("result") is not None:
+            lines.append(f"Результат последнего выражения: {len(report['result'])} строк, колонки: {', '.join(report.get('columns', []))}")
+        return "\n".join(lines)
+
+    def _error_message(self, e: Exception, cancel_token: QueryCancelToken = None) -> str:
+        """Формирует текст ошибки выполнения запроса."""
+        if cancel_token is not None and cancel_token.cancelled:
+            return "Выполнение запроса отменено"
+        if isinstance(e, psycopg2.extensions.QueryCanceledError):
+            return f"Превышено время выполнения запроса: {e}"
+        return f"Ошибка выполнения запроса: {e}"
+
+    # =============== Выполнение запросов ===============
+    def execute_query(self,
+                      query: str,
+                      cancel_token: QueryCancelToken = None,
+                      statement_timeout: int = None,
+                      params: Sequence[Any] = None,
+                      statement_name: str = None) -> Tuple[bool, Any, str]:
         """
         Выполняет SQL запрос.
 
         Args:
             query: SQL запрос для выполнения
+            cancel_token: Токен отмены запроса
+            statement_timeout: Ограничение времени выполнения (мс)
+            params: Значения параметров $1, $2, ... подготовленного запроса
+            statement_name: Имя подготовленного запроса (PREPARE) на сервере
 
         Returns:
             Tuple[bool, Any, str]: (успех выполнения, результат, сообщение об ошибке)
         """
-        if not self.is_connected:
+        pool = self.pool
+        if not self.is_connected or pool is None:
             return False, None, "Нет активного соединения с базой данных"
 
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(query)
-            result = cursor.fetchall()
-            self.connection.commit()
-            cursor.close()
-            return True, result, ""
+            with self._transaction(pool, cancel_token, statement_timeout) as connection:
+                cursor = connection.cursor()
+                if statement_name:
+                    # Подготавливается только последнее выражение, предшествующие выполняются как есть
+                    statements = self.split_statements(query) or [query]
+                    self._execute_leading(connection, statements[:-1], params)
+                    statement, values = self._bind_statement(statements[-1], params or [], numbered=True)
+                    cursor.execute(self._prepare(pool, connection, statement_name, statement, values), values or None)
+                else:
+                    cursor.execute(query)
+                result = cursor.fetchall()
+                cursor.close()
+                connection.commit()
+                return True, result, ""
         except Exception as e:
-            error_msg = f"Ошибка выполнения запроса: {e}"
+            error_msg = self._error_message(e, cancel_token)
             self.logger.error(error_msg)
-            if self.connection:
-                self.connection.rollback()
             return False, None, error_msg
 
-    def execute_script(self, script: str, params: Dict[str, Any] = None) -> Tuple[bool, Any, str]:
+    def execute_query_stream(self,
+                             query: str,
+                             on_batch: Callable[[list], None],
+                             batch_size: int = 1000,
+                             cancel_token: QueryCancelToken = None,
+                             statement_timeout: int = None,
+                             use_cache: bool = False,
+                             params: Sequence[Any] = None,
+                             statement_name: str = None) -> Tuple[bool, int, str]:
+        """
+        Выполняет SQL запрос через серверный (именованный) курсор
+        и отдает результат пачками по мере получения.
+        DECLARE не принимает EXECUTE, поэтому запрос с параметрами не подготавливается на сервере:
+        значения параметров передаются серверному курсору через psycopg2.
+
+        Args:
+            query: SQL запрос для выполнения
+            on_batch: Функция, вызываемая для каждой пачки строк
+            batch_size: Количество строк в одной пачке
+            cancel_token: Токен отмены запроса
+            statement_timeout: Ограничение времени выполнения (мс)
+            use_cache: Использовать кэш результатов запросов
+            params: Значения параметров $1, $2, ... запроса
+            statement_name: Имя подготовленного запроса; при потоковом чтении не используется
+
+        Returns:
+            Tuple[bool, int, str]: (успех выполнения, количество строк, сообщение об ошибке)
+        """
+        cache_connection = None
+        cache_query = self._get_cache_query(query, params)
+        if use_cache and self.query_cache is not None:
+            cache_connection = self.query_cache.get_connection_identity(self.config)
+            cached_rows = self.query_cache.get(cache_query, cache_connection)
+            if cached_rows is not None:
+                self.logger.info(f"Результат SQL запроса получен из кэша: {len(cached_rows)} строк")
+                start = 0
+                try:
+                    for start in range(0, len(cached_rows), batch_size):
+                        if cancel_token is not None and cancel_token.cancelled:
+                            raise psycopg2.extensions.QueryCanceledError("Запрос отменен пользователем")
+                        on_batch(cached_rows[start:start + batch_size])
+                except Exception as e:
+                    error_msg = self._error_message(e, cancel_token)
+                    self.logger.error(error_msg)
+                    return False, start, error_msg
+                return True, len(cached_rows), ""
+
+        pool = self.pool
+        if not self.is_connected or pool is None:
+            return False, 0, "Нет активного соединения с базой данных"
+
+        total_rows = 0
+        cache_rows = [] if cache_connection is not None else None
+        try:
+            with self._transaction(pool, cancel_token, statement_timeout) as connection:
+                # Серверный курсор открывается только для одного выражения:
+                # предшествующие выражения скрипта выполняются в той же транзакции
+                statements = self.split_statements(query) or [query]
+                self._execute_leading(connection, statements[:-1], params)
+                statement, values = self._bind_statement(statements[-1], params or [])
+                cursor = connection.cursor(name=f"dgc_stream_{uuid.uuid4().hex}")
+                cursor.itersize = batch_size
+                cursor.execute(statement, values or None)
+                while True:
+                    if cancel_token is not None and cancel_token.cancelled:
+                        raise psycopg2.extensions.QueryCanceledError("Запрос отменен пользователем")
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    total_rows += len(rows)
+                    if cache_rows is not None:
+                        cache_rows.extend(rows)
+                        if len(cache_rows) > self.query_cache.max_rows:
+                            cache_rows = None
+                    on_batch(rows)
+                cursor.close()
+                connection.commit()
+
+            if cache_rows is not None:
+                self.query_cache.put(cache_query, cache_connection, cache_rows)
+            return True, total_rows, ""
+        except Exception as e:
+            error_msg = self._error_message(e, cancel_token)
+            self.logger.error(error_msg)
+            return False, total_rows, error_msg
+
+    def execute_statements(self,
+                           script: str,
+                           params: Dict[str, Any] = None,
+                           cancel_token: QueryCancelToken = None,
+                           statement_timeout: int = None) -> Tuple[bool, Dict[str, Any], str]:
+        """
+        Выполняет скрипт по отдельным выражениям в одной транзакции с замером времени каждого.
+        Значения с фильтром `bind` подставляются литералами.
+
+        Args:
+            script: SQL скрипт для выполнения
+            params: Параметры для шаблонизации
+            cancel_token: Токен отмены запроса
+            statement_timeout: Ограничение времени выполнения (мс)
+
+        Returns:
+            Tuple[bool, Dict[str, Any], str]: (успех выполнения, отчет, сообщение об ошибке).
+            Отчет содержит statements (index, statement, duration, rowcount, error),
+            duration - общее время, columns и result - результат последнего выражения.
+        """
+        report: Dict[str, Any] = {"statements": [], "duration": 0.0, "columns": [], "result": None}
+        pool = self.pool
+        if not self.is_connected or pool is None:
+            return False, report, "Нет активного соединения с базой данных"
+
+        started = time.perf_counter()
+        try:
+            if params:
+                script = self.template_service.render(script, **params)
+
+            with self._transaction(pool, cancel_token, statement_timeout) as connection:
+                with connection.cursor() as cursor:
+                    for index, statement in enumerate(self.split_statements(script), start=1):
+                        if cancel_token is not None and cancel_token.cancelled:
+                            raise psycopg2.extensions.QueryCanceledError("Запрос отменен пользователем")
+                        self._execute_timed(cursor, index, statement, report["statements"])
+                    if cursor.description is not None:
+                        report["columns"] = [column.name for column in cursor.description]
+                        report["result"] = cursor.fetchall()
+                connection.commit()
+
+            report["duration"] = time.perf_counter() - started
+            return True, report, ""
+        except Exception as e:
+            report["duration"] = time.perf_counter() - started
+            error_msg = self._error_message(e, cancel_token)
+            if report["statements"]:
+                report["statements"][-1]["error"] = error_msg
+            self.logger.error(error_msg)
+            return False, report, error_msg
+
+    def execute_script_bulk(self,
+                            values: Sequence[str],
+                            script: str = None,
+                            params: Dict[str, Any] = None,
+                            cancel_token: QueryCancelToken = None,
+                            statement_timeout: int = None,
+                            statement_key: str = None) -> Tuple[bool, Dict[str, List[tuple]], str]:
+        """
+        Выполняет скрипт один раз для списка объектов и группирует строки результата по объектам.
+        Шаблон получает список в переменной `values` и передает его одним параметром
+        ({{ values|bind }} в условии `= ANY(...)`), первая колонка результата - объект строки.
+
+        Args:
+            values: Названия объектов или endpoint
+            script: SQL скрипт (по умолчанию BULK_COLUMNS_SCRIPT)
+            params: Дополнительные параметры для шаблонизации
+            cancel_token: Токен отмены запроса
+            statement_timeout: Ограничение времени выполнения (мс)
+            statement_key: Ключ скрипта в sql_scripts.json для имени подготовленного запроса
+
+        Returns:
+            Tuple[bool, Dict[str, List[tuple]], str]: (успех выполнения, строки без первой колонки
+            по объектам в порядке запроса, сообщение об ошибке)
+        """
+        values = list(dict.fromkeys(str(value) for value in values))
+        script_params = dict(params or {})
+        script_params["values"] = values
+
+        status, rows, error_msg = self.execute_script(
+            script or self.BULK_COLUMNS_SCRIPT,
+            params=script_params,
+            cancel_token=cancel_token,
+            statement_timeout=statement_timeout,
+            statement_key=statement_key or "bulk"
+        )
+        if not status:
+            return False, {}, error_msg
+
+        grouped: Dict[str, List[tuple]] = {value: [] for value in values}
+        for row in rows:
+            grouped.setdefault(str(row[0]), []).append(tuple(row[1:]))
+        self.logger.info(f"Пакетная выборка: {len(rows)} строк для {len(values)} объектов")
+        return True, grouped, ""
+
+    def explain_script(self,
+                       script: str,
+                       params: Dict[str, Any] = None,
+                       analyze: bool = True,
+                       cancel_token: QueryCancelToken = None,
+                       statement_timeout: int = None) -> Tuple[bool, Dict[str, Any], str]:
+        """
+        Строит план выполнения последнего выражения скрипта через
+        EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON). Предшествующие выражения выполняются
+        в той же транзакции, после чего транзакция откатывается, так как EXPLAIN ANALYZE
+        фактически выполняет запрос.
+
+        Args:
+            script: SQL скрипт
+            params: Параметры для шаблонизации
+            analyze: Выполнить запрос и получить фактические время, строки и буферы
+            cancel_token: Токен отмены запроса
+            statement_timeout: Ограничение времени выполнения (мс)
+
+        Returns:
+            Tuple[bool, Dict[str, Any], str]: (успех выполнения, план в формате JSON, сообщение об ошибке)
+        """
+        pool = self.pool
+        if not self.is_connected or pool is None:
+            return False, {}, "Нет активного соединения с базой данных"
+
+        try:
+            if params:
+                script = self.template_service.render(script, **params)
+
+            statements = self.split_statements(script)
+            if not statements:
+                return False, {}, "Скрипт не содержит SQL выражений"
+
+            options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+            with self._transaction(pool, cancel_token, statement_timeout) as connection:
+                try:
+                    with connection.cursor() as cursor:
+                        report = []
+                        for index, statement in enumerate(statements[:-1], start=1):
+                            self._execute_timed(cursor, index, statement, report)
+                        cursor.execute(f"EXPLAIN ({options}) {statements[-1]}")
+                        plan = cursor.fetchone()[0]
+                finally:
+                    connection.rollback()
+
+            # psycopg2 разбирает json автоматически, но результат может прийти и строкой
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return True, plan[0], ""
+        except Exception as e:
+            error_msg = self._error_message(e, cancel_token)
+            self.logger.error(error_msg)
+            return False, {}, error_msg
+
+    def execute_script(self,
+                       script: str,
+                       params: Dict[str, Any] = None,
+                       cancel_token: QueryCancelToken = None,
+                       statement_timeout: int = None,
+                       statement_key: str = None) -> Tuple[bool, Any, str]:
         """
         Выполняет SQL скрипт с поддержкой шаблонизации.
+        Значения с фильтром `bind` ({{ value|bind }}) передаются параметрами
+        подготовленного на сервере запроса.
 
         Args:
             script: SQL скрипт для выполнения
             params: Параметры для шаблонизации
+            cancel_token: Токен отмены запроса
+            statement_timeout: Ограничение времени выполнения (мс)
+            statement_key: Ключ скрипта в sql_scripts.json для имени подготовленного запроса
 
         Returns:
             Tuple[bool, Any, str]: (успех выполнения, результат, сообщение об ошибке)
         """
         try:
-            # Рендеринг шаблона если есть параметры
-            if params:
-                template = jinja2.Template(script)
-                script = template.render(**params)
-                self.logger.debug(f"SQL скрипт после рендеринга: {script}")
+            query, bind_params, statement_name = self._render_script(script, params, statement_key)
 
-            return self.execute_query(script)
+            return self.execute_query(
+                query,
+                cancel_token=cancel_token,
+                statement_timeout=statement_timeout,
+                params=bind_params,
+                statement_name=statement_name
+            )
         except Exception as e:
             error_msg = f"Ошибка при подготовке или выполнении скрипта: {e}"
             self.logger.error(error_msg)
             return False, None, error_msg
 
+    def execute_script_stream(self,
+                              script: str,
+                              on_batch: Callable[[list], None],
+                              params: Dict[str, Any] = None,
+                              batch_size: int = 1000,
+                              cancel_token: QueryCancelToken = None,
+                              statement_timeout: int = None,
+                              use_cache: bool = False,
+                              statement_key: str = None) -> Tuple[bool, int, str]:
+        """
+        Выполняет SQL скрипт с поддержкой шаблонизации в потоковом режиме.
+
+        Args:
+            script: SQL скрипт для выполнения
+            on_batch: Функция, вызываемая для каждой пачки строк
+            params: Параметры для шаблонизации
+            batch_size: Количество строк в одной пачке
+            cancel_token: Токен отмены запроса
+            statement_timeout: Ограничение времени выполнения (мс)
+            use_cache: Использовать кэш результатов запросов
+            statement_key: Ключ скрипта в sql_scripts.json для имени подготовленного запроса
+
+        Returns:
+            Tuple[bool, int, str]: (успех выполнения, количество строк, сообщение об ошибке)
+        """
+        try:
+            query, bind_params, statement_name = self._render_script(script, params, statement_key)
+
+            return self.execute_query_stream(
+                query,
+                on_batch=on_batch,
+                batch_size=batch_size,
+                cancel_token=cancel_token,
+                statement_timeout=statement_timeout,
+                use_cache=use_cache,
+                params=bind_params,
+                statement_name=statement_name
+            )
+        except Exception as e:
+            error_msg = f"Ошибка при подготовке или выполнении скрипта: {e}"
+            self.logger.error(error_msg)
+            return False, 0, error_msg
+
+    def _render_script(self,
+                       script: str,
+                       params: Dict[str, Any] = None,
+                       statement_key: str = None) -> Tuple[str, list, Optional[str]]:
+        """
+        Рендерит шаблон скрипта.
+
+        Args:
+            script: SQL скрипт
+            params: Параметры для шаблонизации
+            statement_key: Ключ скрипта в sql_scripts.json
+
+        Returns:
+            Tuple[str, list, Optional[str]]: (текст запроса, значения параметров, имя подготовленного запроса)
+        """
+        if not params:
+            return script, [], None
+
+        query, bind_params = self.template_service.render_bound(script, **params)
+        self.logger.debug(f"SQL скрипт после рендеринга: {query}")
+        if not bind_params:
+            return query, [], None
+        return query, bind_params, self.get_statement_name(statement_key, query)
+
     def fake_connect_pg(self) -> Tuple[bool, str]:
         """Тестирование соединения с базой данных."""
         self._status = (True, "Тестовое подключение к PostgreSQL")
         return self._status
 
     def close(self) -> None:
-        """Закрывает соединение с базой данных."""
-        if self.cursor:
-            self.cursor.close()
-        if self.connection:
+        """
+        Закрывает пул соединений с базой данных.
+        Соединения, занятые рабочими потоками, закрываются по завершении их запросов.
+        """
+        if self.pool:
             try:
-                self.connection.close()
+                self.pool.close()
                 self._status = (False, "Соединение закрыто")
                 self._is_connected = False
                 self.logger.info("Соединение с PostgreSQL закрыто")
             except Exception as e:
                 self.logger.error(f"Ошибка при закрытии соединения: {e}")
             finally:
-                self.connection = None
+                self.pool = None
 
     def __del__(self):
         """Автоматическое закрытие соединения при удалении объекта."""
@@ -0,0 +1,217 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+from services.logger_service import LoggerService
+from services.persistence_service import PersistenceService
+
+# Типы значений, которые сохраняются в JSON и читаются обратно без изменения типа
+JSON_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+class QueryCacheService:
+    """Сервис кэширования результатов SQL запросов с сохранением на диск.
+
+    Размер кэша ограничен количеством записей и общим количеством строк. Файл кэша
+    пишется через PersistenceService: в фоновом потоке, атомарной заменой, повторные
+    сохранения объединяются. Результаты со значениями, которые не представимы в JSON
+    без изменения типа (даты, Decimal и т.п.), не кэшируются.
+    """
+
+    def __init__(self,
+                 cache_file: Path,
+                 logger_service: LoggerService = None,
+                 persistence_service: PersistenceService = None,
+                 ttl: float = 24 * 60 * 60,
+                 max_entries: int = 100,
+                 max_rows: int = 100000,
+                 max_total_rows: int = 500000):
+        """
+        Инициализация сервиса кэша запросов.
+
+        Args:
+            cache_file: Файл для хранения кэша
+            logger_service: Сервис логирования
+            persistence_service: Сервис отложенной записи файлов (без него файл пишется сразу)
+            ttl: Время жизни записи кэша (сек.)
+            max_entries: Максимальное количество записей в кэше
+            max_rows: Максимальное количество строк результата, который может быть закэширован
+            max_total_rows: Максимальное общее количество строк всех записей кэша
+        """
+        self.cache_file = cache_file
+        self.logger_service = logger_service
+        self.persistence_service = persistence_service
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_rows = min(max_rows, max_total_rows)
+        self.max_total_rows = max_total_rows
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._total_rows = 0
+
+        self.load()
+
+    # =============== Ключи ===============
+    @staticmethod
+    def get_connection_identity(config: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Возвращает параметры подключения, определяющие источник данных.
+
+        Args:
+            config: Конфигурация подключения к БД
+
+        Returns:
+            Dict[str, str]: Хост, порт, база данных и пользователь
+        """
+        return {key: str(config.get(key, "")) for key in ("host", "port", "dbname", "user")}
+
+    def get_key(self, query: str, connection: Dict[str, str]) -> str:
+        """
+        Возвращает ключ кэша для запроса и подключения.
+
+        Args:
+            query: Текст SQL запроса после рендеринга
+            connection: Параметры подключения
+
+        Returns:
+            str: Ключ записи кэша
+        """
+        payload = json.dumps({"query": query, "connection": connection}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    # =============== Чтение и запись ===============
+    def get(self, query: str, connection: Dict[str, str]) -> Optional[List[tuple]]:
+        """
+        Возвращает закэшированный результат запроса.
+
+        Args:
+            query: Текст SQL запроса после рендеринга
+            connection: Параметры подключения
+
+        Returns:
+            Optional[List[tuple]]: Строки результата или None, если записи нет или она устарела
+        """
+        key = self.get_key(query, connection)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._is_expired(entry):
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return [tuple(row) for row in entry["rows"]]
+
+    def put(self, query: str, connection: Dict[str, str], rows: List[tuple]) -> bool:
+        """
+        Сохраняет результат запроса в кэш.
+
+        Args:
+            query: Текст SQL запроса после рендеринга
+            connection: Параметры подключения
+            rows: Строки результата
+
+        Returns:
+            bool: Результат помещен в кэш (False - слишком много строк или значения не представимы в JSON)
+        """
+        if len(rows) > self.max_rows or not self.is_json_native(rows):
+            return False
+
+        key = self.get_key(query, connection)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = {"created": time.time(), "rows": [list(row) for row in rows]}
+            self._total_rows += len(rows)
+            while len(self._entries) > self.max_entries or self._total_rows > self.max_total_rows:
+                self._remove(next(iter(self._entries)))
+        self.save()
+        return True
+
+    @staticmethod
+    def is_json_native(rows: List[tuple]) -> bool:
+        """
+        Проверяет, что значения строк сохраняются в JSON и читаются обратно без изменения типа.
+
+        Args:
+            rows: Строки результата
+
+        Returns:
+            bool: Все значения - строки, числа, логические значения, None или списки и словари из них
+        """
+        def is_native(value: Any) -> bool:
+            if isinstance(value, JSON_SCALAR_TYPES):
+                return True
+            if isinstance(value, list):
+                return all(is_native(item) for item in value)
+            if isinstance(value, dict):
+                return all(isinstance(name, str) and is_native(item) for name, item in value.items())
+            return False
+
+        return all(is_native(value) for row in rows for value in row)
+
+    def invalidate(self) -> None:
+        """Удаляет все записи кэша, в том числе с диска."""
+        with self._lock:
+            self._entries.clear()
+            self._total_rows = 0
+        self.save()
+        if self.logger_service is not None:
+            self.logger_service.info("Кэш результатов SQL запросов очищен")
+
+    def size(self) -> int:
+        """Возвращает количество записей в кэше."""
+        with self._lock:
+            return len(self._entries)
+
+    # =============== Хранение на диске ===============
+    def load(self) -> None:
+        """Загружает кэш из файла, пропуская устаревшие записи."""
+        try:
+            if not self.cache_file.exists():
+                return
+            with open(self.cache_file, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            entries = sorted(data.get("entries", {}).items(), key=lambda item: item[1]["created"])
+            with self._lock:
+                self._entries = OrderedDict()
+                self._total_rows = 0
+                for key, entry in entries:
+                    if not self._is_expired(entry):
+                        self._entries[key] = entry
+                        self._total_rows += len(entry["rows"])
+                while len(self._entries) > self.max_entries or self._total_rows > self.max_total_rows:
+                    self._remove(next(iter(self._entries)))
+        except Exception as e:
+            if self.logger_service is not None:
+                self.logger_service.error(f"Ошибка при загрузке кэша запросов: {e}")
+            self._entries = OrderedDict()
+            self._total_rows = 0
+
+    def save(self) -> None:
+        """Сохраняет кэш в файл (в фоновом потоке, если задан сервис отложенной записи)."""
+        with self._lock:
+            # Записи не изменяются после добавления, поэтому достаточно копии словаря
+            data = {"entries": dict(self._entries)}
+        if self.persistence_service is not None:
+            self.persistence_service.schedule(self.cache_file, data)
+            return
+        try:
+            PersistenceService.write_text(self.cache_file, json.dumps(data, ensure_ascii=False))
+        except Exception as e:
+            if self.logger_service is not None:
+                self.logger_service.error(f"Ошибка при сохранении кэша запросов: {e}")
+
+    def _remove(self, key: str) -> None:
+        """Удаляет запись кэша. Вызывается под блокировкой."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_rows -= len(entry["rows"])
+
+    def _is_expired(self, entry: Dict[str, Any]) -> bool:
+        """Проверяет, истек ли срок жизни записи."""
+        return time.time() - entry["created"] > self.ttl
@@ -0,0 +1,183 @@
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from services.logger_service import LoggerService
+
+try:
+    import orjson
+except ImportError:  # Ускоренная сериализация необязательна, без нее используется json
+    orjson = None
+
+
+class JsonBackend:
+    """Стандартный модуль json."""
+
+    name = "json"
+
+    @staticmethod
+    def is_available() -> bool:
+        return True
+
+    @staticmethod
+    def supports_indent(indent: Optional[int]) -> bool:
+        """Возвращает признак того, что JSON с этим отступом формирует сам модуль."""
+        return True
+
+    def dumps(self, data: Any, indent: Optional[int] = None) -> str:
+        if indent is None:
+            return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        return json.dumps(data, ensure_ascii=False, indent=indent)
+
+    def loads(self, text: Union[str, bytes]) -> Any:
+        return json.loads(text)
+
+
+class OrjsonBackend(JsonBackend):
+    """Модуль orjson (если установлен).
+
+    orjson поддерживает только отступ в 2 пробела, поэтому JSON с другим отступом
+    формируется стандартным модулем. Значения, которые orjson не сериализует
+    (например, целые числа больше 64 бит), тоже передаются стандартному модулю.
+    """
+
+    name = "orjson"
+
+    @staticmethod
+    def is_available() -> bool:
+        return orjson is not None
+
+    @staticmethod
+    def supports_indent(indent: Optional[int]) -> bool:
+        return indent in (None, 2)
+
+    def dumps(self, data: Any, indent: Optional[int] = None) -> str:
+        if not self.supports_indent(indent):
+            return super().dumps(data, indent)
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent == 2 else 0)
+        try:
+            return orjson.dumps(data, option=option).decode("utf-8")
+        except TypeError:
+            return super().dumps(data, indent)
+
+    def loads(self, text: Union[str, bytes]) -> Any:
+        return orjson.loads(text)
+
+
+class SerializerService:
+    """Сериализация JSON для файлов конфигурации.
+
+    Используется самый быстрый из доступных модулей (orjson, если он установлен, иначе json).
+    Файлы, которые читает и правит пользователь (конфигурации, подключения, SQL скрипты,
+    схема полей и страниц), сохраняются в читаемом виде с отступами, служебные файлы,
+    которые читает только приложение (кэш результатов запросов), - компактно.
+    orjson формирует читаемый вид только с отступом 2 (SERIALIZER_INDENT), при другом
+    отступе файлы в читаемом виде сохраняет стандартный модуль json.
+    """
+
+    BACKENDS = {backend.name: backend for backend in (OrjsonBackend, JsonBackend)}
+
+    def __init__(self,
+                 backend: str = "auto",
+                 indent: int = 4,
+                 logger_service: LoggerService = None):
+        """
+        Инициализация сервиса сериализации.
+
+        Args:
+            backend: Модуль сериализации: "auto" (самый быстрый доступный), "orjson" или "json"
+            indent: Отступ JSON в читаемом виде
+            logger_service: Сервис логирования
+        """
+        self.indent = indent
+        self.logger_service = logger_service
+        self.backend = self.get_backend(backend)
+        if backend not in ("auto", self.backend.name) and self.logger_service is not None:
+            self.logger_service.warning(f"Модуль сериализации {backend} недоступен, используется {self.backend.name}")
+
+    @classmethod
+    def get_backend(cls, name: str = "auto") -> JsonBackend:
+        """Возвращает модуль сериализации по имени или первый доступный (json доступен всегда)."""
+        backend = cls.BACKENDS.get(name)
+        if backend is not None and backend.is_available():
+            return backend()
+        return next(backend() for backend in cls.BACKENDS.values() if backend.is_available())
+
+    # =============== Сериализация ===============
+    def dumps(self, data: Any, pretty: bool = False) -> str:
+        """
+        Сериализует данные в JSON.
+
+        Args:
+            data: Данные
+            pretty: Читаемый вид с отступами (иначе компактный)
+
+        Returns:
+            str: Текст JSON
+        """
+        return self.backend.dumps(data, self.indent if pretty else None)
+
+    def loads(self, text: Union[str, bytes]) -> Any:
+        """Разбирает текст JSON. При ошибке разбора - ValueError."""
+        return self.backend.loads(text)
+
+    def read(self, path: Path) -> Any:
+        """Читает и разбирает файл JSON."""
+        return self.loads(Path(path).read_bytes())
+
+
+# =============== Сравнение модулей ===============
+def _benchmark_file(path: Path, repeat: int) -> List[str]:
+    """Сравнивает модули сериализации на одном файле."""
+    raw = path.read_bytes()
+    data = json.loads(raw)
+    lines = [f"{path} ({len(raw) / 1024:.1f} КБ)"]
+    for name in SerializerService.BACKENDS:
+        service = SerializerService(backend=name)
+        if service.backend.name != name:
+            lines.append(f"  {name:<8} недоступен")
+            continue
+        timings: Dict[str, float] = {}
+        # Читаемый вид с отступом, который модуль не поддерживает, формирует json - это отмечается в отчете
+        pretty = "с отступом" if service.backend.supports_indent(service.indent) else f"с отступом {service.indent} (json)"
+        for operation, call in (
+                ("чтение", lambda: service.loads(raw)),
+                ("компактно", lambda: service.dumps(data)),
+                (pretty, lambda: service.dumps(data, pretty=True))):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                call()
+            timings[operation] = (time.perf_counter() - start) / repeat * 1000
+        size = len(service.dumps(data).encode("utf-8"))
+        lines.append(f"  {name:<8} " + "  ".join(f"{key} {value:.3f} мс" for key, value in timings.items())
+                     + f"  размер компактно {size / 1024:.1f} КБ")
+    return lines
+
+
+def main(args: List[str]) -> None:
+    """Сравнение модулей сериализации на сохраненных конфигурациях.
+
+    python -m services.serializer_service [файл или папка ...] [--repeat N]
+    По умолчанию используются файлы из папок config и save_config.
+    """
+    repeat = 200
+    if "--repeat" in args:
+        position = args.index("--repeat")
+        repeat = int(args[position + 1])
+        del args[position:position + 2]
+    paths = [Path(arg) for arg in args] or [Path("config"), Path("save_config")]
+
+    files = []
+    for path in paths:
+        files.extend(sorted(path.glob("*.json")) if path.is_dir() else [path] if path.exists() else [])
+    if not files:
+        print("Файлы JSON не найдены")
+        return
+    for file in files:
+        print("\n".join(_benchmark_file(file, repeat)))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
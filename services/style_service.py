@@ -0,0 +1,183 @@
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from PyQt5 import QtCore, QtWidgets
+
+from services.file_structure_service import FileStructureService
+from services.logger_service import LoggerService
+
+
+class StyleService:
+    """Реестр стилей приложения.
+
+    Файлы QSS читаются с диска один раз, объединяются в одну таблицу стилей
+    и применяются на уровне приложения. Чтобы стили виджета не распространялись
+    на остальное окно, правила файла ограничиваются селектором виджета-владельца,
+    а для виджетов, стили которых применялись только к отдельным
+    дочерним элементам, - еще и свойством styleScope этих элементов.
+    """
+
+    # Имя свойства, которым отмечаются элементы виджета, к которым относятся его стили
+    SCOPE_PROPERTY = "styleScope"
+
+    # Файлы стилей: (файл, селекторы владельцев, стили относятся только к отмеченным элементам).
+    # Файлы без владельцев применяются ко всему приложению как есть.
+    # Владельцы вложенных виджетов указываются по objectName: правило с идентификатором
+    # перекрывает общие правила главного окна так же, как раньше их перекрывали стили самого виджета.
+    STYLESHEETS: List[Tuple[str, Tuple[str, ...], bool]] = [
+        ("MainForm.qss", ("QMainWindow",), False),
+        ("SettingsForm.qss", (), False),
+        ("ContentForm.qss", ("#content_form",), False),
+        ("SQLWidget.qss", ("#pg_widget", "#ch_widget", "#sql_viewer_script", "#sql_plan_widget"), False),
+        ("ViewTextWidget.qss", ("#view_text_widget",), False),
+        ("TextWidget.qss", ("#text_widget",), True),
+        ("SelectWidget.qss", ("#select_widget",), True),
+        ("NumberWidget.qss", ("#number_widget",), True),
+        ("CheckBoxWidget.qss", ("#check_box_widget",), True),
+        ("TagInputWidget.qss", ("#tag_input_widget",), True),
+    ]
+
+    _COMMENT_PATTERN = re.compile(r"/\*.*?\*/", re.DOTALL)
+    _RULE_PATTERN = re.compile(r"([^{}]+)\{([^{}]*)\}")
+
+    def __init__(self, file_service: FileStructureService, logger_service: LoggerService = None):
+        """
+        Инициализация реестра стилей.
+
+        Args:
+            file_service: Сервис файловой структуры (пути к файлам стилей)
+            logger_service: Сервис логирования
+        """
+        self.file_service = file_service
+        self.logger_service = logger_service
+
+        self._files: Dict[str, str] = {}
+        self._stylesheet: Optional[str] = None
+
+    # =============== Файлы стилей ===============
+    def get(self, file_name: str) -> str:
+        """
+        Возвращает содержимое файла стилей. Файл читается с диска только при первом обращении.
+
+        Args:
+            file_name: Имя файла в resources/styles
+
+        Returns:
+            str: Текст стилей или пустая строка, если файл не прочитан
+        """
+        if file_name not in self._files:
+            style_path = self.file_service.get_stylesheet_path(file_name)
+            try:
+                with open(style_path, "r", encoding='utf-8') as f:
+                    self._files[file_name] = f.read()
+            except Exception as e:
+                if self.logger_service is not None:
+                    self.logger_service.error(f"Ошибка загрузки стилей: {e}")
+                    self.logger_service.error(f"Путь к файлу стилей: {style_path}")
+                self._files[file_name] = ""
+        return self._files[file_name]
+
+    def get_stylesheet(self) -> str:
+        """
+        Возвращает объединенную таблицу стилей приложения.
+
+        Returns:
+            str: Стили всех зарегистрированных файлов
+        """
+        if self._stylesheet is None:
+            parts = []
+            for file_name, owners, scoped in self.STYLESHEETS:
+                css = self.get(file_name)
+                if owners:
+                    css = self.scope_stylesheet(css, owners, self.get_scope_name(file_name) if scoped else None)
+                parts.append(f"/* {file_name} */\n{css}")
+            self._stylesheet = "\n\n".join(parts)
+        return self._stylesheet
+
+    def apply(self, app: QtWidgets.QApplication) -> None:
+        """Применяет таблицу стилей к приложению."""
+        app.setStyleSheet(self.get_stylesheet())
+
+    @staticmethod
+    def polish(widget: QtWidgets.QWidget) -> None:
+        """
+        Заново подбирает правила стилей для элемента, которому objectName задан уже после создания.
+        Qt запоминает подходящие элементу правила при первом обращении к стилю,
+        поэтому размеры, зависящие от стилей (например, отступы панели инструментов), иначе не пересчитываются.
+        """
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
+        QtWidgets.QApplication.sendEvent(widget, QtCore.QEvent(QtCore.QEvent.StyleChange))
+
+    def reload(self, app: QtWidgets.QApplication = None) -> None:
+        """Перечитывает файлы стилей с диска и, если передано приложение, применяет их заново."""
+        self._files.clear()
+        self._stylesheet = None
+        if app is not None:
+            self.apply(app)
+
+    # =============== Ограничение области стилей ===============
+    @staticmethod
+    def get_scope_name(file_name: str) -> str:
+        """Возвращает значение свойства styleScope для файла стилей (имя файла без расширения)."""
+        return file_name.rsplit(".", 1)[0]
+
+    @classmethod
+    def set_scope(cls, widgets: Iterable[QtWidgets.QWidget], file_name: str) -> None:
+        """
+        Отмечает элементы виджета, к которым относятся стили файла.
+
+        Args:
+            widgets: Элементы, к которым раньше применялся файл стилей
+            file_name: Имя файла стилей
+        """
+        for widget in widgets:
+            widget.setProperty(cls.SCOPE_PROPERTY, cls.get_scope_name(file_name))
+
+    @classmethod
+    def scope_stylesheet(cls, css: str, owners: Sequence[str], scope: str = None) -> str:
+        """
+        Ограничивает правила стилей виджетами-владельцами.
+
+        Args:
+            css: Текст стилей
+            owners: Селекторы виджетов-владельцев
+            scope: Значение свойства styleScope отмеченных элементов (None - все элементы владельца)
+
+        Returns:
+            str: Стили с ограниченными селекторами
+        """
+        rules = []
+        for selectors, body in cls._RULE_PATTERN.findall(cls._COMMENT_PATTERN.sub("", css)):
+            scoped = []
+            for selector in (part.strip() for part in selectors.split(",")):
+                if not selector:
+                    continue
+                if scope is None and "#" in selector:
+                    # Селектор с идентификатором уже относится к конкретному элементу
+                    scoped.append(selector)
+                    continue
+                for owner in owners:
+                    scoped.extend(cls._scope_selector(selector, owner, scope))
+            if scoped:
+                lines = "\n".join(line for line in body.splitlines() if line.strip())
+                rules.append(",\n".join(scoped) + " {\n" + lines + "\n}")
+        return "\n\n".join(rules)
+
+    @classmethod
+    def _scope_selector(cls, selector: str, owner: str, scope: str = None) -> List[str]:
+        """Возвращает варианты селектора, ограниченные владельцем и, при необходимости, отмеченными элементами."""
+        if scope is None:
+            return [f"{owner} {selector}"]
+        attribute = f'[{cls.SCOPE_PROPERTY}="{scope}"]'
+        first, _, rest = selector.partition(" ")
+        # Свойство добавляется в первый простой селектор перед псевдосостояниями (:hover, ::drop-down)
+        position = first.find(":")
+        first = first + attribute if position < 0 else first[:position] + attribute + first[position:]
+        return [
+            # Правило для самого отмеченного элемента
+            f"{owner} {first} {rest}".rstrip(),
+            # Правило для вложенных в отмеченный элемент виджетов
+            f"{owner} *{attribute} {selector}",
+        ]
@@ -0,0 +1,159 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Tuple
+
+import jinja2
+
+from services.logger_service import LoggerService
+
+
+BIND_PARAMS_VARIABLE = "_bind_params"
+
+
+def sql_literal(value: Any) -> str:
+    """
+    Возвращает значение в виде SQL литерала для отображения скрипта.
+
+    Args:
+        value: Значение параметра
+
+    Returns:
+        str: SQL литерал
+    """
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+@jinja2.pass_context
+def bind_filter(context: jinja2.runtime.Context, value: Any) -> str:
+    """
+    Фильтр Jinja `bind`: подставляет значение как параметр запроса ($1, $2, ...).
+    Вне рендеринга с параметрами значение подставляется SQL литералом.
+
+    Каждое применение фильтра получает свой параметр, даже для равных значений:
+    иначе 1, 1.0 и True объединялись бы в один параметр с неверно выведенным типом,
+    а текст запроса зависел бы от совпадения значений.
+    """
+    bind_params = context.get(BIND_PARAMS_VARIABLE)
+    if bind_params is None:
+        return sql_literal(value)
+    bind_params.append(value)
+    return f"${len(bind_params)}"
+
+
+class TemplateService:
+    """Сервис рендеринга SQL шаблонов Jinja с кэшем скомпилированных шаблонов."""
+
+    def __init__(self, logger_service: LoggerService = None, cache_size: int = 128):
+        """
+        Инициализация сервиса шаблонов.
+
+        Args:
+            logger_service: Сервис логирования
+            cache_size: Максимальное количество скомпилированных шаблонов в кэше
+        """
+        self.logger_service = logger_service
+        self.cache_size = cache_size
+        self.environment = jinja2.Environment()
+        self.environment.filters['bind'] = bind_filter
+
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, jinja2.Template]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def get_script_hash(script: str) -> str:
+        """
+        Возвращает хэш текста шаблона, используемый как ключ кэша.
+
+        Args:
+            script: Текст шаблона
+
+        Returns:
+            str: Хэш текста шаблона
+        """
+        return hashlib.sha1(script.encode('utf-8')).hexdigest()
+
+    def get_template(self, script: str) -> jinja2.Template:
+        """
+        Возвращает скомпилированный шаблон из кэша или компилирует новый.
+
+        Args:
+            script: Текст шаблона
+
+        Returns:
+            jinja2.Template: Скомпилированный шаблон
+        """
+        key = self.get_script_hash(script)
+        with self._lock:
+            template = self._cache.get(key)
+            if template is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return template
+            self._misses += 1
+
+        # Компиляция выполняется вне блокировки, ошибки синтаксиса пробрасываются вызывающему
+        template = self.environment.from_string(script)
+
+        with self._lock:
+            self._cache[key] = template
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return template
+
+    def render(self, script: str, **params: Any) -> str:
+        """
+        Рендерит шаблон с указанными параметрами.
+
+        Args:
+            script: Текст шаблона
+            **params: Параметры для шаблонизации
+
+        Returns:
+            str: Результат рендеринга
+        """
+        return self.get_template(script).render(**params)
+
+    def render_bound(self, script: str, **params: Any) -> Tuple[str, List[Any]]:
+        """
+        Рендерит шаблон, заменяя значения с фильтром `bind` на параметры запроса.
+        Текст запроса не зависит от значений параметров, поэтому его план может переиспользоваться.
+
+        Args:
+            script: Текст шаблона
+            **params: Параметры для шаблонизации
+
+        Returns:
+            Tuple[str, List[Any]]: (текст запроса с $1, $2, ..., значения параметров)
+        """
+        bind_params: List[Any] = []
+        query = self.get_template(script).render(**params, **{BIND_PARAMS_VARIABLE: bind_params})
+        return query, bind_params
+
+    def clear_cache(self) -> None:
+        """Очищает кэш скомпилированных шаблонов."""
+        with self._lock:
+            self._cache.clear()
+            self._hits = 0
+            self._misses = 0
+        if self.logger_service is not None:
+            self.logger_service.debug("Кэш SQL шаблонов очищен")
+
+    def cache_info(self) -> Dict[str, int]:
+        """
+        Возвращает статистику кэша шаблонов.
+
+        Returns:
+            Dict[str, int]: Количество попаданий, промахов и размер кэша
+        """
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses, "size": len(self._cache)}
@@ -0,0 +1,305 @@
+import re
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from services.logger_service import LoggerService
+
+
+class TypeMappingService:
+    """Сопоставление типов полей источника (PostgreSQL, 1С) типам ClickHouse.
+
+    Тип источника разбирается правилами один раз для каждого различного значения,
+    результат запоминается в таблице соответствия. Колонки результата SQL запроса
+    кодируются номерами различных значений, и типы всех строк получаются одной
+    выборкой из массивов numpy по этим номерам.
+    """
+
+    # Тип, в котором хранятся значения, для которых нет правила
+    FALLBACK_TYPE = "String"
+
+    # Типы по имени без параметров (в нижнем регистре): PostgreSQL, ClickHouse и 1С
+    TYPE_NAMES: Dict[str, str] = {
+        # Целые числа
+        "smallint": "Int64", "integer": "Int64", "int": "Int64", "bigint": "Int64",
+        "int2": "Int64", "int4": "Int64", "int8": "Int64",
+        "smallserial": "Int64", "serial": "Int64", "bigserial": "Int64",
+        "serial2": "Int64", "serial4": "Int64", "serial8": "Int64", "oid": "Int64",
+        "int16": "Int64", "int32": "Int64", "int64": "Int64",
+        "uint8": "Int64", "uint16": "Int64", "uint32": "Int64", "uint64": "Int64",
+        # Числа с плавающей точкой
+        "real": "Float64", "double precision": "Float64", "float": "Float64",
+        "float4": "Float64", "float8": "Float64", "money": "Float64",
+        "float32": "Float64", "float64": "Float64",
+        # Логический тип
+        "boolean": "Boolean", "bool": "Boolean", "булево": "Boolean",
+        # Дата и время
+        "date": "Date", "date32": "Date",
+        "timestamp": "DateTime", "timestamptz": "DateTime", "datetime": "DateTime", "datetime64": "DateTime",
+        "timestamp without time zone": "DateTime", "timestamp with time zone": "DateTime",
+        "дата": "DateTime",
+        # Идентификаторы
+        "uuid": "UUID", "уникальныйидентификатор": "UUID",
+        # Строки
+        "text": "String", "character varying": "String", "varchar": "String", "character": "String",
+        "char": "String", "bpchar": "String", "name": "String", "citext": "String",
+        "json": "String", "jsonb": "String", "xml": "String", "string": "String", "fixedstring": "String",
+        "строка": "String",
+    }
+
+    # Десятичные типы: целые при нулевом масштабе, иначе с плавающей точкой
+    DECIMAL_NAMES = ("numeric", "decimal", "number", "число")
+
+    # Ссылочные типы 1С хранятся идентификатором ссылки, перечисления - строкой
+    REFERENCE_PATTERN = re.compile(
+        r"^(справочник|документ|плансчетов|планвидовхарактеристик|планвидоврасчета|планобмена|бизнеспроцесс|задача"
+        r"|catalog|document|chartofaccounts|chartofcharacteristictypes|chartofcalculationtypes|exchangeplan"
+        r"|businessprocess|task)(ссылка|ref)\.")
+    ENUM_PATTERN = re.compile(r"^(перечисление|enum)(ссылка|ref)\.")
+
+    # Обертки типов ClickHouse
+    WRAPPER_PATTERN = re.compile(r"^(nullable|lowcardinality)\((.*)\)$")
+    PARAMS_PATTERN = re.compile(r"\(([^()]*)\)")
+    ARRAY_PATTERN = re.compile(r"(\[\]$|^_|^array\()")
+
+    # Значения признака Null, означающие, что поле допускает NULL
+    NULLABLE_VALUES = ("1", "true", "yes", "y", "да", "истина")
+
+    def __init__(self,
+                 columns: Sequence[dict],
+                 source_key: str = "type",
+                 target_key: str = "ch_type",
+                 nullable_key: str = "null_constraint",
+                 logger_service: LoggerService = None):
+        """
+        Инициализация сервиса сопоставления типов.
+
+        Args:
+            columns: Настройки колонок таблицы полей (значения колонок выбора - допустимые типы)
+            source_key: Ключ колонки с типом источника
+            target_key: Ключ колонки с типом ClickHouse
+            nullable_key: Ключ колонки с признаком Null
+            logger_service: Сервис логирования
+        """
+        self.source_key = source_key
+        self.target_key = target_key
+        self.nullable_key = nullable_key
+        self.logger_service = logger_service
+
+        # Таблица соответствия: тип источника -> (базовый тип, тип объявлен Nullable, тип найден правилом)
+        self._cache: Dict[str, Tuple[str, bool, bool]] = {}
+        self.set_columns(columns)
+
+    def set_columns(self, columns: Sequence[dict]) -> None:
+        """
+        Задает допустимые типы по настройкам колонок таблицы полей (после изменения конфигурации полей).
+
+        Args:
+            columns: Настройки колонок таблицы полей
+        """
+        values = {column['key']: column.get('value') or [] for column in columns if column.get('type') == 'select'}
+        self.source_types: List[str] = [str(value) for value in values.get(self.source_key, [])]
+        self.target_types: List[str] = [str(value) for value in values.get(self.target_key, [])]
+
+    # =============== Разбор типа ===============
+    def resolve(self, source_type: Any) -> Tuple[str, bool]:
+        """
+        Возвращает базовый тип ClickHouse для типа источника.
+
+        Args:
+            source_type: Тип поля в источнике (например, "numeric(10,2)", "Nullable(Int32)", "СправочникСсылка.Контрагенты")
+
+        Returns:
+            Tuple[str, bool]: Базовый тип (пустая строка для пустого типа) и признак типа, объявленного Nullable
+        """
+        return self._lookup(source_type)[:2]
+
+    def _lookup(self, source_type: Any) -> Tuple[str, bool, bool]:
+        key = "" if source_type is None else str(source_type)
+        result = self._cache.get(key)
+        if result is None:
+            result = self._cache[key] = self._resolve(key)
+        return result
+
+    def _resolve(self, source_type: str) -> Tuple[str, bool, bool]:
+        text = " ".join(source_type.strip().lower().split())
+        if not text:
+            return "", False, False
+
+        nullable = False
+        match = self.WRAPPER_PATTERN.match(text)
+        while match:
+            nullable = nullable or match.group(1) == "nullable"
+            text = match.group(2).strip()
+            match = self.WRAPPER_PATTERN.match(text)
+
+        if self.ARRAY_PATTERN.search(text):
+            return self.FALLBACK_TYPE, nullable, False
+        if self.ENUM_PATTERN.match(text):
+            return "String", nullable, True
+        if self.REFERENCE_PATTERN.match(text):
+            return "UUID", nullable, True
+
+        params = self.PARAMS_PATTERN.findall(text)
+        name = " ".join(self.PARAMS_PATTERN.sub(" ", text).split())
+        if name in self.DECIMAL_NAMES:
+            scale = params[0].split(",")[1].strip() if params and "," in params[0] else ""
+            # numeric без параметров может хранить дробные значения
+            return ("Int64" if scale in ("0", "") and params else "Float64"), nullable, True
+        if name in self.TYPE_NAMES:
+            return self.TYPE_NAMES[name], nullable, True
+        return self.FALLBACK_TYPE, nullable, False
+
+    def _get_target(self, types: List[str], base_type: str, nullable: bool) -> str:
+        """Возвращает допустимое значение колонки типа ClickHouse: Nullable(тип), если поле допускает NULL."""
+        if not base_type:
+            return ""
+        if nullable:
+            wrapped = f"Nullable({base_type})"
+            if wrapped in types or not types:
+                return wrapped
+        if base_type in types or not types:
+            return base_type
+        return self.FALLBACK_TYPE if self.FALLBACK_TYPE in types else ""
+
+    def _get_source(self, source_type: str, base_type: str, matched: bool) -> str:
+        """Возвращает значение колонки типа источника: базовый тип, найденный правилом и допустимый, иначе исходный тип."""
+        if source_type in self.source_types or not matched or base_type not in self.source_types:
+            return source_type
+        return base_type
+
+    # =============== Сопоставление колонок ===============
+    @staticmethod
+    def factorize(values: Sequence[Any]) -> Tuple[List[Any], np.ndarray]:
+        """
+        Кодирует значения номерами различных значений.
+
+        Returns:
+            Tuple[List[Any], np.ndarray]: Различные значения и номер значения для каждого элемента
+        """
+        index: Dict[Any, int] = {}
+        codes = np.fromiter((index.setdefault(value, len(index)) for value in values), dtype=np.int32, count=len(values))
+        return list(index), codes
+
+    def to_nullable(self, values: Sequence[Any]) -> np.ndarray:
+        """Приводит значения признака Null (bool, "YES"/"NO", "Да"/"Нет", 1/0) к массиву bool."""
+        uniques, codes = self.factorize(["" if value is None else str(value).strip().lower() for value in values])
+        lookup = np.fromiter((value in self.NULLABLE_VALUES for value in uniques), dtype=bool, count=len(uniques))
+        return lookup[codes] if len(codes) else np.zeros(0, dtype=bool)
+
+    def map_codes(self,
+                  categories: Sequence[Any],
+                  codes: np.ndarray,
+                  nullable: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Сопоставляет типы, заданные кодами категорий (например, колонкой выбора хранилища таблицы).
+        Правила применяются только к категориям, строки получают результат выборкой по кодам.
+
+        Args:
+            categories: Типы источника по кодам
+            codes: Коды типов строк
+            nullable: Признак Null строк (по умолчанию - только типы, объявленные Nullable)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Тип источника, тип ClickHouse и признак Null для каждой строки.
+            Тип источника заменяется базовым типом, только если тип найден правилом и есть среди допустимых значений,
+            тип ClickHouse строк с признаком Null оборачивается в Nullable(...)
+        """
+        resolved = [self._lookup(category) for category in categories]
+        source = np.empty(len(resolved), dtype=object)
+        source[:] = [self._get_source("" if category is None else str(category), base, matched)
+                     for category, (base, _, matched) in zip(categories, resolved)]
+        declared = np.fromiter((flag for _, flag, _ in resolved), dtype=bool, count=len(resolved))
+
+        # Для каждой категории - тип ClickHouse без Nullable (столбец 0) и с Nullable (столбец 1)
+        target = np.empty((len(resolved), 2), dtype=object)
+        target[:, 0] = [self._get_target(self.target_types, base, False) for base, _, _ in resolved]
+        target[:, 1] = [self._get_target(self.target_types, base, True) for base, _, _ in resolved]
+
+        codes = np.asarray(codes, dtype=np.int64)
+        rows_nullable = declared[codes] if len(codes) else np.zeros(0, dtype=bool)
+        if nullable is not None:
+            rows_nullable = rows_nullable | np.asarray(nullable, dtype=bool)
+        return source[codes], target[codes, rows_nullable.astype(np.int64)], rows_nullable
+
+    def map_types(self, source_types: Sequence[Any], nullable: Sequence[Any] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Сопоставляет типы источника типам ClickHouse.
+
+        Args:
+            source_types: Типы источника
+            nullable: Значения признака Null
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Тип источника, тип ClickHouse и признак Null для каждого значения
+        """
+        categories, codes = self.factorize(["" if value is None else str(value) for value in source_types])
+        return self.map_codes(categories, codes, None if nullable is None else self.to_nullable(nullable))
+
+    def keep_explicit(self,
+                      current: Sequence[Any],
+                      target: np.ndarray,
+                      nullable: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Сохраняет тип ClickHouse, уже указанный в строке допустимым значением.
+        Признак Null таких строк берется из указанного типа: Nullable(...) - поле допускает NULL.
+
+        Args:
+            current: Текущие значения колонки типа ClickHouse
+            target: Сопоставленные типы ClickHouse
+            nullable: Сопоставленные признаки Null
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Тип ClickHouse и признак Null для каждой строки
+        """
+        categories, codes = self.factorize(["" if value is None else str(value) for value in current])
+        if not len(codes):
+            return target, nullable
+        explicit = np.fromiter((value in self.target_types for value in categories), dtype=bool, count=len(categories))
+        declared = np.fromiter((self._lookup(value)[1] for value in categories), dtype=bool, count=len(categories))
+        values = np.empty(len(categories), dtype=object)
+        values[:] = categories
+        rows_explicit = explicit[codes]
+        return (np.where(rows_explicit, values[codes], target),
+                np.where(rows_explicit, declared[codes], nullable))
+
+    def apply_rows(self, rows: Sequence[Sequence[Any]], keys: Sequence[str]) -> Sequence[Sequence[Any]]:
+        """
+        Заполняет типы в строках результата SQL запроса перед добавлением в таблицу.
+        Тип ClickHouse, уже указанный в строке допустимым значением, сохраняется (см. keep_explicit).
+
+        Args:
+            rows: Строки - последовательности значений в порядке keys
+            keys: Ключи колонок
+
+        Returns:
+            Sequence[Sequence[Any]]: Строки с заполненными типами (исходные строки, если колонки типа нет)
+        """
+        keys = list(keys)
+        if not len(rows) or self.source_key not in keys:
+            return rows
+        try:
+            # Колонки заполняются по одной: значения-списки (массивы PostgreSQL) остаются объектами
+            matrix = np.empty((len(rows), len(keys)), dtype=object)
+            for column in range(len(keys)):
+                matrix[:, column] = np.fromiter((row[column] for row in rows), dtype=object, count=len(rows))
+        except (IndexError, ValueError) as e:
+            # Строки разной длины - типы не заполняются
+            if self.logger_service is not None:
+                self.logger_service.error(f"Не удалось заполнить типы полей: {e}")
+            return rows
+
+        source_column = keys.index(self.source_key)
+        nullable_column = keys.index(self.nullable_key) if self.nullable_key in keys else None
+        source, target, nullable = self.map_types(
+            matrix[:, source_column],
+            None if nullable_column is None else matrix[:, nullable_column])
+
+        matrix[:, source_column] = source
+        if self.target_key in keys:
+            target_column = keys.index(self.target_key)
+            target, nullable = self.keep_explicit(matrix[:, target_column], target, nullable)
+            matrix[:, target_column] = target
+        if nullable_column is not None:
+            matrix[:, nullable_column] = nullable
+        return matrix
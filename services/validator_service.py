@@ -0,0 +1,308 @@
+from numbers import Number
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.fields_store_service import FieldsStoreService
+from services.logger_service import LoggerService
+
+
+class ValidationError:
+    """Ошибка проверки конфигурации.
+
+    Attributes:
+        key: Ключ поля конфигурации
+        message: Текст ошибки
+        column: Ключ колонки таблицы (для ошибок в строках таблицы)
+        rows: Номера строк таблицы с ошибкой
+    """
+
+    __slots__ = ("key", "message", "column", "rows")
+
+    def __init__(self, key: str, message: str, column: str = None, rows: np.ndarray = None):
+        self.key = key
+        self.message = message
+        self.column = column
+        self.rows = rows
+
+    def __str__(self) -> str:
+        if self.rows is None:
+            return self.message
+        rows = ", ".join(str(row + 1) for row in self.rows[:5].tolist())
+        more = f" и еще {len(self.rows) - 5}" if len(self.rows) > 5 else ""
+        return f"{self.message} (строки {rows}{more})"
+
+
+class ColumnValidator:
+    """Проверка колонки таблицы полей.
+
+    Attributes:
+        key: Ключ колонки
+        message: Текст ошибки ячейки
+        check_values: Функция: массив значений колонки -> маска строк с ошибкой
+        check_categories: Функция для колонок выбора: значения категорий -> маска ошибочных категорий
+    """
+
+    __slots__ = ("key", "message", "check_values", "check_categories")
+
+    def __init__(self,
+                 key: str,
+                 message: str,
+                 check_values: Callable[[np.ndarray], np.ndarray],
+                 check_categories: Callable[[Sequence[Any]], np.ndarray] = None):
+        self.key = key
+        self.message = message
+        self.check_values = check_values
+        self.check_categories = check_categories
+
+
+class ValidatorService:
+    """Проверка конфигурации по описанию полей (config_fields.json: type, required, values).
+
+    Описание каждого поля один раз компилируется в функцию проверки значения,
+    описание колонок таблицы - в векторные проверки целой колонки. Значение поля
+    проверяется при каждом изменении, колонки таблицы - одним проходом по массивам
+    хранилища (для колонок выбора проверяются только различные значения, строки
+    получают результат выборкой по кодам).
+    """
+
+    def __init__(self, config_fields: Dict[str, dict] = None, logger_service: LoggerService = None):
+        """
+        Инициализация проверки конфигурации.
+
+        Args:
+            config_fields: Описание полей конфигурации
+            logger_service: Сервис логирования
+        """
+        self.logger_service = logger_service
+        self.set_schema(config_fields or {})
+
+    def set_schema(self, config_fields: Dict[str, dict]) -> None:
+        """Компилирует проверки по описанию полей (при загрузке и изменении config_fields.json)."""
+        self._validators: Dict[str, Callable[[Any], Optional[str]]] = {}
+        self._columns: Dict[str, Dict[str, ColumnValidator]] = {}
+        for key, field in config_fields.items():
+            if not isinstance(field, dict):
+                continue
+            self._validators[key] = self._compile_field(field)
+            if field.get('type') == 'table':
+                self._columns[key] = {
+                    column['key']: self._compile_column(column)
+                    for column in field.get('values') or []
+                    if column.get('key') and column.get('type') != 'action'
+                }
+
+    @property
+    def table_keys(self) -> List[str]:
+        """Ключи полей-таблиц."""
+        return list(self._columns)
+
+    # =============== Компиляция проверок ===============
+    @staticmethod
+    def _compile_field(field: dict) -> Callable[[Any], Optional[str]]:
+        """Возвращает функцию проверки значения поля: значение -> текст ошибки или None."""
+        name = field.get('name', '')
+        field_type = field.get('type', 'text')
+        required = bool(field.get('required'))
+        empty_message = f"{name}: обязательное поле не заполнено"
+
+        if field_type == 'text':
+            def check(value: Any) -> Optional[str]:
+                if value is None or value == "":
+                    return empty_message if required else None
+                if not isinstance(value, str):
+                    return f"{name}: ожидается строка"
+                if required and not value.strip():
+                    return empty_message
+                return None
+        elif field_type == 'number':
+            def check(value: Any) -> Optional[str]:
+                if value is None or value == "":
+                    return empty_message if required else None
+                if isinstance(value, bool) or not isinstance(value, Number):
+                    return f"{name}: ожидается число"
+                return None
+        elif field_type == 'boolean':
+            def check(value: Any) -> Optional[str]:
+                if value is None or value == "":
+                    return empty_message if required else None
+                # CheckBoxWidget передает 1 и 0
+                if not isinstance(value, bool) and value not in (0, 1):
+                    return f"{name}: ожидается логическое значение"
+                return None
+        elif field_type == 'select':
+            # SelectWidget передает значение варианта, а для отсутствующего в списке варианта - его текст
+            options = field.get('values') or []
+            allowed = {str(option.get('value')) for option in options} | {str(option.get('name')) for option in options}
+
+            def check(value: Any) -> Optional[str]:
+                if value is None or value == "":
+                    return empty_message if required else None
+                if allowed and str(value) not in allowed:
+                    return f"{name}: значение {value} не из списка"
+                return None
+        elif field_type == 'array':
+            def check(value: Any) -> Optional[str]:
+                if value is None or value == "" or value == []:
+                    return empty_message if required else None
+                if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                    return f"{name}: ожидается список строк"
+                return None
+        elif field_type == 'table':
+            def check(value: Any) -> Optional[str]:
+                if value is None or value == "" or (isinstance(value, (list, FieldsStoreService)) and not len(value)):
+                    return empty_message if required else None
+                if not isinstance(value, (list, FieldsStoreService)):
+                    return f"{name}: ожидается список строк таблицы"
+                return None
+        else:
+            def check(value: Any) -> Optional[str]:
+                if required and (value is None or value == ""):
+                    return empty_message
+                return None
+        return check
+
+    @staticmethod
+    def _compile_column(column: dict) -> ColumnValidator:
+        """Возвращает векторную проверку колонки таблицы."""
+        key = column['key']
+        name = column.get('name') or key
+        column_type = column.get('type', 'text')
+        required = bool(column.get('required'))
+
+        def is_empty(values: np.ndarray) -> np.ndarray:
+            return values == "" if required else np.zeros(len(values), dtype=bool)
+
+        if column_type == 'select':
+            allowed = {str(value) for value in column.get('value') or []}
+            if not required:
+                allowed.add("")
+
+            def check_categories(categories: Sequence[Any]) -> np.ndarray:
+                return np.fromiter((str(value) not in allowed for value in categories), dtype=bool, count=len(categories))
+
+            def check_values(values: np.ndarray) -> np.ndarray:
+                index: Dict[str, int] = {}
+                codes = np.fromiter((index.setdefault("" if value is None else str(value), len(index)) for value in values),
+                                    dtype=np.int64, count=len(values))
+                return check_categories(list(index))[codes] if len(codes) else np.zeros(0, dtype=bool)
+
+            message = f"{name}: значение не из списка" + (" или не заполнено" if required else "")
+            return ColumnValidator(key, message, check_values, check_categories)
+
+        if column_type == 'boolean':
+            def check_values(values: np.ndarray) -> np.ndarray:
+                invalid = np.fromiter((not isinstance(value, (bool, np.bool_)) and value != "" for value in values),
+                                      dtype=bool, count=len(values))
+                return invalid | is_empty(values)
+            return ColumnValidator(key, f"{name}: ожидается логическое значение", check_values)
+
+        if column_type == 'number':
+            def check_values(values: np.ndarray) -> np.ndarray:
+                invalid = np.fromiter((value != "" and (isinstance(value, bool) or not isinstance(value, Number))
+                                       for value in values), dtype=bool, count=len(values))
+                return invalid | is_empty(values)
+            return ColumnValidator(key, f"{name}: ожидается число", check_values)
+
+        def check_values(values: np.ndarray) -> np.ndarray:
+            invalid = np.fromiter((not isinstance(value, str) for value in values), dtype=bool, count=len(values))
+            return invalid | is_empty(values)
+        message = f"{name}: ожидается строка" + (", поле обязательно" if required else "")
+        return ColumnValidator(key, message, check_values)
+
+    # =============== Проверка ===============
+    def validate_value(self, key: str, value: Any) -> Optional[str]:
+        """
+        Проверяет значение поля.
+
+        Args:
+            key: Ключ поля
+            value: Значение
+
+        Returns:
+            Optional[str]: Текст ошибки или None (в том числе для полей без описания)
+        """
+        check = self._validators.get(key)
+        return None if check is None else check(value)
+
+    def get_column_validator(self, table_key: str, column: str) -> Optional[ColumnValidator]:
+        """Возвращает проверку колонки таблицы."""
+        return self._columns.get(table_key, {}).get(column)
+
+    def validate_store(self,
+                       table_key: str,
+                       store: FieldsStoreService,
+                       keys: Sequence[str] = None) -> Dict[str, np.ndarray]:
+        """
+        Проверяет колонки таблицы в хранилище.
+
+        Args:
+            table_key: Ключ поля-таблицы
+            store: Хранилище строк таблицы
+            keys: Проверяемые колонки (по умолчанию все)
+
+        Returns:
+            Dict[str, np.ndarray]: Номера строк с ошибкой для каждой проверенной колонки
+        """
+        result = {}
+        for key, validator in self._get_columns(table_key, keys, store.keys):
+            if validator.check_categories is not None:
+                codes = store.get_codes(key)
+                mask = validator.check_categories(store.get_categories(key))[codes] if len(codes) else np.zeros(0, dtype=bool)
+            else:
+                mask = validator.check_values(store.get_column(key))
+            result[key] = np.flatnonzero(mask)
+        return result
+
+    def validate_rows(self,
+                      table_key: str,
+                      rows: Sequence[dict],
+                      keys: Sequence[str] = None) -> Dict[str, np.ndarray]:
+        """
+        Проверяет колонки таблицы, заданной строками-словарями (например, из загруженного файла).
+
+        Returns:
+            Dict[str, np.ndarray]: Номера строк с ошибкой для каждой проверенной колонки
+        """
+        result = {}
+        for key, validator in self._get_columns(table_key, keys):
+            values = np.fromiter((row.get(key, "") if isinstance(row, dict) else None for row in rows),
+                                 dtype=object, count=len(rows))
+            result[key] = np.flatnonzero(validator.check_values(values))
+        return result
+
+    def _get_columns(self, table_key: str, keys: Sequence[str] = None,
+                     available: Sequence[str] = None) -> List[Tuple[str, ColumnValidator]]:
+        columns = self._columns.get(table_key, {})
+        keys = columns if keys is None else [key for key in keys if key in columns]
+        return [(key, columns[key]) for key in keys if available is None or key in available]
+
+    def validate(self, config: Dict[str, Any], stores: Dict[str, FieldsStoreService] = None) -> List[ValidationError]:
+        """
+        Проверяет всю конфигурацию.
+
+        Args:
+            config: Значения полей конфигурации
+            stores: Хранилища таблиц по ключам полей (вместо строк из config)
+
+        Returns:
+            List[ValidationError]: Ошибки конфигурации
+        """
+        stores = stores or {}
+        errors = []
+        for key, check in self._validators.items():
+            value = stores[key] if key in stores else config.get(key)
+            message = check(value)
+            if message is not None:
+                errors.append(ValidationError(key, message))
+                continue
+            if key not in self._columns or value is None or value == "":
+                continue
+            if key in stores:
+                result = self.validate_store(key, stores[key])
+            else:
+                result = self.validate_rows(key, value)
+            for column, rows in result.items():
+                if len(rows):
+                    errors.append(ValidationError(key, self._columns[key][column].message, column, rows))
+        return errors
@@ -11,6 +11,18 @@ DESCRIPTION_APP = "DWH Generator Config"
 LICENSE_APP = "MIT"
 COPYRIGHT_APP = "Copyright 2024 BRD Pro"
 
+PG_CONNECT_TIMEOUT = 5  # Время ожидания подключения к PostgreSQL (сек.)
+SQL_STATEMENT_TIMEOUT = 5 * 60 * 1000  # Ограничение времени выполнения SQL скрипта (мс)
+QUERY_CACHE_TTL = 24 * 60 * 60  # Время жизни результатов SQL скриптов в кэше (сек.)
+QUERY_CACHE_MAX_ENTRIES = 100  # Максимальное количество результатов SQL скриптов в кэше
+QUERY_CACHE_MAX_TOTAL_ROWS = 500000  # Максимальное общее количество строк результатов SQL скриптов в кэше
+TOOLBOX_PREFETCH_PAGES = 1  # Количество соседних страниц полей, создаваемых заранее в простое
+HISTORY_MAX_STEPS = 200  # Максимальное количество шагов отмены изменений конфигурации
+PERSISTENCE_DELAY = 0.3  # Задержка записи файлов конфигурации, за которую объединяются повторные сохранения (сек.)
+CONFIG_WATCH_INTERVAL = 150  # Интервал объединения уведомлений об изменении файлов конфигурации полей и страниц (мс)
+SERIALIZER_BACKEND = "auto"  # Модуль сериализации JSON: "auto" (orjson, если установлен), "orjson" или "json"
+SERIALIZER_INDENT = 4  # Отступ JSON в файлах, сохраняемых в читаемом виде (orjson поддерживает только 2, при другом отступе используется json)
+
 
 def set_version_app():
     """Установка версии приложения в формате MAJOR.YY.MM.DD"""
@@ -32,20 +32,6 @@ class ContentForm(QDialog):
 
         self._setup_ui()
         self._load_icons()
-        self._load_stylesheet()
-
-    def _load_stylesheet(self):
-        """Загрузка стилей."""
-        style_path = self.app.file_service.get_stylesheet_path("ContentForm.qss")
-        try:
-            with open(style_path, "r", encoding='utf-8') as f:
-                self.stylesheet = f.read()
-            self.setStyleSheet(self.stylesheet)
-        except Exception as e:
-            self.logger.error(f"Ошибка загрузки стилей: {e}")
-            self.logger.error(f"Путь к файлу стилей: {style_path}")
-            self.logger.error(f"Текущая директория: {os.getcwd()}")
-            self.logger.error(f"MEIPASS: {getattr(sys, '_MEIPASS', 'Не установлен')}")
 
     def _load_icons(self):
         """Загрузка иконок."""
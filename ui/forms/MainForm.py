@@ -5,6 +5,7 @@ import os
 import sys
 
 from ui.widgets.ActionsConnectWidget import ActionsConnectWidget
+from ui.widgets.FieldsFilterWidget import FieldsFilterWidget
 from ui.widgets.LoadingWidget import LoadingWidget
 from ui.widgets.NotificationWidget import NotificationWidget
 
@@ -34,29 +35,13 @@ class UiMainWindow(QtWidgets.QMainWindow):
 
         self._load_icons()
         self._setup_ui()
-        self._load_stylesheet()
         self._setup_toolbars()
         self._setup_toolbars_status()
+        # Панели инструментов обращаются к стилю до того, как им задан objectName
+        for toolbar in (self.toolBar, self.toolBarStatus):
+            self.app.style_service.polish(toolbar)
         self._connect_signals()
 
-    # =============== Настройка стилей ===============
-    def _load_stylesheet(self):
-        """Загрузка стилей из файла."""
-        try:
-            # Определяем путь к файлу стилей
-            if getattr(sys, 'frozen', False):
-                # Если приложение запущено как exe
-                style_path = os.path.join(sys._MEIPASS, "resources", "styles", "MainForm.qss")
-            else:
-                # Если приложение запущено как скрипт Python
-                style_path = os.path.join(os.path.dirname(__file__), "..", "..", "resources", "styles", "MainForm.qss")
-
-            # Загружаем стили
-            with open(style_path, "r", encoding="utf-8") as f:
-                self.setStyleSheet(f.read())
-        except Exception as e:
-            print(f"Ошибка загрузки стилей: {e}")
-
     # =============== Настройка иконки ===============
     def _load_icons(self):
         """Загружает иконки для кнопок приложения.
@@ -183,13 +168,30 @@ class UiMainWindow(QtWidgets.QMainWindow):
         self.btnClear.setToolTip("Очистить таблицу")
         self.btnClear.setMaximumWidth(30)
         self.horizontalLayout_2.addWidget(self.btnClear)
+        self.btnMapTypes = QtWidgets.QPushButton(self.frame_control_table)
+        self.btnMapTypes.setText("Типы CH")
+        self.btnMapTypes.setObjectName("btnMapTypes")
+        self.btnMapTypes.setCursor(Qt.PointingHandCursor)
+        self.btnMapTypes.setToolTip("Заполнить типы ClickHouse по типам источника")
+        self.horizontalLayout_2.addWidget(self.btnMapTypes)
         spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
         self.horizontalLayout_2.addItem(spacerItem)
+        self.fields_filter = FieldsFilterWidget(self.frame_control_table)
+        self.fields_filter.setObjectName("fields_filter")
+        self.horizontalLayout_2.addWidget(self.fields_filter)
         self.verticalLayout_2.addWidget(self.frame_control_table)
 
-        self.table_fields = QtWidgets.QTableWidget(self.frame_content_right)
+        self.table_fields = QtWidgets.QTableView(self.frame_content_right)
         self.table_fields.setAutoFillBackground(False)
-        self.table_fields.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table_fields.setEditTriggers(
+            QtWidgets.QAbstractItemView.CurrentChanged
+            | QtWidgets.QAbstractItemView.SelectedClicked
+            | QtWidgets.QAbstractItemView.DoubleClicked
+            | QtWidgets.QAbstractItemView.EditKeyPressed
+            | QtWidgets.QAbstractItemView.AnyKeyPressed
+        )
+        self.table_fields.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.table_fields.setMouseTracking(True)
         self.table_fields.setAlternatingRowColors(True)
         self.table_fields.setObjectName("table_fields")
 
@@ -294,6 +296,26 @@ class UiMainWindow(QtWidgets.QMainWindow):
         self.action_view = QtWidgets.QAction(self.icons["search"], "Просмотр", self)
         self.toolBar.addAction(self.action_view)
 
+        self.action_catalog = QtWidgets.QAction("Каталог", self)
+        self.action_catalog.setToolTip("Поиск сохраненных конфигураций")
+        self.toolBar.addAction(self.action_catalog)
+
+        self.action_undo = QtWidgets.QAction("Отменить", self)
+        self.action_undo.setShortcut(QtGui.QKeySequence.Undo)
+        self.action_undo.setToolTip("Отменить изменение (Ctrl+Z)")
+        self.action_undo.setEnabled(False)
+        self.toolBar.addAction(self.action_undo)
+
+        self.action_redo = QtWidgets.QAction("Повторить", self)
+        self.action_redo.setShortcut(QtGui.QKeySequence.Redo)
+        self.action_redo.setToolTip("Повторить изменение (Ctrl+Y)")
+        self.action_redo.setEnabled(False)
+        self.toolBar.addAction(self.action_redo)
+
+        self.action_clear_query_cache = QtWidgets.QAction(self.icons["clear"], "Сбросить кэш SQL", self)
+        self.action_clear_query_cache.setToolTip("Очистить кэш результатов SQL скриптов")
+        self.toolBar.addAction(self.action_clear_query_cache)
+
         # self.toolBar.addSeparator()
 
         # self.toolBar.addWidget(QtWidgets.QLabel("Git"))
@@ -317,6 +339,10 @@ class UiMainWindow(QtWidgets.QMainWindow):
         self.toolBar.widgetForAction(self.action_save).setCursor(Qt.PointingHandCursor)
         self.toolBar.widgetForAction(self.action_load).setCursor(Qt.PointingHandCursor)
         self.toolBar.widgetForAction(self.action_view).setCursor(Qt.PointingHandCursor)
+        self.toolBar.widgetForAction(self.action_catalog).setCursor(Qt.PointingHandCursor)
+        self.toolBar.widgetForAction(self.action_undo).setCursor(Qt.PointingHandCursor)
+        self.toolBar.widgetForAction(self.action_redo).setCursor(Qt.PointingHandCursor)
+        self.toolBar.widgetForAction(self.action_clear_query_cache).setCursor(Qt.PointingHandCursor)
         self.toolBar.widgetForAction(self.action_git).setCursor(Qt.PointingHandCursor)
         self.toolBar.widgetForAction(self.action_settings).setCursor(Qt.PointingHandCursor)
         self.toolBar.widgetForAction(self.action_load_table).setCursor(Qt.PointingHandCursor)
@@ -351,10 +377,15 @@ class UiMainWindow(QtWidgets.QMainWindow):
         """Подключает сигналы для всех виджетов."""
         self.btnAdd.clicked.connect(self._event_btn_clicked_add_field_table)
         self.btnClear.clicked.connect(self._event_btn_clicked_clear_fields_table)
+        self.btnMapTypes.clicked.connect(self._event_btn_clicked_map_types_fields_table)
 
         self.action_save.triggered.connect(self._event_btn_clicked_save_fields_table)
         self.action_load.triggered.connect(self._event_btn_clicked_load_fields_table)
         self.action_view.triggered.connect(self._event_btn_clicked_view_fields_table)
+        self.action_catalog.triggered.connect(self._event_btn_clicked_open_config_catalog)
+        self.action_undo.triggered.connect(self._event_btn_clicked_undo)
+        self.action_redo.triggered.connect(self._event_btn_clicked_redo)
+        self.action_clear_query_cache.triggered.connect(self._event_btn_clicked_clear_query_cache)
         self.action_git.triggered.connect(self._event_btn_clicked_open_git_form)
         self.action_settings.triggered.connect(self._event_btn_clicked_settings_fields)
         self.action_connect_pg.triggered.connect(self._event_btn_clicked_open_connection_pg_form)
@@ -371,6 +402,10 @@ class UiMainWindow(QtWidgets.QMainWindow):
         """Обработчик события нажатия на кнопку очистки полей."""
         pass
 
+    def _event_btn_clicked_open_config_catalog(self):
+        """Обработчик события нажатия на кнопку каталога конфигураций."""
+        pass
+
     def _event_btn_clicked_save_fields_table(self):
         """Обработчик события нажатия на кнопку сохранения полей."""
         pass
@@ -383,6 +418,10 @@ class UiMainWindow(QtWidgets.QMainWindow):
         """Обработчик события нажатия на кнопку просмотра полей."""
         pass
 
+    def _event_btn_clicked_clear_query_cache(self):
+        """Обработчик события нажатия на кнопку очистки кэша SQL скриптов."""
+        pass
+
     def _event_btn_clicked_open_git_form(self):
         """Обработчик события нажатия на кнопку git."""
         pass
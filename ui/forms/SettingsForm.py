@@ -16,7 +16,6 @@ class SettingsForm(QDialog):
 
         self.setWindowTitle("Настройки")
         self._setup_ui()
-        self._load_styles()
 
 
     def _setup_ui(self):
@@ -86,21 +85,6 @@ class SettingsForm(QDialog):
         # Добавляем виджеты на страницы
         self._add_widgets_to_pages()
 
-
-
-    def _load_styles(self):
-        """Загрузка стилей из файла QSS"""
-        style_path = self.app.file_service.get_settings_form_stylesheet()
-        try:
-            with open(style_path, "r", encoding='utf-8') as f:
-                self.stylesheet = f.read()
-            self.setStyleSheet(self.stylesheet)
-        except Exception as e:
-            self.logger.error(f"Ошибка загрузки стилей: {e}")
-            self.logger.error(f"Путь к файлу стилей: {style_path}")
-            self.logger.error(f"Текущая директория: {os.getcwd()}")
-            self.logger.error(f"MEIPASS: {getattr(sys, '_MEIPASS', 'Не установлен')}")
-
     def exec_(self):
         """Переопределяем метод exec_ для модального окна"""
         self.resize(800, 600)
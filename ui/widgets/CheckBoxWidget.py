@@ -1,8 +1,7 @@
-import os
-import sys
 from pathlib import Path
 from PyQt5 import QtCore, QtGui, QtWidgets
 
+from services.style_service import StyleService
 from ui.widgets.PopoverWidget import PopoverWidget
 
 
@@ -43,25 +42,13 @@ class CheckBoxWidget(QtWidgets.QWidget):
         self.checkBox.stateChanged.connect(self._on_value_changed)
 
     def _load_stylesheet(self):
-        """Загружает и применяет стили для виджетов из QSS файла.
+        """Отмечает элементы, к которым относятся стили CheckBoxWidget.qss.
 
-        Стили загружаются из файла CheckBoxWidget.qss в директории resources/styles.
-        Применяются к кнопке помощи и флажку.
+        Стили загружаются один раз и применяются на уровне приложения (StyleService),
+        виджет только указывает, что они относятся к кнопке помощи и флажку.
         """
-        style_path = self.app.file_service.get_stylesheet_path("CheckBoxWidget.qss")
-
-        try:
-            with open(style_path, "r", encoding='utf-8') as f:
-                self.stylesheet = f.read()
-
-            self.btnHelp.setStyleSheet(self.stylesheet)
-            self.checkBox.setStyleSheet(self.stylesheet)
-        except Exception as e:
-            self.logger.error(f"Ошибка загрузки стилей: {e}")
-            self.logger.error(f"Путь к файлу стилей: {style_path}")
-            self.logger.error(f"Текущая директория: {os.getcwd()}")
-            self.logger.error(f"MEIPASS: {getattr(sys, '_MEIPASS', 'Не установлен')}")
-
+        self.setObjectName("check_box_widget")
+        StyleService.set_scope([self.btnHelp, self.checkBox], "CheckBoxWidget.qss")
 
     def _setup_ui(self):
         """Создает и настраивает элементы пользовательского интерфейса.
@@ -0,0 +1,140 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from PyQt5 import QtCore, QtWidgets
+
+from services.config_index_service import ConfigIndexService
+
+
+class ConfigCatalogWidget(QtWidgets.QWidget):
+    """Поиск сохраненных конфигураций по каталогу ConfigIndexService.
+
+    Результаты обновляются при вводе запроса, двойной щелчок или Enter открывает конфигурацию.
+    Пока каталог обновляется в фоновом потоке, поиск идет по прежнему состоянию каталога,
+    а под таблицей показывается прогресс обновления.
+    """
+
+    # Сигнал выбора конфигурации (путь к файлу)
+    config_selected = QtCore.pyqtSignal(str)
+
+    # Колонки результатов: (ключ записи каталога, заголовок)
+    COLUMNS = (
+        ("object_name", "Объект"),
+        ("source_system", "Система-источник"),
+        ("endpoint", "Endpoint"),
+        ("domain", "Домен"),
+        ("name", "Файл"),
+        ("mtime_ns", "Изменен"),
+    )
+
+    def __init__(self, index_service: ConfigIndexService, parent=None):
+        """Инициализирует поиск конфигураций.
+
+        Args:
+            index_service: Каталог сохраненных конфигураций
+            parent: Родительский виджет
+        """
+        super().__init__(parent)
+        self.index_service = index_service
+        self._records: List[Dict[str, Any]] = []
+        self._found = 0
+        self._setup_ui()
+
+        self.line_edit.textChanged.connect(self.search)
+        self.line_edit.returnPressed.connect(self._on_return_pressed)
+        self.table.doubleClicked.connect(self._on_double_clicked)
+        self._progress_text = ""
+        self.search()
+
+    def _setup_ui(self):
+        """Настройка пользовательского интерфейса"""
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(5, 5, 5, 5)
+        layout.setSpacing(5)
+
+        self.line_edit = QtWidgets.QLineEdit(self)
+        self.line_edit.setObjectName("config_catalog_search")
+        self.line_edit.setPlaceholderText("Объект, система-источник, endpoint, домен (domain:значение - точное совпадение)")
+        self.line_edit.setClearButtonEnabled(True)
+        layout.addWidget(self.line_edit)
+
+        self.table = QtWidgets.QTableWidget(0, len(self.COLUMNS), self)
+        self.table.setObjectName("config_catalog_table")
+        self.table.setHorizontalHeaderLabels([title for _, title in self.COLUMNS])
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Interactive)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        self.label_count = QtWidgets.QLabel(self)
+        layout.addWidget(self.label_count)
+
+    def search(self, *args):
+        """Обновляет результаты по тексту запроса."""
+        text = self.line_edit.text()
+        self._records = self.index_service.search(text)
+        # Результаты ограничены лимитом поиска, количество найденных считается отдельно
+        self._found = len(self._records)
+        if self._found >= self.index_service.SEARCH_LIMIT:
+            self._found = self.index_service.count(text)
+        self.table.setUpdatesEnabled(False)
+        try:
+            self.table.setRowCount(len(self._records))
+            for row, record in enumerate(self._records):
+                for col, (key, _) in enumerate(self.COLUMNS):
+                    value = record.get(key, "")
+                    if key == "mtime_ns":
+                        value = datetime.fromtimestamp(value / 1e9).strftime("%Y-%m-%d %H:%M")
+                    item = QtWidgets.QTableWidgetItem(str(value))
+                    item.setToolTip(record["path"])
+                    self.table.setItem(row, col, item)
+        finally:
+            self.table.setUpdatesEnabled(True)
+        if self._records:
+            self.table.selectRow(0)
+        self._update_label()
+
+    def _update_label(self):
+        text = f"Найдено: {self._found} из {self.index_service.count()}"
+        if self._found > len(self._records):
+            text += f" (показаны первые {len(self._records)})"
+        self.label_count.setText(f"{text}    {self._progress_text}" if self._progress_text else text)
+
+    def set_progress(self, done: int, total: int):
+        """Показывает прогресс обновления каталога."""
+        self._progress_text = f"Обновление каталога: {done} из {total}" if total else "Обновление каталога..."
+        self._update_label()
+
+    def on_rescan_finished(self, updated: int, removed: int):
+        """Обновляет результаты после обновления каталога."""
+        self._progress_text = ""
+        selected = self.get_selected_path()
+        self.search()
+        for row, record in enumerate(self._records):
+            if record["path"] == selected:
+                self.table.selectRow(row)
+                break
+
+    def on_rescan_error(self, message: str):
+        """Показывает ошибку обновления каталога."""
+        self._progress_text = "Каталог не обновлен"
+        self._update_label()
+
+    def get_selected_path(self) -> Optional[str]:
+        """Возвращает путь к выбранной конфигурации."""
+        row = self.table.currentRow()
+        if 0 <= row < len(self._records):
+            return self._records[row]["path"]
+        return None
+
+    def _on_return_pressed(self):
+        path = self.get_selected_path()
+        if path:
+            self.config_selected.emit(path)
+
+    def _on_double_clicked(self, index: QtCore.QModelIndex):
+        if 0 <= index.row() < len(self._records):
+            self.config_selected.emit(self._records[index.row()]["path"])
@@ -0,0 +1,83 @@
+from typing import Dict, Sequence
+
+from PyQt5 import QtCore, QtWidgets
+
+
+class FieldsFilterWidget(QtWidgets.QWidget):
+    """Строка фильтра таблицы полей: поиск по тексту и отбор по значению колонки выбора.
+
+    Текст ищется по вхождению без учета регистра, текст, начинающийся с "^", - по началу значения.
+    """
+
+    # Сигнал изменения фильтра (текст, поиск по началу значения, значения колонок выбора по ключам)
+    filter_changed = QtCore.pyqtSignal(str, bool, dict)
+
+    PREFIX_MARK = "^"
+
+    def __init__(self, parent=None):
+        """Инициализирует строку фильтра.
+
+        Args:
+            parent: Родительский виджет
+        """
+        super().__init__(parent)
+        self._setup_ui()
+
+        self.line_edit.textChanged.connect(self._on_filter_changed)
+        self.combo_box.currentIndexChanged.connect(self._on_filter_changed)
+
+    def _setup_ui(self):
+        """Настройка пользовательского интерфейса"""
+        layout = QtWidgets.QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(5)
+
+        self.line_edit = QtWidgets.QLineEdit(self)
+        self.line_edit.setObjectName("fields_filter_text")
+        self.line_edit.setPlaceholderText("Поиск поля (^ - по началу имени)")
+        self.line_edit.setClearButtonEnabled(True)
+        self.line_edit.setMinimumWidth(220)
+        layout.addWidget(self.line_edit)
+
+        self.combo_box = QtWidgets.QComboBox(self)
+        self.combo_box.setObjectName("fields_filter_select")
+        self.combo_box.setMinimumWidth(150)
+        self.combo_box.setToolTip("Отбор по значению колонки")
+        layout.addWidget(self.combo_box)
+
+    def set_columns(self, columns: Sequence[dict]):
+        """Заполняет список отбора значениями колонок выбора.
+
+        Args:
+            columns: Настройки колонок таблицы (key, name, type, value)
+        """
+        self.combo_box.blockSignals(True)
+        self.combo_box.clear()
+        self.combo_box.addItem("Все", None)
+        for column in columns:
+            if column['type'] != 'select' or not column.get('value'):
+                continue
+            self.combo_box.insertSeparator(self.combo_box.count())
+            for value in column['value']:
+                self.combo_box.addItem(f"{column['name']}: {value}", (column['key'], str(value)))
+        self.combo_box.blockSignals(False)
+
+    def get_filter(self) -> tuple:
+        """Возвращает текущий фильтр (текст, поиск по началу значения, значения колонок выбора)."""
+        text = self.line_edit.text().strip()
+        prefix = text.startswith(self.PREFIX_MARK)
+        if prefix:
+            text = text[len(self.PREFIX_MARK):]
+        selects: Dict[str, str] = {}
+        data = self.combo_box.currentData()
+        if data:
+            selects[data[0]] = data[1]
+        return text, prefix, selects
+
+    def clear(self):
+        """Сбрасывает фильтр."""
+        self.line_edit.clear()
+        self.combo_box.setCurrentIndex(0)
+
+    def _on_filter_changed(self, *args):
+        self.filter_changed.emit(*self.get_filter())
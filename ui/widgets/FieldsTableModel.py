@@ -0,0 +1,640 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from services.fields_index_service import FieldsIndexService
+from services.fields_store_service import FieldsStoreService
+
+
+class FieldsTableModel(QtCore.QAbstractTableModel):
+    """Модель таблицы полей. Строки хранятся в FieldsStoreService под стабильными идентификаторами.
+
+    Изменения не публикуются сразу: модель запоминает измененные строки и колонки
+    и в пределах одного кадра отправляет одно уведомление values_changed.
+    """
+
+    # Сигнал изменения данных таблицы: {"rows": [номера строк], "keys": [ключи колонок], "structure": bool}.
+    # structure - строки добавлялись, удалялись или заменялись, номера строк в этом случае не передаются
+    values_changed = QtCore.pyqtSignal(dict)
+
+    # Фон ячейки, не прошедшей проверку
+    ERROR_BACKGROUND = QtGui.QColor(255, 222, 222)
+
+    def __init__(self, columns: Sequence[dict] = (), parent=None, sync_interval: int = 16):
+        """Инициализирует модель таблицы полей.
+
+        Args:
+            columns: Настройки колонок (key, name, type, value)
+            parent: Родительский объект
+            sync_interval: Интервал объединения изменений перед уведомлением (мс)
+        """
+        super().__init__(parent)
+        self.columns = tuple(columns)
+        self.value_columns = tuple(column for column in self.columns if column['type'] != 'action')
+        self.store = FieldsStoreService(columns=self.value_columns)
+
+        self._dirty_rows: Set[int] = set()
+        self._dirty_keys: Set[str] = set()
+        self._dirty_structure = False
+        # Ошибки проверки ячеек: ключ колонки -> {идентификатор строки: текст ошибки}
+        self._errors: Dict[str, Dict[int, str]] = {}
+        self._sync_timer = QtCore.QTimer(self)
+        self._sync_timer.setSingleShot(True)
+        self._sync_timer.setInterval(sync_interval)
+        self._sync_timer.timeout.connect(self.flush)
+
+    # =============== Отслеживание изменений ===============
+    @property
+    def is_dirty(self) -> bool:
+        """Признак изменений, о которых еще не отправлено уведомление."""
+        return self._dirty_structure or bool(self._dirty_rows)
+
+    def _mark_dirty(self, row: int = None, key: str = None, structure: bool = False, rows: Iterable[int] = None) -> None:
+        """Запоминает изменение и откладывает уведомление до конца кадра."""
+        if structure:
+            self._dirty_structure = True
+            self._dirty_rows.clear()
+        elif not self._dirty_structure:
+            if row is not None:
+                self._dirty_rows.add(row)
+            if rows is not None:
+                self._dirty_rows.update(rows)
+        if key is not None:
+            self._dirty_keys.add(key)
+        if not self._sync_timer.isActive():
+            self._sync_timer.start()
+
+    def flush(self) -> None:
+        """Отправляет накопленные изменения одним уведомлением."""
+        self._sync_timer.stop()
+        if not self.is_dirty:
+            return
+        changes = {
+            "rows": sorted(self._dirty_rows),
+            "keys": sorted(self._dirty_keys) if not self._dirty_structure else self.get_value_keys(),
+            "structure": self._dirty_structure,
+        }
+        self._dirty_rows = set()
+        self._dirty_keys = set()
+        self._dirty_structure = False
+        self.values_changed.emit(changes)
+
+    @property
+    def rows(self) -> List[Dict[str, Any]]:
+        """Значения строк по ключам колонок в порядке отображения."""
+        return self.store.records()
+
+    def get_row_id(self, row: int) -> int:
+        """Возвращает стабильный идентификатор строки по ее номеру."""
+        return self.store.id_at(row)
+
+    def get_row(self, row_id: int) -> int:
+        """Возвращает текущий номер строки по идентификатору."""
+        return self.store.position(row_id)
+
+    # =============== Колонки ===============
+    def get_column(self, col: int) -> dict:
+        """Возвращает настройки колонки по номеру."""
+        return self.columns[col]
+
+    def get_value_keys(self) -> List[str]:
+        """Возвращает ключи колонок, значения которых хранятся в строках."""
+        return [column['key'] for column in self.value_columns]
+
+    @staticmethod
+    def normalize_value(column: dict, value: Any) -> Any:
+        """Приводит значение к типу колонки.
+
+        Args:
+            column: Настройки колонки
+            value: Значение
+
+        Returns:
+            Any: Значение, приведенное к типу колонки
+        """
+        if column['type'] == 'boolean':
+            return bool(value)
+        if column['type'] == 'number':
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return 0
+        if value is None:
+            return ""
+        return str(value)
+
+    def create_row(self, data_value: dict = None) -> Dict[str, Any]:
+        """Создает строку со значениями по умолчанию и заполняет ее переданными значениями.
+
+        Args:
+            data_value: Значения строки по ключам колонок
+
+        Returns:
+            Dict[str, Any]: Строка таблицы
+        """
+        row = {}
+        for column in self.value_columns:
+            if data_value and column['key'] in data_value:
+                row[column['key']] = self.normalize_value(column, data_value[column['key']])
+            else:
+                row[column['key']] = ""
+        return row
+
+    def create_row_from_values(self, keys: Sequence[str], values: Sequence[Any]) -> Dict[str, Any]:
+        """Создает строку из значений, перечисленных в порядке ключей.
+
+        Args:
+            keys: Ключи колонок, соответствующие значениям
+            values: Значения строки (например, строка результата SQL запроса)
+
+        Returns:
+            Dict[str, Any]: Строка таблицы
+        """
+        return self.create_row(data_value=dict(zip(keys, values)))
+
+    # =============== Интерфейс модели ===============
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.store)
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.columns)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+
+        column = self.columns[index.column()]
+        if column['type'] == 'action':
+            if role == QtCore.Qt.ToolTipRole:
+                return "Удалить строку"
+            return None
+
+        row_id = self.store.id_at(index.row())
+        if role in (QtCore.Qt.BackgroundRole, QtCore.Qt.ToolTipRole):
+            message = self._errors.get(column['key'], {}).get(row_id)
+            if message is None:
+                return None
+            return self.ERROR_BACKGROUND if role == QtCore.Qt.BackgroundRole else message
+
+        value = self.store.get_value(row_id, column['key'])
+        if role == QtCore.Qt.EditRole:
+            return value
+        if role == QtCore.Qt.DisplayRole:
+            if column['type'] == 'boolean':
+                return None
+            return "" if value is None else str(value)
+        if role == QtCore.Qt.TextAlignmentRole and column['type'] == 'number':
+            return int(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+        return None
+
+    def setData(self, index: QtCore.QModelIndex, value: Any, role: int = QtCore.Qt.EditRole) -> bool:
+        if not index.isValid() or role != QtCore.Qt.EditRole:
+            return False
+
+        column = self.columns[index.column()]
+        if column['type'] == 'action':
+            return False
+
+        value = self.normalize_value(column, value)
+        row_id = self.store.id_at(index.row())
+        if self.store.get_value(row_id, column['key']) == value:
+            return False
+
+        self.store.set_value(row_id, column['key'], value)
+        self.dataChanged.emit(index, index, [QtCore.Qt.DisplayRole, QtCore.Qt.EditRole])
+        self._mark_dirty(row=index.row(), key=column['key'])
+        return True
+
+    def flags(self, index: QtCore.QModelIndex) -> QtCore.Qt.ItemFlags:
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        flags = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+        if self.columns[index.column()]['type'] in ('text', 'select', 'number'):
+            flags |= QtCore.Qt.ItemIsEditable
+        return flags
+
+    def headerData(self, section: int, orientation: QtCore.Qt.Orientation, role: int = QtCore.Qt.DisplayRole) -> Any:
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Horizontal:
+            return self.columns[section]['name'] if section < len(self.columns) else None
+        return section + 1
+
+    def set_columns_values(self, values: Dict[str, Sequence[Any]]) -> None:
+        """Заменяет значения колонок во всех строках одной операцией.
+
+        Args:
+            values: Значения колонок в порядке строк по ключам колонок
+        """
+        keys = [key for key in values if key in self.store.columns]
+        if not keys or not len(self.store):
+            return
+        for key in keys:
+            self.store.set_column(key, values[key])
+        positions = [col for col, column in enumerate(self.columns) if column['key'] in keys]
+        self.dataChanged.emit(self.index(0, min(positions)), self.index(len(self.store) - 1, max(positions)))
+        for key in keys:
+            self._mark_dirty(key=key, rows=range(len(self.store)))
+
+    # =============== Ошибки проверки ===============
+    def set_errors(self, key: str, row_ids: Sequence[int], message: str = "") -> None:
+        """Заменяет ошибки проверки колонки. Ячейки с ошибкой выделяются фоном, текст ошибки - в подсказке.
+
+        Args:
+            key: Ключ колонки
+            row_ids: Идентификаторы строк с ошибкой
+            message: Текст ошибки
+        """
+        previous = self._errors.pop(key, None)
+        if len(row_ids):
+            self._errors[key] = dict.fromkeys(row_ids, message)
+        elif not previous:
+            return
+        col = next((col for col, column in enumerate(self.columns) if column['key'] == key), None)
+        if col is not None and len(self.store):
+            self.dataChanged.emit(self.index(0, col), self.index(len(self.store) - 1, col),
+                                  [QtCore.Qt.BackgroundRole, QtCore.Qt.ToolTipRole])
+
+    # =============== Изменение строк ===============
+    def set_rows(self, rows: Sequence[dict]) -> None:
+        """Заменяет все строки таблицы.
+
+        Args:
+            rows: Значения строк по ключам колонок
+        """
+        self.beginResetModel()
+        self.store.clear()
+        self.store.append(self.create_row(data_value=row) for row in rows)
+        self.endResetModel()
+        self._mark_dirty(structure=True)
+
+    def append_row(self, data_value: dict = None) -> int:
+        """Добавляет строку в конец таблицы.
+
+        Args:
+            data_value: Значения строки по ключам колонок
+
+        Returns:
+            int: Номер добавленной строки
+        """
+        self.append_rows([data_value or {}])
+        return len(self.store) - 1
+
+    def append_rows(self, rows: Sequence[dict]) -> None:
+        """Добавляет строки в конец таблицы одной операцией.
+
+        Args:
+            rows: Значения строк по ключам колонок
+        """
+        self.append_prepared_rows([self.create_row(data_value=row) for row in rows])
+
+    def append_prepared_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Добавляет строки, уже созданные create_row, одной операцией вставки.
+
+        Args:
+            rows: Строки таблицы
+        """
+        if not rows:
+            return
+        first = len(self.store)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(rows) - 1)
+        self.store.append(rows)
+        self.endInsertRows()
+        self._mark_dirty(structure=True)
+
+    def remove_row(self, row: int) -> None:
+        """Удаляет строку таблицы.
+
+        Args:
+            row: Номер строки
+        """
+        self.remove_rows([row])
+
+    def remove_rows(self, rows: Iterable[int]) -> None:
+        """Удаляет несколько строк таблицы. Хранилище обновляется один раз на всю пачку.
+
+        Args:
+            rows: Номера строк
+        """
+        rows = sorted({row for row in rows if 0 <= row < len(self.store)}, reverse=True)
+        if not rows:
+            return
+
+        row_ids = [self.store.id_at(row) for row in rows]
+
+        if rows[0] - rows[-1] + 1 == len(rows):
+            # Один непрерывный диапазон строк
+            self.beginRemoveRows(QtCore.QModelIndex(), rows[-1], rows[0])
+            self.store.remove(row_ids)
+            self.endRemoveRows()
+        else:
+            # Разрозненные строки удаляются одним проходом по хранилищу со сбросом модели
+            self.beginResetModel()
+            self.store.remove(row_ids)
+            self.endResetModel()
+        self._mark_dirty(structure=True)
+
+    def move_row(self, row: int, destination: int) -> bool:
+        """Перемещает строку на новую позицию.
+
+        Args:
+            row: Номер строки
+            destination: Номер строки после перемещения
+
+        Returns:
+            bool: Строка перемещена
+        """
+        count = len(self.store)
+        if not (0 <= row < count and 0 <= destination < count) or row == destination:
+            return False
+        # Для beginMoveRows позиция указывается до удаления строки из старого места
+        target = destination + 1 if destination > row else destination
+        if not self.beginMoveRows(QtCore.QModelIndex(), row, row, QtCore.QModelIndex(), target):
+            return False
+        self.store.move(self.store.id_at(row), destination)
+        self.endMoveRows()
+        self._mark_dirty(structure=True)
+        return True
+
+    def clear(self) -> None:
+        """Удаляет все строки таблицы."""
+        self.set_rows([])
+
+
+class FieldsFilterProxyModel(QtCore.QAbstractProxyModel):
+    """Отфильтрованное представление таблицы полей.
+
+    Подходящие строки определяются поисковым индексом FieldsIndexService одним вызовом,
+    прокси хранит только массив номеров строк модели. Без фильтра строки отображаются
+    один к одному, и вставка, удаление и перемещение строк передаются представлению как есть.
+    """
+
+    def __init__(self, parent=None):
+        """Инициализирует прокси-модель фильтра.
+
+        Args:
+            parent: Родительский объект
+        """
+        super().__init__(parent)
+        self.index_service: Optional[FieldsIndexService] = None
+        self.filter_text = ""
+        self.filter_prefix = False
+        self.filter_selects: Dict[str, str] = {}
+
+        # Номера строк модели, подходящих под фильтр (None - фильтр не задан)
+        self._rows: Optional[np.ndarray] = None
+
+    @property
+    def is_filtered(self) -> bool:
+        """Признак заданного фильтра."""
+        return self._rows is not None
+
+    # =============== Фильтр ===============
+    def set_filter(self, text: str = "", prefix: bool = False, selects: Dict[str, str] = None) -> None:
+        """Устанавливает фильтр строк.
+
+        Args:
+            text: Текст для поиска по текстовым колонкам
+            prefix: Искать текст только в начале значения
+            selects: Значения колонок выбора по ключам
+        """
+        self.filter_text = text
+        self.filter_prefix = prefix
+        self.filter_selects = dict(selects or {})
+        self.beginResetModel()
+        self._apply_filter()
+        self.endResetModel()
+
+    def _apply_filter(self) -> None:
+        """Пересчитывает строки, подходящие под фильтр."""
+        if self.index_service is None:
+            self._rows = None
+            return
+        self._rows = self.index_service.filter(
+            text=self.filter_text,
+            prefix=self.filter_prefix,
+            selects=self.filter_selects,
+        )
+
+    # =============== Модель-источник ===============
+    def setSourceModel(self, model: FieldsTableModel) -> None:
+        self.beginResetModel()
+        super().setSourceModel(model)
+        self.index_service = FieldsIndexService(model.store)
+        model.dataChanged.connect(self._on_source_data_changed)
+        model.rowsAboutToBeInserted.connect(self._on_source_rows_about_to_be_inserted)
+        model.rowsInserted.connect(self._on_source_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self._on_source_rows_about_to_be_removed)
+        model.rowsRemoved.connect(self._on_source_rows_removed)
+        model.rowsAboutToBeMoved.connect(self._on_source_rows_about_to_be_moved)
+        model.rowsMoved.connect(self._on_source_rows_moved)
+        model.modelAboutToBeReset.connect(self._on_source_about_to_be_reset)
+        model.modelReset.connect(self._on_source_reset)
+        self._apply_filter()
+        self.endResetModel()
+
+    def _on_source_data_changed(self, top_left: QtCore.QModelIndex, bottom_right: QtCore.QModelIndex, roles=()) -> None:
+        model = self.sourceModel()
+        keys = [model.get_column(col)['key'] for col in range(top_left.column(), bottom_right.column() + 1)]
+        # Изменение только оформления ячеек (ошибки проверки) не затрагивает поисковый индекс
+        values_changed = not roles or QtCore.Qt.DisplayRole in roles or QtCore.Qt.EditRole in roles
+        if values_changed and any(key in self.index_service.keys for key in keys):
+            self.index_service.update(
+                [model.get_row_id(row) for row in range(top_left.row(), bottom_right.row() + 1)],
+                keys=keys,
+            )
+        # Измененная строка остается в выборке до смены фильтра, чтобы не исчезать во время ввода
+        if self._rows is None:
+            first, last = top_left.row(), bottom_right.row()
+        else:
+            # Строки выборки, попадающие в диапазон измененных строк, - одним уведомлением
+            first = int(np.searchsorted(self._rows, top_left.row(), side='left'))
+            last = int(np.searchsorted(self._rows, bottom_right.row(), side='right')) - 1
+        if first <= last:
+            self.dataChanged.emit(self.index(first, top_left.column()), self.index(last, bottom_right.column()), roles)
+
+    def _on_source_rows_about_to_be_inserted(self, parent: QtCore.QModelIndex, first: int, last: int) -> None:
+        if self.is_filtered:
+            self.beginResetModel()
+        else:
+            self.beginInsertRows(QtCore.QModelIndex(), first, last)
+
+    def _on_source_rows_inserted(self, parent: QtCore.QModelIndex, first: int, last: int) -> None:
+        self.index_service.invalidate()
+        if self.is_filtered:
+            self._apply_filter()
+            self.endResetModel()
+        else:
+            self.endInsertRows()
+
+    def _on_source_rows_about_to_be_removed(self, parent: QtCore.QModelIndex, first: int, last: int) -> None:
+        if self.is_filtered:
+            self.beginResetModel()
+        else:
+            self.beginRemoveRows(QtCore.QModelIndex(), first, last)
+
+    def _on_source_rows_removed(self, parent: QtCore.QModelIndex, first: int, last: int) -> None:
+        self.index_service.invalidate()
+        if self.is_filtered:
+            self._apply_filter()
+            self.endResetModel()
+        else:
+            self.endRemoveRows()
+
+    def _on_source_rows_about_to_be_moved(self, parent: QtCore.QModelIndex, first: int, last: int,
+                                          destination: QtCore.QModelIndex, row: int) -> None:
+        if self.is_filtered:
+            self.beginResetModel()
+        else:
+            self.beginMoveRows(QtCore.QModelIndex(), first, last, QtCore.QModelIndex(), row)
+
+    def _on_source_rows_moved(self, parent: QtCore.QModelIndex, first: int, last: int,
+                              destination: QtCore.QModelIndex, row: int) -> None:
+        if self.is_filtered:
+            self._apply_filter()
+            self.endResetModel()
+        else:
+            self.endMoveRows()
+
+    def _on_source_about_to_be_reset(self) -> None:
+        self.beginResetModel()
+
+    def _on_source_reset(self) -> None:
+        self.index_service.invalidate()
+        self._apply_filter()
+        self.endResetModel()
+
+    # =============== Интерфейс модели ===============
+    def mapToSource(self, proxy_index: QtCore.QModelIndex) -> QtCore.QModelIndex:
+        if not proxy_index.isValid() or self.sourceModel() is None:
+            return QtCore.QModelIndex()
+        row = proxy_index.row() if self._rows is None else int(self._rows[proxy_index.row()])
+        return self.sourceModel().index(row, proxy_index.column())
+
+    def mapFromSource(self, source_index: QtCore.QModelIndex) -> QtCore.QModelIndex:
+        if not source_index.isValid():
+            return QtCore.QModelIndex()
+        row = source_index.row()
+        if self._rows is not None:
+            # Номера строк в выборке отсортированы по возрастанию
+            position = int(np.searchsorted(self._rows, row))
+            if position >= len(self._rows) or self._rows[position] != row:
+                return QtCore.QModelIndex()
+            row = position
+        return self.index(row, source_index.column())
+
+    def index(self, row: int, column: int, parent=QtCore.QModelIndex()) -> QtCore.QModelIndex:
+        if parent.isValid() or not (0 <= row < self.rowCount() and 0 <= column < self.columnCount()):
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index: QtCore.QModelIndex = None):
+        if index is None:
+            # Вызов без аргументов - родитель объекта QObject
+            return super(QtCore.QAbstractItemModel, self).parent()
+        return QtCore.QModelIndex()
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+        return self.sourceModel().rowCount() if self._rows is None else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+        return self.sourceModel().columnCount()
+
+    def get_source_row(self, row: int) -> int:
+        """Возвращает номер строки модели по номеру строки представления."""
+        return self.mapToSource(self.index(row, 0)).row()
+
+
+class FieldsTableLoader(QtCore.QObject):
+    """Загрузка большого количества строк в таблицу полей частями.
+    Между частями управление возвращается в цикл событий, поэтому окно не зависает."""
+
+    progress = QtCore.pyqtSignal(int, int)  # Сигнал прогресса (загружено строк, всего строк)
+    finished = QtCore.pyqtSignal(int)       # Сигнал окончания загрузки (всего строк)
+
+    def __init__(self,
+                 model: FieldsTableModel,
+                 view: QtWidgets.QAbstractItemView = None,
+                 chunk_size: int = 2000,
+                 parent=None):
+        """Инициализирует загрузчик строк.
+
+        Args:
+            model: Модель таблицы полей
+            view: Таблица, обновление которой приостанавливается на время вставки части
+            chunk_size: Количество строк в одной части
+            parent: Родительский объект
+        """
+        super().__init__(parent)
+        self.model = model
+        self.view = view
+        self.chunk_size = chunk_size
+
+        self._rows: Sequence[Any] = ()
+        self._keys: Optional[Sequence[str]] = None
+        self._position = 0
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._load_chunk)
+
+    @property
+    def is_running(self) -> bool:
+        """Признак выполняющейся загрузки."""
+        return self._timer.isActive()
+
+    def start(self, rows: Sequence[Any], keys: Sequence[str] = None, clear: bool = True) -> None:
+        """Запускает загрузку строк.
+
+        Args:
+            rows: Строки: словари по ключам колонок или последовательности значений в порядке keys
+            keys: Ключи колонок для строк-последовательностей (определяются один раз на всю загрузку)
+            clear: Очистить таблицу перед загрузкой
+        """
+        self.cancel()
+        self._rows = rows
+        self._keys = list(keys) if keys is not None else None
+        self._position = 0
+        if clear:
+            self.model.clear()
+        self._load_chunk()
+
+    def cancel(self) -> None:
+        """Останавливает загрузку. Уже загруженные строки остаются в таблице."""
+        self._timer.stop()
+        self._rows = ()
+
+    def _load_chunk(self) -> None:
+        """Загружает очередную часть строк."""
+        chunk = self._rows[self._position:self._position + self.chunk_size]
+        if self._keys is None:
+            prepared = [self.model.create_row(data_value=row) for row in chunk]
+        else:
+            prepared = [self.model.create_row_from_values(self._keys, values) for values in chunk]
+
+        if self.view is not None:
+            self.view.setUpdatesEnabled(False)
+        try:
+            self.model.append_prepared_rows(prepared)
+        finally:
+            if self.view is not None:
+                self.view.setUpdatesEnabled(True)
+
+        self._position += len(chunk)
+        total = len(self._rows)
+        self.progress.emit(self._position, total)
+
+        if self._position < total:
+            self._timer.start()
+        else:
+            self._rows = ()
+            self.finished.emit(total)
@@ -34,267 +34,203 @@ class HeaderItem(QtWidgets.QTableWidgetItem):
         return 0  # Для текстового поля ширина не фиксирована
 
 
-class TextItemTableWidget(QtWidgets.QWidget):
-    def __init__(self,
-                 parent=None,
-                 column: dict = None,
-                 row: int = None,
-                 event_on_changed: callable = None): # type: ignore
-        """Инициализирует виджет текстового поля.
+class TextItemTableDelegate(QtWidgets.QStyledItemDelegate):
+    """Редактор текстовой колонки таблицы полей."""
+
+    def __init__(self, parent=None, column: dict = None):
+        """Инициализирует делегат текстовой колонки.
 
         Args:
-            parent: Родительский виджет
+            parent: Родительский объект
             column: Словарь с настройками колонки
-            row: Номер строки в таблице
-            event_on_changed: Функция обратного вызова для обработки изменения текста
         """
-
         super().__init__(parent)
         self.column = column
-        self.row = row
-        self.event_on_changed = event_on_changed
-
-        self.key = column['key']
-        self.type = column['type']
-        self.value = column['value']
-
-        # Создаем layout
-        layout = QtWidgets.QHBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-
-        # Создаем текстовое поле
-        self.text_edit = QtWidgets.QLineEdit()
-        self.text_edit.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
-        self.text_edit.textChanged.connect(lambda: self.event_on_changed(self.row, self.key, self.get_value()))
-
-        layout.addWidget(self.text_edit)
-
-        # Устанавливаем стили
-        self.setStyleSheet("""
-            QLineEdit {
-                border: none;
-                background-color: white;
-                height: 100%;
-            }
-            QLineEdit:hover {
-                border: 1px solid #808080;
-            }
-        """)
-
-    def get_value(self):
-        return self.text_edit.text()
-
-    def set_value(self, value):
-        self.text_edit.setText(str(value))
-
-
-class SelectItemTableWidget(QtWidgets.QWidget):
-    def __init__(self,
-                 parent=None,
-                 column: dict = None,
-                 row: int = None,
-                 event_on_changed: callable = None): # type: ignore
-        super().__init__(parent)
-        self.column = column
-        self.row = row
-        self.event_on_changed = event_on_changed
-
-        self.key = column['key']
-        self.type = column['type']
-        self.value = column['value']
-
-        # Создаем layout
-        layout = QtWidgets.QHBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-
-        # Создаем выпадающий список
-        self.combo = QtWidgets.QComboBox()
-        self.combo.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
-        for item in self.value:
-            self.combo.addItem(item)
-
-        self.combo.currentTextChanged.connect(lambda: self.event_on_changed(self.row, self.key, self.get_value()))
-        layout.addWidget(self.combo)
-
-        # Устанавливаем стили
-        self.setStyleSheet("""
-            QComboBox {
-                border: none;
-                padding: 2px;
-                background-color: white;
-                height: 100%;
-            }
-            QComboBox:hover {
-                border: 1px solid #808080;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 20px;
-            }
-            QComboBox::down-arrow {
-                image: url(resources/icons/dropdown-arrow.png);
-                width: 12px;
-                height: 12px;
-            }
-        """)
-
-    def get_value(self):
-        return self.combo.currentText()
-
-    def set_value(self, value):
-        index = self.combo.findText(str(value))
-        if index >= 0:
-            self.combo.setCurrentIndex(index)
-        else:
-            self.combo.addItem(str(value))
-            self.combo.setCurrentIndex(self.combo.count() - 1)
 
+    def createEditor(self, parent, option, index):
+        editor = QtWidgets.QLineEdit(parent)
+        editor.setFrame(False)
+        # Значение передается в модель при вводе, модель сама объединяет частые изменения
+        editor.textEdited.connect(lambda: self.commitData.emit(editor))
+        return editor
 
-class BooleanItemTableWidget(QtWidgets.QWidget):
-    def __init__(self,
-                 parent=None,
-                 column: dict = None,
-                 row: int = None,
-                 event_on_changed: callable = None): # type: ignore
-        super().__init__(parent)
-        self.column = column
-        self.row = row
-        self.event_on_changed = event_on_changed
-
-        self.key = column['key']
-        self.type = column['type']
-        self.value = column['value']
-
-        # Создаем layout
-        layout = QtWidgets.QHBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setAlignment(QtCore.Qt.AlignCenter)
-
-        # Создаем чекбокс
-        self.checkbox = QtWidgets.QCheckBox()
-        self.checkbox.setSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
-        self.checkbox.stateChanged.connect(lambda: self.event_on_changed(self.row, self.key, self.get_value()))
-        layout.addWidget(self.checkbox)
-
-        # Устанавливаем стили
-        self.setStyleSheet("""
-            QCheckBox {
-                spacing: 5px;
-                height: 100%;
-            }
-            QCheckBox::indicator {
-                width: 15px;
-                height: 15px;
-            }
-        """)
-
-    def get_value(self):
-        return self.checkbox.isChecked()
-
-    def set_value(self, value):
-        self.checkbox.setChecked(bool(value))
-
-
-class NumberItemTableWidget(QtWidgets.QWidget):
-    def __init__(self,
-                 parent=None,
-                 column: dict = None,
-                 row: int = None,
-                 event_on_changed: callable = None): # type: ignore
+    def setEditorData(self, editor, index):
+        value = index.data(QtCore.Qt.EditRole)
+        editor.setText("" if value is None else str(value))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.text(), QtCore.Qt.EditRole)
+
+
+class SelectItemTableDelegate(QtWidgets.QStyledItemDelegate):
+    """Редактор колонки с выпадающим списком значений."""
+
+    def __init__(self, parent=None, column: dict = None):
+        """Инициализирует делегат колонки выбора.
+
+        Args:
+            parent: Родительский объект
+            column: Словарь с настройками колонки, column['value'] - список значений
+        """
         super().__init__(parent)
         self.column = column
-        self.row = row
-        self.event_on_changed = event_on_changed
-
-        self.key = column['key']
-        self.type = column['type']
-        self.value = column['value']
-
-        # Создаем layout
-        layout = QtWidgets.QHBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-
-        # Создаем числовое поле
-        self.spinbox = QtWidgets.QSpinBox()
-        self.spinbox.setButtonSymbols(QtWidgets.QSpinBox.NoButtons)
-        self.spinbox.setRange(-999999, 999999)
-        self.spinbox.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
-        self.spinbox.valueChanged.connect(lambda: self.event_on_changed(self.row, self.key, self.get_value()))
-        layout.addWidget(self.spinbox)
-
-        # Устанавливаем стили
-        self.setStyleSheet("""
-            QSpinBox {
-                border: none;
-                padding: 2px;
-                background-color: white;
-                height: 100%;
-            }
-            QSpinBox:hover {
-                border: 1px solid #808080;
-            }
-        """)
-
-    def get_value(self):
-        return self.spinbox.value()
-
-    def set_value(self, value):
-        self.spinbox.setValue(int(value))
-
-
-class ActionItemTableWidget(QtWidgets.QWidget):
-    def __init__(self,
-                 parent=None,
-                 column: dict = None,
-                 row: int = None,
-                 event_on_changed: callable = None): # type: ignore
+        self.values = list(column['value']) if column and column.get('value') else []
+
+    def createEditor(self, parent, option, index):
+        editor = QtWidgets.QComboBox(parent)
+        editor.addItems(self.values)
+        # Значение сохраняется сразу после выбора, без ожидания потери фокуса
+        editor.activated.connect(lambda: self._commit_and_close(editor))
+        return editor
+
+    def setEditorData(self, editor, index):
+        value = index.data(QtCore.Qt.EditRole)
+        value = "" if value is None else str(value)
+        position = editor.findText(value)
+        if position < 0 and value:
+            editor.addItem(value)
+            position = editor.count() - 1
+        editor.setCurrentIndex(position)
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), QtCore.Qt.EditRole)
+
+    def _commit_and_close(self, editor):
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor, QtWidgets.QAbstractItemDelegate.NoHint)
 
+
+class NumberItemTableDelegate(QtWidgets.QStyledItemDelegate):
+    """Редактор числовой колонки таблицы полей."""
+
+    def __init__(self, parent=None, column: dict = None):
+        """Инициализирует делегат числовой колонки.
+
+        Args:
+            parent: Родительский объект
+            column: Словарь с настройками колонки
+        """
         super().__init__(parent)
         self.column = column
-        self.row = row
-        self.event_on_changed = event_on_changed
 
-        self.key = column['key']
-        self.type = column['type']
-        self.value = column['value']
+    def createEditor(self, parent, option, index):
+        editor = QtWidgets.QSpinBox(parent)
+        editor.setButtonSymbols(QtWidgets.QSpinBox.NoButtons)
+        editor.setRange(-999999, 999999)
+        editor.setFrame(False)
+        return editor
+
+    def setEditorData(self, editor, index):
+        try:
+            editor.setValue(int(index.data(QtCore.Qt.EditRole)))
+        except (TypeError, ValueError):
+            editor.setValue(0)
 
-        # Создаем layout
-        layout = QtWidgets.QHBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setAlignment(QtCore.Qt.AlignCenter)
+    def setModelData(self, editor, model, index):
+        editor.interpretText()
+        model.setData(index, editor.value(), QtCore.Qt.EditRole)
 
-        # Создаем кнопку
-        self.button = QtWidgets.QPushButton("×")
-        self.button.setSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
-        self.button.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
-        layout.addWidget(self.button)
 
-        # Устанавливаем стили
-        self.setStyleSheet("""
-            QPushButton {
-                border: none;
-                background-color: transparent;
-                color: #666666;
-                font-size: 14px;
-                padding: 0px;
-            }
-            QPushButton:hover {
-                color: #ff0000;
-            }
-            QPushButton:pressed {
-                color: #cc0000;
-            }
-        """)
+class BooleanItemTableDelegate(QtWidgets.QStyledItemDelegate):
+    """Флажок по центру ячейки. Значение переключается щелчком или пробелом без создания редактора."""
 
-        # Подключаем сигнал
-        self.button.clicked.connect(self.event_on_changed)
+    def __init__(self, parent=None, column: dict = None):
+        """Инициализирует делегат булевой колонки.
 
+        Args:
+            parent: Родительский объект
+            column: Словарь с настройками колонки
+        """
+        super().__init__(parent)
+        self.column = column
 
-    def get_value(self):
-        return None
+    def _get_check_rect(self, option) -> QtCore.QRect:
+        """Возвращает область флажка по центру ячейки."""
+        style = option.widget.style() if option.widget else QtWidgets.QApplication.style()
+        size = style.subElementRect(QtWidgets.QStyle.SE_CheckBoxIndicator, QtWidgets.QStyleOptionButton(), option.widget).size()
+        return QtWidgets.QStyle.alignedRect(option.direction, QtCore.Qt.AlignCenter, size, option.rect)
+
+    def paint(self, painter, option, index):
+        self.initStyleOption(option, index)
+        style = option.widget.style() if option.widget else QtWidgets.QApplication.style()
+        style.drawPrimitive(QtWidgets.QStyle.PE_PanelItemViewItem, option, painter, option.widget)
+
+        check_option = QtWidgets.QStyleOptionButton()
+        check_option.rect = self._get_check_rect(option)
+        check_option.state = QtWidgets.QStyle.State_Enabled
+        check_option.state |= QtWidgets.QStyle.State_On if index.data(QtCore.Qt.EditRole) is True else QtWidgets.QStyle.State_Off
+        style.drawPrimitive(QtWidgets.QStyle.PE_IndicatorCheckBox, check_option, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QtCore.QEvent.MouseButtonRelease:
+            if event.button() != QtCore.Qt.LeftButton or not self._get_check_rect(option).contains(event.pos()):
+                return False
+        elif event.type() == QtCore.QEvent.MouseButtonDblClick:
+            return True
+        elif event.type() == QtCore.QEvent.KeyPress:
+            if event.key() != QtCore.Qt.Key_Space:
+                return False
+        else:
+            return False
+        return model.setData(index, index.data(QtCore.Qt.EditRole) is not True, QtCore.Qt.EditRole)
 
-    def set_value(self, value):
-        pass
 
+class ActionItemTableDelegate(QtWidgets.QStyledItemDelegate):
+    """Кнопка удаления строки, отрисовываемая делегатом."""
 
+    def __init__(self, parent=None, column: dict = None, event_on_clicked: callable = None): # type: ignore
+        """Инициализирует делегат колонки действий.
 
+        Args:
+            parent: Родительский объект
+            column: Словарь с настройками колонки
+            event_on_clicked: Функция обратного вызова, получает номер строки
+        """
+        super().__init__(parent)
+        self.column = column
+        self.event_on_clicked = event_on_clicked
+
+    def paint(self, painter, option, index):
+        self.initStyleOption(option, index)
+        style = option.widget.style() if option.widget else QtWidgets.QApplication.style()
+        style.drawPrimitive(QtWidgets.QStyle.PE_PanelItemViewItem, option, painter, option.widget)
+
+        painter.save()
+        font = QtGui.QFont(option.font)
+        font.setPixelSize(14)
+        painter.setFont(font)
+        hovered = bool(option.state & QtWidgets.QStyle.State_MouseOver)
+        painter.setPen(QtGui.QColor("#ff0000" if hovered else "#666666"))
+        painter.drawText(option.rect, QtCore.Qt.AlignCenter, "×")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QtCore.QEvent.MouseButtonRelease and event.button() == QtCore.Qt.LeftButton:
+            if self.event_on_clicked is not None:
+                self.event_on_clicked(index.row())
+            return True
+        return False
+
+
+def create_item_table_delegate(parent, column: dict, event_on_clicked: callable = None): # type: ignore
+    """Возвращает делегат для колонки таблицы полей по ее типу.
+
+    Args:
+        parent: Родительский объект (таблица)
+        column: Словарь с настройками колонки
+        event_on_clicked: Обработчик нажатия кнопки в колонке действий
+
+    Returns:
+        QtWidgets.QStyledItemDelegate: Делегат колонки или None
+    """
+    if column['key'] == 'action':
+        return ActionItemTableDelegate(parent, column=column, event_on_clicked=event_on_clicked)
+    if column['type'] == 'text':
+        return TextItemTableDelegate(parent, column=column)
+    if column['type'] == 'select':
+        return SelectItemTableDelegate(parent, column=column)
+    if column['type'] == 'number':
+        return NumberItemTableDelegate(parent, column=column)
+    if column['type'] == 'boolean':
+        return BooleanItemTableDelegate(parent, column=column)
+    return None
@@ -0,0 +1,181 @@
+from typing import Any, Dict, List
+
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QFrame, QLabel, QTreeWidget,
+                             QTreeWidgetItem, QHeaderView, QSizePolicy)
+from PyQt5.QtGui import QColor, QBrush, QFont
+from PyQt5.QtCore import Qt
+
+
+class SQLPlanWidget(QWidget):
+    """Просмотр плана выполнения EXPLAIN (FORMAT JSON) в виде дерева узлов"""
+
+    COLUMNS = [
+        "Узел",
+        "Время, мс",
+        "Собств. время, мс",
+        "Строки (факт)",
+        "Строки (план)",
+        "Циклы",
+        "Буферы (hit)",
+        "Буферы (read)",
+    ]
+
+    # Ключи узла плана, которые показываются в подсказке
+    DETAIL_KEYS = [
+        "Index Cond", "Recheck Cond", "Filter", "Rows Removed by Filter",
+        "Hash Cond", "Merge Cond", "Join Filter", "Sort Key", "Sort Method",
+        "Group Key", "Output",
+    ]
+
+    def __init__(self, parent=None, app=None):
+        super().__init__(parent)
+        self.app = app
+        self.logger = app.logger if app is not None else None
+        self.plan: Dict[str, Any] = {}
+
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Настройка пользовательского интерфейса"""
+        self.setObjectName("sql_plan_widget")
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        container = QFrame(self)
+        container.setObjectName("sql_plan_container")
+        container_layout = QVBoxLayout(container)
+        container_layout.setContentsMargins(5, 5, 5, 5)
+        container_layout.setSpacing(5)
+
+        # Итоговое время планирования и выполнения
+        self.summary_label = QLabel(self)
+        self.summary_label.setObjectName("sql_plan_summary")
+        container_layout.addWidget(self.summary_label)
+
+        # Дерево узлов плана
+        self.tree = QTreeWidget(self)
+        self.tree.setObjectName("sql_plan_tree")
+        self.tree.setColumnCount(len(self.COLUMNS))
+        self.tree.setHeaderLabels(self.COLUMNS)
+        self.tree.setAlternatingRowColors(True)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in range(1, len(self.COLUMNS)):
+            self.tree.header().setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        container_layout.addWidget(self.tree)
+
+        layout.addWidget(container)
+
+    def set_plan(self, plan: Dict[str, Any]):
+        """
+        Отображает план выполнения.
+
+        Args:
+            plan: Элемент результата EXPLAIN (FORMAT JSON) с ключами Plan, Planning Time, Execution Time
+        """
+        self.plan = plan
+        self.tree.clear()
+
+        summary = []
+        if "Planning Time" in plan:
+            summary.append(f"Планирование: {plan['Planning Time']:.3f} мс")
+        if "Execution Time" in plan:
+            summary.append(f"Выполнение: {plan['Execution Time']:.3f} мс")
+        self.summary_label.setText(", ".join(summary) or "План без выполнения (EXPLAIN)")
+
+        if "Plan" not in plan:
+            return
+
+        items: List[QTreeWidgetItem] = []
+        root = self._add_node(self.tree.invisibleRootItem(), plan["Plan"], items)
+        self.tree.expandAll()
+        self._highlight_slowest(items)
+        self.tree.setCurrentItem(root)
+
+    def _add_node(self, parent: QTreeWidgetItem, node: Dict[str, Any], items: List[QTreeWidgetItem]) -> QTreeWidgetItem:
+        """Добавляет узел плана и его дочерние узлы в дерево"""
+        children = node.get("Plans", [])
+        loops = node.get("Actual Loops")
+        total_time = None
+        self_time = None
+        if loops is not None and "Actual Total Time" in node:
+            # Время узла указывается на один цикл, дочерние узлы учитываются в собственном времени родителя
+            total_time = node["Actual Total Time"] * loops
+            children_time = sum(
+                child.get("Actual Total Time", 0.0) * child.get("Actual Loops", 0)
+                for child in children
+                # Узлы InitPlan/SubPlan могут не входить во время родителя
+                if child.get("Parent Relationship") not in ("InitPlan", "SubPlan")
+            )
+            self_time = max(total_time - children_time, 0.0)
+
+        item = QTreeWidgetItem(parent)
+        item.setText(0, self._get_node_title(node))
+        item.setText(1, self._format_number(total_time, 3))
+        item.setText(2, self._format_number(self_time, 3))
+        item.setText(3, self._format_number(node.get("Actual Rows") * loops if loops is not None and "Actual Rows" in node else None))
+        item.setText(4, self._format_number(node.get("Plan Rows")))
+        item.setText(5, self._format_number(loops))
+        item.setText(6, self._format_number(node.get("Shared Hit Blocks")))
+        item.setText(7, self._format_number(node.get("Shared Read Blocks")))
+        for column in range(1, len(self.COLUMNS)):
+            item.setTextAlignment(column, Qt.AlignRight | Qt.AlignVCenter)
+        item.setToolTip(0, self._get_node_details(node))
+        item.setData(0, Qt.UserRole, self_time)
+        items.append(item)
+
+        for child in children:
+            self._add_node(item, child, items)
+        return item
+
+    def _highlight_slowest(self, items: List[QTreeWidgetItem]):
+        """Выделяет узел с наибольшим собственным временем"""
+        timed = [item for item in items if item.data(0, Qt.UserRole) is not None]
+        if not timed:
+            return
+        slowest = max(timed, key=lambda item: item.data(0, Qt.UserRole))
+        font = QFont(slowest.font(0))
+        font.setBold(True)
+        for column in range(len(self.COLUMNS)):
+            slowest.setBackground(column, QBrush(QColor("#FDECEA")))
+            slowest.setFont(column, font)
+
+    @staticmethod
+    def _get_node_title(node: Dict[str, Any]) -> str:
+        """Возвращает название узла плана"""
+        title = node.get("Node Type", "")
+        if node.get("Join Type") and "Join" in title:
+            title = f"{node['Join Type']} {title}"
+        if node.get("Index Name"):
+            title += f" using {node['Index Name']}"
+        if node.get("Relation Name"):
+            relation = node["Relation Name"]
+            if node.get("Schema"):
+                relation = f"{node['Schema']}.{relation}"
+            alias = node.get("Alias")
+            title += f" on {relation}" + (f" {alias}" if alias and alias != node["Relation Name"] else "")
+        if node.get("Parent Relationship") in ("InitPlan", "SubPlan") and node.get("Subplan Name"):
+            title = f"{node['Subplan Name']}: {title}"
+        return title
+
+    def _get_node_details(self, node: Dict[str, Any]) -> str:
+        """Возвращает условия и параметры узла для подсказки"""
+        details = []
+        for key in self.DETAIL_KEYS:
+            if key in node:
+                value = node[key]
+                if isinstance(value, list):
+                    value = ", ".join(str(part) for part in value)
+                details.append(f"{key}: {value}")
+        return "\n".join(details) or node.get("Node Type", "")
+
+    @staticmethod
+    def _format_number(value: Any, digits: int = 0) -> str:
+        """Форматирует число для отображения в таблице"""
+        if value is None:
+            return ""
+        if digits:
+            return f"{value:,.{digits}f}".replace(",", " ")
+        return f"{int(value):,}".replace(",", " ")
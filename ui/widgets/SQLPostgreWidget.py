@@ -1,5 +1,3 @@
-import os
-import sys
 from PyQt5.QtWidgets import (
     QWidget,
     QVBoxLayout,
@@ -28,26 +26,9 @@ class PostgreWidget(QWidget):
         self.setObjectName("pg_widget")
 
         self._setup_ui()
-        self._load_stylesheet()
 
         self.set_data()
 
-    def _load_stylesheet(self):
-        """Загружает стили для виджета."""
-        style_path = self.app.file_service.get_stylesheet_path("SQLWidget.qss")
-
-        try:
-            with open(style_path, "r", encoding='utf-8') as f:
-                self.stylesheet = f.read()
-
-            self.setStyleSheet(self.stylesheet)
-        except Exception as e:
-            self.logger.error(f"Ошибка загрузки стилей: {e}")
-            self.logger.error(f"Путь к файлу стилей: {style_path}")
-            self.logger.error(f"Текущая директория: {os.getcwd()}")
-            self.logger.error(f"MEIPASS: {getattr(sys, '_MEIPASS', 'Не установлен')}")
-
-
     def _setup_ui(self):
         """Настройка интерфейса."""
 
@@ -1,5 +1,3 @@
-import os
-import sys
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QTextEdit, QFrame,
                              QHBoxLayout, QPushButton, QSpacerItem, QSizePolicy)
 from PyQt5.QtGui import (QSyntaxHighlighter, QTextCharFormat, QColor, QFont,
@@ -100,7 +98,7 @@ class SQLHighlighter(QSyntaxHighlighter):
 
 
 class SQLViewerScript(QWidget):
-    def __init__(self, parent=None, app=None, event_render_sql_script=None, event_run_sql_script=None):
+    def __init__(self, parent=None, app=None, event_render_sql_script=None, event_run_sql_script=None, event_report_sql_script=None, event_explain_sql_script=None):
         super().__init__(parent)
         self.app = app
         self.working_dir = app.working_dir
@@ -108,11 +106,12 @@ class SQLViewerScript(QWidget):
         self.value_render_sql_script = ""
         self.event_render_sql_script = event_render_sql_script
         self.event_run_sql_script = event_run_sql_script
+        self.event_report_sql_script = event_report_sql_script
+        self.event_explain_sql_script = event_explain_sql_script
         self.icons = {}
 
         self._load_icons()
         self._setup_ui()
-        self._load_stylesheet()
         self._connect_signals()
         self._load_data()
 
@@ -127,21 +126,9 @@ class SQLViewerScript(QWidget):
         self.icons["execute"] = QIcon()
         self.icons["execute"].addPixmap(QPixmap(":/icon_button/resources/icons/load_item.png"), QIcon.Normal, QIcon.Off)
 
-    def _load_stylesheet(self):
-        """Загрузка стилей"""
-        style_path = self.app.file_service.get_stylesheet_path("SQLWidget.qss")
-        try:
-            with open(style_path, "r", encoding='utf-8') as f:
-                self.stylesheet = f.read()
-            self.setStyleSheet(self.stylesheet)
-        except Exception as e:
-            self.logger.error(f"Ошибка загрузки стилей: {e}")
-            self.logger.error(f"Путь к файлу стилей: {style_path}")
-            self.logger.error(f"Текущая директория: {os.getcwd()}")
-            self.logger.error(f"MEIPASS: {getattr(sys, '_MEIPASS', 'Не установлен')}")
-
     def _setup_ui(self):
         """Настройка пользовательского интерфейса"""
+        self.setObjectName("sql_viewer_script")
         # Создаем основной layout
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -190,6 +177,26 @@ class SQLViewerScript(QWidget):
         self.execute_btn.setCursor(Qt.PointingHandCursor)
         toolbar_layout.addWidget(self.execute_btn)
 
+        # Кнопка выполнения с отчетом по выражениям
+        self.report_btn = QPushButton("Отчет", self)
+        self.report_btn.setObjectName("report_btn")
+        self.report_btn.setToolTip("Выполнить скрипт по выражениям с замером времени каждого")
+        self.report_btn.setIcon(self.icons["execute"])
+        self.report_btn.setIconSize(QSize(16, 16))
+        self.report_btn.setCursor(Qt.PointingHandCursor)
+        self.report_btn.setVisible(self.event_report_sql_script is not None)
+        toolbar_layout.addWidget(self.report_btn)
+
+        # Кнопка профилирования через EXPLAIN ANALYZE
+        self.explain_btn = QPushButton("Профиль", self)
+        self.explain_btn.setObjectName("explain_btn")
+        self.explain_btn.setToolTip("Показать план выполнения EXPLAIN (ANALYZE, BUFFERS)")
+        self.explain_btn.setIcon(self.icons["execute"])
+        self.explain_btn.setIconSize(QSize(16, 16))
+        self.explain_btn.setCursor(Qt.PointingHandCursor)
+        self.explain_btn.setVisible(self.event_explain_sql_script is not None)
+        toolbar_layout.addWidget(self.explain_btn)
+
         # Добавляем растягивающийся спейсер
         toolbar_layout.addItem(QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
 
@@ -250,12 +257,15 @@ class SQLViewerScript(QWidget):
 
         layout.addWidget(container)
 
-
     def _connect_signals(self):
         """Подключение сигналов"""
         self.format_btn.clicked.connect(self._format_sql)
         self.clear_btn.clicked.connect(self.clear)
         self.execute_btn.clicked.connect(lambda: self.event_run_sql_script(sql_script=self.get_text_viewer()))
+        if self.event_report_sql_script is not None:
+            self.report_btn.clicked.connect(lambda: self.event_report_sql_script(sql_script=self.get_text_viewer()))
+        if self.event_explain_sql_script is not None:
+            self.explain_btn.clicked.connect(lambda: self.event_explain_sql_script(sql_script=self.get_text_viewer()))
         self.editor.textChanged.connect(self.set_text_viewer)
 
     def _load_data(self):
@@ -1,8 +1,7 @@
-import os
-import sys
 from pathlib import Path
 from PyQt5 import QtCore, QtGui, QtWidgets
 
+from services.style_service import StyleService
 from ui.widgets.PopoverWidget import PopoverWidget
 
 
@@ -46,25 +45,13 @@ class SelectWidget(QtWidgets.QWidget):
         self.comboBox.currentTextChanged.connect(self._on_value_changed)
 
     def _load_stylesheet(self):
-        """Загружает и применяет стили для виджетов из QSS файла.
+        """Отмечает элементы, к которым относятся стили SelectWidget.qss.
 
-        Стили загружаются из файла SelectWidget.qss в директории resources/styles.
-        Применяются к кнопке помощи и выпадающему списку.
+        Стили загружаются один раз и применяются на уровне приложения (StyleService),
+        виджет только указывает, что они относятся к кнопке помощи и выпадающему списку.
         """
-        style_path = self.app.file_service.get_stylesheet_path("SelectWidget.qss")
-
-        try:
-            with open(style_path, "r", encoding='utf-8') as f:
-                self.stylesheet = f.read()
-
-            self.btnHelp.setStyleSheet(self.stylesheet)
-            self.comboBox.setStyleSheet(self.stylesheet)
-        except Exception as e:
-            self.logger.error(f"Ошибка загрузки стилей: {e}")
-            self.logger.error(f"Путь к файлу стилей: {style_path}")
-            self.logger.error(f"Текущая директория: {os.getcwd()}")
-            self.logger.error(f"MEIPASS: {getattr(sys, '_MEIPASS', 'Не установлен')}")
-
+        self.setObjectName("select_widget")
+        StyleService.set_scope([self.btnHelp, self.comboBox], "SelectWidget.qss")
 
     def _setup_ui(self):
         """Создает и настраивает элементы пользовательского интерфейса.
@@ -2,6 +2,8 @@ import os
 import sys
 from pathlib import Path
 from PyQt5 import QtCore, QtGui, QtWidgets
+
+from services.style_service import StyleService
 from PyQt5.QtCore import Qt, QSize
 
 from ui.widgets.PopoverWidget import PopoverWidget
@@ -103,23 +105,13 @@ class TagInputWidget(QtWidgets.QWidget):
         self.load_data()
 
     def _load_stylesheet(self):
-        """Загружает и применяет стили для виджетов из QSS файла.
+        """Отмечает элементы, к которым относятся стили TagInputWidget.qss.
 
-        Стили загружаются из файла TagInputWidget.qss в директории resources/styles.
-        Применяются к кнопке помощи и полю ввода тегов.
+        Стили загружаются один раз и применяются на уровне приложения (StyleService),
+        виджет только указывает, что они относятся к кнопке помощи и полю ввода тегов.
         """
-        style_path = self.app.file_service.get_stylesheet_path("TagInputWidget.qss")
-        try:
-            with open(style_path, "r", encoding='utf-8') as f:
-                self.stylesheet = f.read()
-            self.btnHelp.setStyleSheet(self.stylesheet)
-            self.frame.setStyleSheet(self.stylesheet)
-        except Exception as e:
-            self.logger.error(f"Ошибка загрузки стилей: {e}")
-            self.logger.error(f"Путь к файлу стилей: {style_path}")
-            self.logger.error(f"Текущая директория: {os.getcwd()}")
-            self.logger.error(f"MEIPASS: {getattr(sys, '_MEIPASS', 'Не установлен')}")
-
+        self.setObjectName("tag_input_widget")
+        StyleService.set_scope([self.btnHelp, self.frame], "TagInputWidget.qss")
 
     def _setup_ui(self):
         """Создает и настраивает элементы пользовательского интерфейса.
@@ -1,5 +1,3 @@
-import os
-import sys
 from pathlib import Path
 from PyQt5.QtWidgets import (
     QWidget,
@@ -84,21 +82,6 @@ class ViewJSONWidget(QWidget):
         # Устанавливаем политику размера для растягивания
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
-        self._load_stylesheet()
-
-    def _load_stylesheet(self):
-        """Загружает стили для виджета."""
-        style_path = self.app.file_service.get_stylesheet_path("ViewTextWidget.qss")
-        try:
-            with open(style_path, "r", encoding='utf-8') as f:
-                self.stylesheet = f.read()
-            self.setStyleSheet(self.stylesheet)
-        except Exception as e:
-            print(f"Ошибка загрузки стилей: {e}")
-            print(f"Путь к файлу стилей: {style_path}")
-            print(f"Текущая директория: {os.getcwd()}")
-            print(f"MEIPASS: {getattr(sys, '_MEIPASS', 'Не установлен')}")
-
     def setup_ui(self):
         """Настройка интерфейса виджета."""
         # Основной layout